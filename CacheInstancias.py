@@ -0,0 +1,54 @@
+import os
+import hashlib
+import pickle
+
+
+VERSAO_CARREGADOR = 1
+
+
+def caminho_cache(caminho_arquivo, sufixo):
+
+    return f"{caminho_arquivo}.{sufixo}.cache"
+
+def chave_cache(caminho_arquivo):
+
+    h = hashlib.sha256()
+    with open(caminho_arquivo, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return (VERSAO_CARREGADOR, h.hexdigest())
+
+def _ler_cache(caminho, chave):
+
+    try:
+        with open(caminho, 'rb') as f:
+            conteudo = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    if not isinstance(conteudo, dict) or conteudo.get('chave') != chave:
+        return None
+    return conteudo.get('dados')
+
+def _gravar_cache(caminho, chave, dados):
+
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        with open(temporario, 'wb') as f:
+            pickle.dump({'chave': chave, 'dados': dados}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, caminho)
+    except OSError:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+def carregar_com_cache(caminho_arquivo, sufixo, ler, usar_cache=True):
+
+    if not usar_cache:
+        return ler(caminho_arquivo)
+
+    chave = chave_cache(caminho_arquivo)
+    caminho = caminho_cache(caminho_arquivo, sufixo)
+    dados = _ler_cache(caminho, chave)
+    if dados is None:
+        dados = ler(caminho_arquivo)
+        _gravar_cache(caminho, chave, dados)
+    return dados
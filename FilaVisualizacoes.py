@@ -0,0 +1,39 @@
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+_FILA_GRAFICOS = {'executor': None, 'pendentes': []}
+
+
+def gerar_visualizacoes(modulo, resultados, instancia, pasta_saida):
+
+    importlib.import_module(modulo).gerar_visualizacoes(resultados, instancia, pasta_saida)
+
+def agendar_visualizacoes(modulo, resultados, instancia, pasta_saida, segundo_plano=True, processos=2):
+
+    if not segundo_plano or multiprocessing.current_process().daemon:
+        gerar_visualizacoes(modulo, resultados, instancia, pasta_saida)
+        return None
+
+    if _FILA_GRAFICOS['executor'] is None:
+        _FILA_GRAFICOS['executor'] = ProcessPoolExecutor(max_workers=processos)
+    futuro = _FILA_GRAFICOS['executor'].submit(gerar_visualizacoes, modulo, resultados, instancia, pasta_saida)
+    _FILA_GRAFICOS['pendentes'].append((pasta_saida, futuro))
+    return futuro
+
+def aguardar_visualizacoes():
+
+    executor = _FILA_GRAFICOS['executor']
+    if executor is None:
+        return
+
+    for pasta_saida, futuro in _FILA_GRAFICOS['pendentes']:
+        try:
+            futuro.result()
+        except Exception as e:
+            print(f"❌ Falha ao gerar visualizações em {pasta_saida}: {repr(e)}")
+
+    executor.shutdown()
+    _FILA_GRAFICOS['executor'] = None
+    _FILA_GRAFICOS['pendentes'] = []
@@ -1,55 +1,85 @@
 import os                            
 import csv                           
 import random                        
-import copy                          
 import time                          
-import itertools                      
-import matplotlib.pyplot as plt
-import seaborn as sns
+import itertools
+import heapq
+import bisect
 import numpy as np
-import pandas as pd
-import matplotlib.patches as patches
-from matplotlib import rcParams
 from datetime import datetime
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from LimiteInferior import limite_inferior, gap_percentual
+from CacheInstancias import carregar_com_cache
+from FilaVisualizacoes import agendar_visualizacoes, aguardar_visualizacoes
 
 INSTANCIAS = r"Instancias\Grupo2\Instancias_20v" 
 NUM_REINICIOS = 5 
 TIMEOUT = 3600  
 RANDOM_SEED = 42 
+ACEITACAO = 'melhor'
+ACEITACAO_K = 3
+ORDEM_ALEATORIA = False
+BLOCO_BUSCA = 64
+MODO_BUSCA = 'busca_local'
+TABU_TENURE = 7
+TABU_MAX_ITER = 5000
+TABU_MAX_SEM_MELHORA = 500
+PROCESSOS = 1
+FRACAO_REBALANCEAMENTO = 0.1
+PROCESSOS_LOTE = 1
+LOTE_FOLGA = 300
+GRAFICOS_SEGUNDO_PLANO = True
+PROCESSOS_GRAFICOS = 2
+ALNS_MAX_ITER = 20000
+ALNS_REMOCAO_MIN = 0.1
+ALNS_REMOCAO_MAX = 0.4
+ALNS_SEGMENTO = 50
+ALNS_REACAO = 0.1
+ALNS_PONTOS = (33.0, 9.0, 13.0)
+ALNS_TEMPERATURA = 0.05
+ALNS_RESFRIAMENTO = 0.9995
+ALNS_ALEATORIEDADE_PIOR = 3.0
+CACHE_INSTANCIAS = True
+PERFIL_VIZINHANCAS = True
+GAP_PARADA = 0.5
+REPARO_CARGA_MINIMA = True
+RESOLUCAO_MOCHILA = 500
+VERIFICAR_CUSTO = False
+VERIFICACAO_PERIODO = 100
+TOLERANCIA_DERIVA = 1e-6
 random.seed(RANDOM_SEED)
 
-CORES_PASTEL = {
-    'azul_claro': '#AEC6CF',
-    'azul_medio': '#9BB7D4', 
-    'verde_claro': '#B5EAD7',
-    'verde_medio': '#C1E1C1',
-    'amarelo_claro': '#FDFD96',
-    'laranja_claro': '#FFD8B1',
-    'rosa_claro': '#FFB7B2',
-    'roxo_claro': '#C9C9FF',
-    'cinza_claro': '#E8E8E8',
-    'salmao_claro': '#FF9AA2',
-    'lavanda': '#C3B1E1',
-    'menta': '#A2E4D2',
-    'pessego': '#FFCC99',
-    'lilas': '#D4B9DA',
-    'azul_ceu': '#B2D4F0',
-}
-
-CORES_PASTEL_4 = [CORES_PASTEL['azul_claro'], CORES_PASTEL['verde_claro'], 
-                  CORES_PASTEL['laranja_claro'], CORES_PASTEL['rosa_claro']]
-
-CORES_PASTEL_6 = [CORES_PASTEL['azul_claro'], CORES_PASTEL['verde_claro'],
-                  CORES_PASTEL['laranja_claro'], CORES_PASTEL['rosa_claro'],
-                  CORES_PASTEL['roxo_claro'], CORES_PASTEL['amarelo_claro']]
-
-CORES_PASTEL_8 = [CORES_PASTEL['azul_claro'], CORES_PASTEL['verde_claro'],
-                  CORES_PASTEL['laranja_claro'], CORES_PASTEL['rosa_claro'],
-                  CORES_PASTEL['roxo_claro'], CORES_PASTEL['amarelo_claro'],
-                  CORES_PASTEL['lavanda'], CORES_PASTEL['menta']]
-
-
-def carregar_dados(caminho_arquivo):
+_VERSOES = itertools.count(1)
+_VERIFICACAO = {'chamadas': 0, 'verificacoes': 0, 'divergencias': 0, 'maior_deriva': 0.0}
+
+
+
+def carregar_dados(caminho_arquivo, compacto=True, usar_cache=None):
+
+    if usar_cache is None:
+        usar_cache = CACHE_INSTANCIAS
+    if not usar_cache and not compacto:
+        return _ler_instancia_csv(caminho_arquivo)
+
+    dados = carregar_com_cache(caminho_arquivo, 'heuristica', _ler_instancia_compacta, usar_cache)
+    if not compacto:
+        dados.pop('compacto', None)
+    return dados
+
+def _ler_instancia_compacta(caminho_arquivo):
+
+    dados = _ler_instancia_csv(caminho_arquivo)
+    dados['compacto'] = compactar_instancia(dados)
+    return dados
+
+def _ler_instancia_csv(caminho_arquivo):
+
+    with open(caminho_arquivo, mode='r', encoding='utf-8-sig') as file: 
+        return ler_instancia(file)
+
+def ler_instancia(arquivo, compacto=False):
 
     dados = {
         'parametros': [],  
@@ -59,48 +89,47 @@ def carregar_dados(caminho_arquivo):
     }
 
     
-    with open(caminho_arquivo, mode='r', encoding='utf-8-sig') as file: 
-        reader = csv.DictReader(file, delimiter=';')
-        for row in reader:  
-            tipo = row['tipo']
-
-            if tipo == 'parametro':  
-                dados['parametros'].append({
-                    'descricao': row['descricao'],
-                    'beta': float(row['valor'])
-                })
-
-            elif tipo == 'veiculo':
-
-                dados['veiculos'].append({
-                    'id': int(row['id']),
-                    'tipo': row['descricao'].replace('Veiculo_', ''),
-                    'capacidade_peso': float(row['capacidade_peso']),
-                    'capacidade_volume': float(row['capacidade_vol']),
-                    'custo': row['custo'] if row['custo'] not in (None, '') else 0.0,
-                    'carga_minima': float(row['carga_minima']),
-                    'destino': row['destino'] if 'destino' in row else None
-                })
-
-            elif tipo == 'um':
-                
-                compatibilidade = row['compatibilidade'].strip()
-                if not compatibilidade:
-                    compatibilidade = ",".join(str(v['tipo']) for v in dados['veiculos'])
-                else:
-                    compatibilidade = ",".join([tipo.strip() for tipo in compatibilidade.split(",")])
-
-                dados['ums'].append({
-                    'id': int(row['id']),
-                    'tipo': row['descricao'],
-                    'peso': float(row['peso']),
-                    'volume': float(row['volume']),
-                    'custo_str': row['custo'] if row.get('custo') not in (None, '') else '',
-                    'destino': row['destino'],
-                    'compatibilidade': compatibilidade,
-                    'restricao': row['restricao'],
-                    'penalidade': float(row['penalidade']) * 10000
-                })
+    reader = csv.DictReader(arquivo, delimiter=';')
+    for row in reader:  
+        tipo = row['tipo']
+
+        if tipo == 'parametro':  
+            dados['parametros'].append({
+                'descricao': row['descricao'],
+                'beta': float(row['valor'])
+            })
+
+        elif tipo == 'veiculo':
+
+            dados['veiculos'].append({
+                'id': int(row['id']),
+                'tipo': row['descricao'].replace('Veiculo_', ''),
+                'capacidade_peso': float(row['capacidade_peso']),
+                'capacidade_volume': float(row['capacidade_vol']),
+                'custo': row['custo'] if row['custo'] not in (None, '') else 0.0,
+                'carga_minima': float(row['carga_minima']),
+                'destino': row['destino'] if 'destino' in row else None
+            })
+
+        elif tipo == 'um':
+            
+            compatibilidade = row['compatibilidade'].strip()
+            if not compatibilidade:
+                compatibilidade = ",".join(str(v['tipo']) for v in dados['veiculos'])
+            else:
+                compatibilidade = ",".join([tipo.strip() for tipo in compatibilidade.split(",")])
+
+            dados['ums'].append({
+                'id': int(row['id']),
+                'tipo': row['descricao'],
+                'peso': float(row['peso']),
+                'volume': float(row['volume']),
+                'custo_str': row['custo'] if row.get('custo') not in (None, '') else '',
+                'destino': row['destino'],
+                'compatibilidade': compatibilidade,
+                'restricao': row['restricao'],
+                'penalidade': float(row['penalidade']) * 10000
+            })
 
     dados['regioes'] = list(set(um["destino"] for um in dados['ums']))
 
@@ -161,8 +190,153 @@ def carregar_dados(caminho_arquivo):
     dados['ums_id'] = {um['id']: um for um in dados['ums']}
     dados['veiculos_id'] = {v['id']: v for v in dados['veiculos']}
 
+    if compacto:
+        dados['compacto'] = compactar_instancia(dados)
+
     return dados
 
+def compactar_instancia(instancia):
+
+    ums = instancia['ums']
+    veiculos = instancia['veiculos']
+
+    regioes = sorted(set(str(r) for r in instancia.get('regioes', []) or [])
+                     | set(str(um['destino']) for um in ums if um.get('destino') is not None))
+    regiao_idx = {r: k for k, r in enumerate(regioes)}
+
+    tipos = []
+    for v in veiculos:
+        if v['tipo'] not in tipos:
+            tipos.append(v['tipo'])
+    tipo_idx = {t: k for k, t in enumerate(tipos)}
+
+    beta_valor = 1.0
+    try:
+        beta_valor = float(next(
+            (p["beta"] for p in instancia.get("parametros", [])
+             if str(p.get("descricao", "")).strip().lower() == "beta"),
+            1.0
+        ))
+    except:
+        beta_valor = 1.0
+
+    num_ums = len(ums)
+    num_veiculos = len(veiculos)
+
+    peso = np.zeros(num_ums, dtype=np.float64)
+    volume = np.zeros(num_ums, dtype=np.float64)
+    penalidade = np.zeros(num_ums, dtype=np.float64)
+    destino_um = np.full(num_ums, -1, dtype=np.int64)
+    custo_tipo = np.zeros((num_ums, len(tipos)), dtype=np.float64)
+
+    for i, um in enumerate(ums):
+        peso[i] = float(um.get('peso', 0.0))
+        volume[i] = float(um.get('volume', 0.0))
+        try:
+            penalidade[i] = float(um.get('penalidade', 0.0))
+        except:
+            penalidade[i] = 0.0
+        if um.get('destino') is not None:
+            destino_um[i] = regiao_idx[str(um['destino'])]
+        custos = um.get('custos_por_tipo', {})
+        for t, k in tipo_idx.items():
+            try:
+                custo_tipo[i, k] = float(custos.get(t, 0.0))
+            except:
+                custo_tipo[i, k] = 0.0
+
+    cap_peso = np.zeros(num_veiculos, dtype=np.float64)
+    cap_volume = np.zeros(num_veiculos, dtype=np.float64)
+    carga_minima = np.zeros(num_veiculos, dtype=np.float64)
+    tipo_veic = np.zeros(num_veiculos, dtype=np.int64)
+    destino_veic = np.full(num_veiculos, -1, dtype=np.int64)
+    custo_ativacao = np.zeros((num_veiculos, len(regioes)), dtype=np.float64)
+
+    for j, v in enumerate(veiculos):
+        cap_peso[j] = float(v.get('capacidade_peso', 0.0))
+        cap_volume[j] = float(v.get('capacidade_volume', 0.0))
+        carga_minima[j] = float(v.get('carga_minima', 0.0) or 0.0)
+        tipo_veic[j] = tipo_idx[v['tipo']]
+        if v.get('destino') and str(v['destino']) in regiao_idx:
+            destino_veic[j] = regiao_idx[str(v['destino'])]
+        for r, k in regiao_idx.items():
+            if 'custos_por_regiao' in v:
+                custo_ativacao[j, k] = float(v['custos_por_regiao'].get(r, 0.0))
+            else:
+                try:
+                    custo_ativacao[j, k] = float(v.get('custo', 0.0) or 0.0)
+                except:
+                    custo_ativacao[j, k] = 0.0
+
+    tipos_norm = [str(t).strip().lower() for t in tipos]
+    destinos_veic = [str(v['destino']) if v.get('destino') else None for v in veiculos]
+    mascara_destino = {}
+    compativel = np.zeros((num_ums, num_veiculos), dtype=bool)
+
+    for i, um in enumerate(ums):
+        lista_comp = set(c.strip().lower() for c in (um.get('compatibilidade') or '').split(',') if c.strip() != '')
+        tipos_ok = np.array([(not lista_comp) or (t in lista_comp) for t in tipos_norm], dtype=bool)
+        linha = tipos_ok[tipo_veic] if tipos else np.zeros(num_veiculos, dtype=bool)
+
+        dest_um = um.get('destino', None)
+        if dest_um:
+            dest_um = str(dest_um)
+            if dest_um not in mascara_destino:
+                mascara_destino[dest_um] = np.array([d is None or d == dest_um for d in destinos_veic], dtype=bool)
+            linha = linha & mascara_destino[dest_um]
+
+        compativel[i] = linha
+
+    return {
+        'um_ids': [um['id'] for um in ums],
+        'veic_ids': [v['id'] for v in veiculos],
+        'um_idx': {um['id']: i for i, um in enumerate(ums)},
+        'veic_idx': {v['id']: j for j, v in enumerate(veiculos)},
+        'regioes': regioes,
+        'regiao_idx': regiao_idx,
+        'tipos': tipos,
+        'beta': beta_valor,
+        'peso': peso,
+        'volume': volume,
+        'penalidade': penalidade,
+        'destino_um': destino_um,
+        'custo_tipo': custo_tipo,
+        'custo_uv': custo_tipo[:, tipo_veic],
+        'cap_peso': cap_peso,
+        'cap_volume': cap_volume,
+        'carga_minima': carga_minima,
+        'tipo_veic': tipo_veic,
+        'destino_veic': destino_veic,
+        'custo_ativacao': custo_ativacao,
+        'compativel': compativel
+    }
+
+def obter_compacto(instancia):
+
+    cp = instancia.get('compacto', None)
+    if cp is None:
+        cp = compactar_instancia(instancia)
+        instancia['compacto'] = cp
+    return cp
+
+def obter_limite_inferior(instancia):
+
+    limite = instancia.get('limite_inferior', None)
+    if limite is None:
+        
+        referencia = gerar_solucao_gulosa(instancia)
+        aplicar_restricao_carga_minima(referencia, instancia)
+        limite = limite_inferior(obter_compacto(instancia), custo_total(referencia, instancia)['custo'])
+        instancia['limite_inferior'] = limite
+    return limite
+
+def gap_atingido(custo, limite, gap_parada=None):
+
+    if gap_parada is None:
+        gap_parada = GAP_PARADA
+    gap = gap_percentual(custo, limite)
+    return gap is not None and gap <= gap_parada + 1e-9
+
 def um_compatível_com_veiculo(um, veiculo):
     
     compatibilidade_str = um.get("compatibilidade") or ""
@@ -207,7 +381,8 @@ def criar_estado_inicial(instancia):
             'peso_usado': 0.0,
             'volume_usado': 0.0,
             'ativo': False,
-            'regiao': None  
+            'regiao': None,
+            'versao': 0
         }
 
     return solucao
@@ -227,265 +402,225 @@ def determinar_regiao_do_veiculo(v, dados_alocacao, instancia):
 
     ums_ids = list(dados_alocacao.get('ums', []))
     if ums_ids:
-        
-        ums_map = instancia.get('ums_id', None)
-        if ums_map is None:
-            ums_map = {u['id']: u for u in instancia['ums']}  
-
-        primeira_um = ums_map.get(ums_ids[0], None)
-        if primeira_um:
-            return str(primeira_um.get('destino'))
+        cp = obter_compacto(instancia)
+        i = cp['um_idx'].get(ums_ids[0], None)
+        if i is not None and cp['destino_um'][i] >= 0:
+            return cp['regioes'][cp['destino_um'][i]]
 
     return None
 
 def alocar_um(solucao, um_id, veiculo_id, instancia):
     
-    ums_id = instancia.get('ums_id', None)
-    veiculos_id = instancia.get('veiculos_id', None)
-    if ums_id is None:
-        ums_id = {u['id']: u for u in instancia['ums']}
-    if veiculos_id is None:
-        veiculos_id = {v['id']: v for v in instancia['veiculos']}
+    cp = obter_compacto(instancia)
+    i = cp['um_idx'].get(um_id, None)
+    j = cp['veic_idx'].get(veiculo_id, None)
 
-    um = ums_id.get(um_id)
-    veiculo = veiculos_id.get(veiculo_id)
-
-    if um is None or veiculo is None:
+    if i is None or j is None:
         return False
 
     
-    v_atual = solucao.get('alocacao_um', {}).get(um_id, None)
+    v_atual = solucao['alocacao_um'].get(um_id, None)
     if v_atual is not None:
         
-        if v_atual == veiculo_id:
-            return True
-        
-        return False
+        return v_atual == veiculo_id
 
     dados_alocacao = solucao['veiculo_dados'][veiculo_id]
 
     
-    if 'componentes_custo' not in solucao or solucao.get('custo') is None or 'total' not in solucao.get('componentes_custo', {}):
+    if solucao.get('custo') is None or 'total' not in solucao.get('componentes_custo', {}):
         custo_total(solucao, instancia)
 
     comp = solucao['componentes_custo']
-    comp.setdefault('frete_morto_por_veiculo', {})
-    comp.setdefault('custo_ativacao_por_veiculo', {})
-    comp.setdefault('transporte_por_veiculo', {})
-    beta_valor = float(comp.get('beta', 1.0))
-      
-    destino_nova = um.get('destino', None)
-    destino_nova_norm = str(destino_nova) if destino_nova is not None else None  
-
-    if len(dados_alocacao['ums']) > 0:
+    beta_valor = cp['beta']
+
+    r = cp['destino_um'][i]
+    destino_nova_norm = cp['regioes'][r] if r >= 0 else None
+
+    if dados_alocacao['ums']:
         reg_atual = dados_alocacao.get('regiao', None)
         if reg_atual is None:
-            reg_atual = determinar_regiao_do_veiculo(veiculo, dados_alocacao, instancia)
+            reg_atual = determinar_regiao_do_veiculo(instancia['veiculos'][j], dados_alocacao, instancia)
             dados_alocacao['regiao'] = reg_atual
 
-        reg_atual_norm = str(reg_atual) if reg_atual is not None else None      
-
-        if reg_atual_norm is not None and destino_nova_norm is not None and reg_atual_norm != destino_nova_norm:
+        if reg_atual is not None and destino_nova_norm is not None and str(reg_atual) != destino_nova_norm:
             return False
-    else:
-        dados_alocacao['regiao'] = destino_nova_norm  
 
-    if not um_compatível_com_veiculo(um, veiculo):
+    if not cp['compativel'][i, j]:
         return False
 
-    if not veiculo_tem_capacidade(solucao['veiculo_dados'], veiculo, um):
+    peso_um = float(cp['peso'][i])
+    volume_um = float(cp['volume'][i])
+    cap_peso = float(cp['cap_peso'][j])
+    if peso_um > cap_peso - dados_alocacao['peso_usado'] + 1e-9:
+        return False
+    if volume_um > float(cp['cap_volume'][j]) - dados_alocacao['volume_usado'] + 1e-9:
         return False
 
-    ativo_antes = bool(dados_alocacao.get('ativo', False))
-    frete_antigo = float(comp['frete_morto_por_veiculo'].get(veiculo_id, 0.0))
-    ativ_antiga = float(comp['custo_ativacao_por_veiculo'].get(veiculo_id, 0.0))
-    transp_antigo = float(comp['transporte_por_veiculo'].get(veiculo_id, 0.0))
+    _registrar_transacao(solucao, um_id, veiculo_id)
 
-    try:
-        custo_unit = float(um.get('custos_por_tipo', {}).get(veiculo['tipo'], 0.0))
-    except:
-        custo_unit = 0.0
+    ativo_antes = dados_alocacao['ativo']
+    if not dados_alocacao['ums']:
+        dados_alocacao['regiao'] = destino_nova_norm
 
-    try:
-        penal_um = float(um.get('penalidade', 0.0))
-    except:
-        penal_um = 0.0
+    custo_unit = float(cp['custo_uv'][i, j])
 
     dados_alocacao['ums'].add(um_id)
-    dados_alocacao['peso_usado'] += um['peso']
-    dados_alocacao['volume_usado'] += um['volume']
+    dados_alocacao['peso_usado'] += peso_um
+    dados_alocacao['volume_usado'] += volume_um
     dados_alocacao['ativo'] = True
+    dados_alocacao['versao'] = next(_VERSOES)
 
     solucao['alocacao_um'][um_id] = veiculo_id
-    estava_nao_alocada = (um_id in solucao['nao_alocadas'])
-    solucao['nao_alocadas'].discard(um_id)
-    
-    if estava_nao_alocada:  
-        comp['nao_alocacao'] = float(comp.get('nao_alocacao', 0.0)) - penal_um
+    if um_id in solucao['nao_alocadas']:
+        solucao['nao_alocadas'].discard(um_id)
+        comp['nao_alocacao'] -= float(cp['penalidade'][i])
 
-    comp['transporte'] = float(comp.get('transporte', 0.0)) + custo_unit
-    comp['transporte_por_veiculo'][veiculo_id] = transp_antigo + custo_unit
+    comp['transporte'] += custo_unit
+    comp['transporte_por_veiculo'][veiculo_id] = comp['transporte_por_veiculo'].get(veiculo_id, 0.0) + custo_unit
 
     if not ativo_antes:
-        regiao = dados_alocacao.get('regiao', None)
         custo_fix = 0.0
-        if regiao is not None:
-            if 'custos_por_regiao' in veiculo:
-                custo_fix = float(veiculo['custos_por_regiao'].get(str(regiao), 0.0))
-            else:
-                custo_fix = float(veiculo.get('custo', 0.0))
+        k = cp['regiao_idx'].get(dados_alocacao['regiao'], None) if dados_alocacao['regiao'] is not None else None
+        if k is not None:
+            custo_fix = float(cp['custo_ativacao'][j, k])
 
-        comp['alocacao'] = float(comp.get('alocacao', 0.0)) + custo_fix
+        comp['alocacao'] += custo_fix
         comp['custo_ativacao_por_veiculo'][veiculo_id] = custo_fix
 
-    capacidade_peso = float(veiculo.get('capacidade_peso', 0.0))
-    peso_usado = float(dados_alocacao.get('peso_usado', 0.0))
-
-    ociosidade = capacidade_peso - peso_usado
+    ociosidade = cap_peso - dados_alocacao['peso_usado']
     if ociosidade < 0:
         ociosidade = 0.0
 
-    frete_novo = float(beta_valor) * float(ociosidade)
+    frete_novo = beta_valor * ociosidade
 
-    comp['frete_morto'] = float(comp.get('frete_morto', 0.0)) + (frete_novo - frete_antigo)
+    comp['frete_morto'] += frete_novo - comp['frete_morto_por_veiculo'].get(veiculo_id, 0.0)
     comp['frete_morto_por_veiculo'][veiculo_id] = frete_novo
 
-    comp['total'] = float(comp.get('alocacao', 0.0)) + float(comp.get('transporte', 0.0)) + float(comp.get('frete_morto', 0.0)) + float(comp.get('nao_alocacao', 0.0))
+    comp['total'] = comp['alocacao'] + comp['transporte'] + comp['frete_morto'] + comp['nao_alocacao']
     solucao['custo'] = comp['total']
 
     return True
 
 def desalocar_um(solucao, um_id, veiculo_id, instancia):
 
-    ums_id = instancia.get('ums_id', None)
-    veiculos_id = instancia.get('veiculos_id', None)
-    if ums_id is None:
-        ums_id = {u['id']: u for u in instancia['ums']}
-    if veiculos_id is None:
-        veiculos_id = {v['id']: v for v in instancia['veiculos']}
+    cp = obter_compacto(instancia)
+    i = cp['um_idx'].get(um_id, None)
+    j = cp['veic_idx'].get(veiculo_id, None)
 
-    um = ums_id.get(um_id)
-    veiculo = veiculos_id.get(veiculo_id)
-
-    if um is None or veiculo is None:
+    if i is None or j is None:
         return False
     
-    v_atual = solucao.get('alocacao_um', {}).get(um_id, None)
-    if v_atual != veiculo_id:
+    if solucao['alocacao_um'].get(um_id, None) != veiculo_id:
         return False
 
     dados_alocacao = solucao['veiculo_dados'][veiculo_id]
     
-    if 'componentes_custo' not in solucao or solucao.get('custo') is None or 'total' not in solucao.get('componentes_custo', {}):
+    if solucao.get('custo') is None or 'total' not in solucao.get('componentes_custo', {}):
         custo_total(solucao, instancia)
 
     comp = solucao['componentes_custo']
-    comp.setdefault('frete_morto_por_veiculo', {})
-    comp.setdefault('custo_ativacao_por_veiculo', {})
-    comp.setdefault('transporte_por_veiculo', {})
-    beta_valor = float(comp.get('beta', 1.0))
+    beta_valor = cp['beta']
 
-    frete_antigo = float(comp['frete_morto_por_veiculo'].get(veiculo_id, 0.0))
-    ativ_antiga = float(comp['custo_ativacao_por_veiculo'].get(veiculo_id, 0.0))
-    transp_antigo = float(comp['transporte_por_veiculo'].get(veiculo_id, 0.0))
-
-    try:
-        custo_unit = float(um.get('custos_por_tipo', {}).get(veiculo['tipo'], 0.0))
-    except:
-        custo_unit = 0.0
+    custo_unit = float(cp['custo_uv'][i, j])
 
-    try:
-        penal_um = float(um.get('penalidade', 0.0))
-    except:
-        penal_um = 0.0
+    _registrar_transacao(solucao, um_id, veiculo_id)
         
     dados_alocacao['ums'].remove(um_id)
-    dados_alocacao['peso_usado'] -= um['peso']
-    dados_alocacao['volume_usado'] -= um['volume']
+    dados_alocacao['peso_usado'] -= float(cp['peso'][i])
+    dados_alocacao['volume_usado'] -= float(cp['volume'][i])
+    dados_alocacao['versao'] = next(_VERSOES)
 
     solucao['alocacao_um'].pop(um_id, None)
-    estava_nao_alocada = (um_id in solucao['nao_alocadas'])
-    solucao['nao_alocadas'].add(um_id)
-
-    if not estava_nao_alocada:  
-        comp['nao_alocacao'] = float(comp.get('nao_alocacao', 0.0)) + penal_um
+    if um_id not in solucao['nao_alocadas']:
+        solucao['nao_alocadas'].add(um_id)
+        comp['nao_alocacao'] += float(cp['penalidade'][i])
     
-    comp['transporte'] = float(comp.get('transporte', 0.0)) - custo_unit
-    comp['transporte_por_veiculo'][veiculo_id] = transp_antigo - custo_unit
+    comp['transporte'] -= custo_unit
+    comp['transporte_por_veiculo'][veiculo_id] = comp['transporte_por_veiculo'].get(veiculo_id, 0.0) - custo_unit
+
+    frete_antigo = comp['frete_morto_por_veiculo'].get(veiculo_id, 0.0)
     
-    if len(dados_alocacao['ums']) == 0:
+    if not dados_alocacao['ums']:
         
         dados_alocacao['ativo'] = False
-        comp['alocacao'] = float(comp.get('alocacao', 0.0)) - ativ_antiga
+        dados_alocacao['peso_usado'] = 0.0
+        dados_alocacao['volume_usado'] = 0.0
+        comp['alocacao'] -= comp['custo_ativacao_por_veiculo'].get(veiculo_id, 0.0)
         comp['custo_ativacao_por_veiculo'][veiculo_id] = 0.0
-        comp['frete_morto'] = float(comp.get('frete_morto', 0.0)) - frete_antigo
+        comp['frete_morto'] -= frete_antigo
         comp['frete_morto_por_veiculo'][veiculo_id] = 0.0
         
         dados_alocacao['regiao'] = None
     else:
         
-        capacidade_peso = float(veiculo.get('capacidade_peso', 0.0))
-        peso_usado = float(dados_alocacao.get('peso_usado', 0.0))
-
-        ociosidade = capacidade_peso - peso_usado
+        ociosidade = float(cp['cap_peso'][j]) - dados_alocacao['peso_usado']
         if ociosidade < 0:
             ociosidade = 0.0
 
-        frete_novo = float(beta_valor) * float(ociosidade)
+        frete_novo = beta_valor * ociosidade
 
-        comp['frete_morto'] = float(comp.get('frete_morto', 0.0)) + (frete_novo - frete_antigo)
+        comp['frete_morto'] += frete_novo - frete_antigo
         comp['frete_morto_por_veiculo'][veiculo_id] = frete_novo
 
     
-    comp['total'] = float(comp.get('alocacao', 0.0)) + float(comp.get('transporte', 0.0)) + float(comp.get('frete_morto', 0.0)) + float(comp.get('nao_alocacao', 0.0))
+    comp['total'] = comp['alocacao'] + comp['transporte'] + comp['frete_morto'] + comp['nao_alocacao']
     solucao['custo'] = comp['total']
 
     return True
 
-def custo_total(solucao, instancia):
+def custo_total(solucao, instancia, recalcular=False):
     
-    if solucao.get('custo') is not None and 'componentes_custo' in solucao:
-        comp = solucao.get('componentes_custo', {})
-        try:
-            a = float(comp.get('alocacao', 0.0))
-            t = float(comp.get('transporte', 0.0))
-            f = float(comp.get('frete_morto', 0.0))
-            n = float(comp.get('nao_alocacao', 0.0))
-            tot = float(comp.get('total', solucao.get('custo', 0.0)))
+    
+    if not recalcular and solucao.get('custo') is not None and 'total' in solucao.get('componentes_custo', {}):
+        if VERIFICAR_CUSTO:
+            _verificar_periodicamente(solucao, instancia)
+        return solucao
 
-            ok_nao_neg = (a >= 0.0 and t >= 0.0 and f >= 0.0 and n >= 0.0 and tot >= 0.0)
-            ok_soma = abs((a + t + f + n) - tot) <= 1e-6
+    return _recalcular_custo(solucao, instancia)
 
-            if ok_nao_neg and ok_soma:
-                return solucao
-        except:
-            pass
+def _verificar_periodicamente(solucao, instancia):
+
+    _VERIFICACAO['chamadas'] += 1
+    if _VERIFICACAO['chamadas'] % max(1, int(VERIFICACAO_PERIODO)) == 0:
+        verificar_custo(solucao, instancia)
+
+def verificar_custo(solucao, instancia, tolerancia=None):
+
+    if tolerancia is None:
+        tolerancia = TOLERANCIA_DERIVA
+
+    referencia = _recalcular_custo({
+        'veiculo_dados': solucao['veiculo_dados'],
+        'nao_alocadas': solucao['nao_alocadas']
+    }, instancia)['componentes_custo']
+    comp = solucao.get('componentes_custo', {})
+
+    derivas = {k: float(comp.get(k, 0.0)) - referencia[k]
+               for k in ('alocacao', 'transporte', 'frete_morto', 'nao_alocacao', 'total')}
+    derivas['custo'] = float(solucao.get('custo') or 0.0) - referencia['total']
+    maior = max(abs(d) for d in derivas.values())
+
+    _VERIFICACAO['verificacoes'] += 1
+    _VERIFICACAO['maior_deriva'] = max(_VERIFICACAO['maior_deriva'], maior)
+    if maior > tolerancia * max(1.0, abs(referencia['total'])):
+        _VERIFICACAO['divergencias'] += 1
+        detalhes = ", ".join(f"{k}={d:+.6g}" for k, d in derivas.items() if abs(d) > 0.0)
+        print(f"⚠️ Deriva no custo incremental: {detalhes} (total recalculado={referencia['total']:.6f})")
 
-        solucao['custo'] = None
-        solucao.pop('componentes_custo', None)
+    return derivas
 
-    ums_id = instancia.get('ums_id', None)
-    veiculos_id = instancia.get('veiculos_id', None)
+def estatisticas_verificacao():
 
-    if ums_id is None:
-        ums_id = {u['id']: u for u in instancia['ums']}  
-    if veiculos_id is None:
-        veiculos_id = {v['id']: v for v in instancia['veiculos']}  
+    return dict(_VERIFICACAO)
+
+def _recalcular_custo(solucao, instancia):
+
+    cp = obter_compacto(instancia)
+    beta_valor = cp['beta']
 
     custo_ativacao = 0.0
     custo_transporte = 0.0
     custo_frete_morto = 0.0
-    custo_nao_alocacao = 0.0
-
-    beta_valor = 1.0
-    try:
-        beta_valor = next(
-            (p["beta"] for p in instancia.get("parametros", [])
-             if str(p.get("descricao", "")).strip().lower() == "beta"),
-            1.0
-        )
-    except:
-        beta_valor = 1.0
 
     solucao.setdefault('componentes_custo', {})
     solucao['componentes_custo'].setdefault('frete_morto_por_veiculo', {})
@@ -495,53 +630,40 @@ def custo_total(solucao, instancia):
     solucao['componentes_custo']['frete_morto_por_veiculo'].clear()
     solucao['componentes_custo']['custo_ativacao_por_veiculo'].clear()
     solucao['componentes_custo']['transporte_por_veiculo'].clear()
-    
-    for um_id in solucao['nao_alocadas']:
-        um = ums_id.get(um_id)
-        if um is not None:
-            custo_nao_alocacao += float(um.get('penalidade', 0.0))
+
+    um_idx = cp['um_idx']
+    idx_nao_alocadas = [um_idx[u] for u in solucao['nao_alocadas'] if u in um_idx]
+    custo_nao_alocacao = float(cp['penalidade'][idx_nao_alocadas].sum())
 
     for v_id, v_dados in solucao['veiculo_dados'].items():
         if not v_dados['ativo']:
             continue
 
-        v = veiculos_id[v_id]
+        j = cp['veic_idx'][v_id]
 
-        regiao = determinar_regiao_do_veiculo(v, v_dados, instancia)
+        regiao = determinar_regiao_do_veiculo(instancia['veiculos'][j], v_dados, instancia)
 
         custo_fixo = 0.0
-        if regiao is not None:
-            if 'custos_por_regiao' in v and regiao is not None:
-                custo_fixo = float(v['custos_por_regiao'].get(regiao, 0.0))
-            else:
-                custo_fixo = float(v.get('custo', 0.0))
+        k = cp['regiao_idx'].get(str(regiao), None) if regiao is not None else None
+        if k is not None:
+            custo_fixo = float(cp['custo_ativacao'][j, k])
 
         custo_ativacao += custo_fixo
         solucao['componentes_custo']['custo_ativacao_por_veiculo'][v_id] = custo_fixo
 
-        peso_usado = float(v_dados.get('peso_usado', 0.0))
-        capacidade_peso = float(v.get('capacidade_peso', 0.0))
-
-        ociosidade = capacidade_peso - peso_usado
+        ociosidade = float(cp['cap_peso'][j]) - float(v_dados.get('peso_usado', 0.0))
         if ociosidade < 0:
             ociosidade = 0.0  
 
-        penal_frete_morto = float(beta_valor) * float(ociosidade)
+        penal_frete_morto = beta_valor * ociosidade
 
         custo_frete_morto += penal_frete_morto
         solucao['componentes_custo']['frete_morto_por_veiculo'][v_id] = penal_frete_morto
 
-        transp_v = 0.0
-        for um_id in v_dados['ums']:
-            um = ums_id.get(um_id)
-            if um is None:
-                continue
-            custos_tipo = um.get('custos_por_tipo', {})
-            custo_unit = float(custos_tipo.get(v['tipo'], 0.0))
-
-            custo_transporte += custo_unit
-            transp_v += custo_unit
+        idx_ums = [um_idx[u] for u in v_dados['ums'] if u in um_idx]
+        transp_v = float(cp['custo_uv'][idx_ums, j].sum())
 
+        custo_transporte += transp_v
         solucao['componentes_custo']['transporte_por_veiculo'][v_id] = transp_v
 
     total = custo_ativacao + custo_transporte + custo_frete_morto + custo_nao_alocacao
@@ -556,13 +678,141 @@ def custo_total(solucao, instancia):
 
     return solucao
 
+def capturar_solucao(solucao, instancia):
+
+    if solucao.get('custo') is None or 'componentes_custo' not in solucao:
+        custo_total(solucao, instancia)
+
+    cp = obter_compacto(instancia)
+    atribuicao = np.full(len(cp['um_ids']), -1, dtype=np.int64)
+    for um_id, vid in solucao['alocacao_um'].items():
+        atribuicao[cp['um_idx'][um_id]] = cp['veic_idx'][vid]
+
+    comp = solucao['componentes_custo']
+    return {
+        'atribuicao': atribuicao,
+        'regiao_veiculo': [solucao['veiculo_dados'][vid]['regiao'] for vid in cp['veic_ids']],
+        'custo': comp['total'],
+        'componentes': {k: comp[k] for k in ('alocacao', 'transporte', 'frete_morto', 'nao_alocacao', 'total')}
+    }
+
+def restaurar_solucao(captura, instancia):
+
+    cp = obter_compacto(instancia)
+    solucao = criar_estado_inicial(instancia)
+    atribuicao = captura['atribuicao']
+    alocadas = np.flatnonzero(atribuicao >= 0)
+
+    for i in alocadas:
+        um_id = cp['um_ids'][i]
+        vid = cp['veic_ids'][atribuicao[i]]
+        solucao['veiculo_dados'][vid]['ums'].add(um_id)
+        solucao['alocacao_um'][um_id] = vid
+        solucao['nao_alocadas'].discard(um_id)
+
+    num_veiculos = len(cp['veic_ids'])
+    peso = np.bincount(atribuicao[alocadas], weights=cp['peso'][alocadas], minlength=num_veiculos)
+    volume = np.bincount(atribuicao[alocadas], weights=cp['volume'][alocadas], minlength=num_veiculos)
+
+    
+    for j, vid in enumerate(cp['veic_ids']):
+        dados = solucao['veiculo_dados'][vid]
+        dados['versao'] = next(_VERSOES)
+        if not dados['ums']:
+            continue
+        dados['peso_usado'] = float(peso[j])
+        dados['volume_usado'] = float(volume[j])
+        dados['ativo'] = True
+        dados['regiao'] = captura['regiao_veiculo'][j]
+
+    custo_total(solucao, instancia)
+    return solucao
+
+def iniciar_transacao(solucao, instancia):
+
+    if solucao.get('custo') is None or 'componentes_custo' not in solucao:
+        custo_total(solucao, instancia)
+
+    comp = solucao['componentes_custo']
+    solucao.setdefault('transacoes', []).append({
+        'custo': solucao['custo'],
+        'escalares': {k: comp[k] for k in ('alocacao', 'transporte', 'frete_morto', 'nao_alocacao', 'total')},
+        'veiculos': {},
+        'ums': {}
+    })
+
+def _registrar_transacao(solucao, um_id, vid):
+
+    transacoes = solucao.get('transacoes', None)
+    if not transacoes:
+        return
+
+    
+    dados = solucao['veiculo_dados'][vid]
+    comp = solucao['componentes_custo']
+    for transacao in transacoes:
+        if vid not in transacao['veiculos']:
+            transacao['veiculos'][vid] = (
+                dados['peso_usado'], dados['volume_usado'], dados['ativo'], dados['regiao'], dados['versao'],
+                comp['transporte_por_veiculo'].get(vid, None),
+                comp['frete_morto_por_veiculo'].get(vid, None),
+                comp['custo_ativacao_por_veiculo'].get(vid, None)
+            )
+        if um_id not in transacao['ums']:
+            transacao['ums'][um_id] = solucao['alocacao_um'].get(um_id, None)
+
+def delta_transacao(solucao):
+
+    return solucao['custo'] - solucao['transacoes'][-1]['custo']
+
+def confirmar_transacao(solucao):
+
+    solucao['transacoes'].pop()
+    if not solucao['transacoes']:
+        solucao.pop('transacoes', None)
+
+def desfazer_transacao(solucao):
+
+    transacao = solucao['transacoes'].pop()
+    if not solucao['transacoes']:
+        solucao.pop('transacoes', None)
+
+    veiculo_dados = solucao['veiculo_dados']
+    alocacao = solucao['alocacao_um']
+    for um_id, v_original in transacao['ums'].items():
+        v_atual = alocacao.get(um_id, None)
+        if v_atual == v_original:
+            continue
+        if v_atual is not None:
+            veiculo_dados[v_atual]['ums'].discard(um_id)
+        if v_original is not None:
+            veiculo_dados[v_original]['ums'].add(um_id)
+            alocacao[um_id] = v_original
+            solucao['nao_alocadas'].discard(um_id)
+        else:
+            alocacao.pop(um_id, None)
+            solucao['nao_alocadas'].add(um_id)
+
+    comp = solucao['componentes_custo']
+    por_veiculo = (comp['transporte_por_veiculo'], comp['frete_morto_por_veiculo'], comp['custo_ativacao_por_veiculo'])
+    for vid, anterior in transacao['veiculos'].items():
+        dados = veiculo_dados[vid]
+        dados['peso_usado'], dados['volume_usado'], dados['ativo'], dados['regiao'], dados['versao'] = anterior[:5]
+        for mapa, valor in zip(por_veiculo, anterior[5:]):
+            if valor is None:
+                mapa.pop(vid, None)
+            else:
+                mapa[vid] = valor
+
+    comp.update(transacao['escalares'])
+    solucao['custo'] = transacao['custo']
+
 def gerar_solucao_gulosa(instancia, ordem=None):
 
     solucao = criar_estado_inicial(instancia)
 
     custo_total(solucao, instancia)
 
-    veiculos = instancia['veiculos']
     ums_list = list(instancia['ums'])
 
     if ordem is None:
@@ -578,497 +828,1029 @@ def gerar_solucao_gulosa(instancia, ordem=None):
         rnd = random.Random(RANDOM_SEED)
         rnd.shuffle(ums_list)
 
-    ums_map = instancia.get('ums_id', None)
-    veiculos_map = instancia.get('veiculos_id', None)
-    if ums_map is None:
-        ums_map = {u['id']: u for u in instancia['ums']}
-    if veiculos_map is None:
-        veiculos_map = {v['id']: v for v in instancia['veiculos']}
+    cp = obter_compacto(instancia)
+    indice = _indice_guloso(solucao, cp)
 
     for um in ums_list:
+        i = cp['um_idx'][um['id']]
 
-        destino_um = um.get('destino', None)
-        destino_um_norm = str(destino_um) if destino_um is not None else None
-
-        candidatos_fixos = []      
-        candidatos_vazios = []     
+        
+        candidatos = _candidatos_abertos(solucao, cp, indice, i)
+        if not candidatos:
+            candidatos = _candidatos_vazios(cp, indice, i)
+        if not candidatos:
+            continue  
 
-        for v in veiculos:
-            vid = v['id']
-            v_dados = solucao['veiculo_dados'][vid]
+        for chave, j in sorted(candidatos):
+            if alocar_um(solucao, um['id'], cp['veic_ids'][j], instancia):
+                _atualizar_indice_guloso(solucao, cp, indice, j)
+                break
 
-            reg_v = determinar_regiao_do_veiculo(v, v_dados, instancia)
-            
-            reg_v_norm = str(reg_v) if reg_v is not None else None
+    return solucao
 
-            if reg_v_norm is not None and destino_um_norm is not None and reg_v_norm != destino_um_norm:
-                continue
-            if not um_compatível_com_veiculo(um, v):
-                continue
-            if not veiculo_tem_capacidade(solucao['veiculo_dados'], v, um):
-                continue
-            if v_dados.get('ativo', False) and reg_v_norm is not None and reg_v_norm == destino_um_norm:
-                candidatos_fixos.append(v)
-            else:
-                if len(v_dados['ums']) == 0:
-                    candidatos_vazios.append(v)
-        if candidatos_fixos:
-            candidatos = candidatos_fixos
-        else:
-            candidatos = candidatos_vazios
-        if not candidatos:
-            continue  
-        melhor_chave = None
-        melhores = []
+def _folga_relativa(solucao, cp, j):
+
+    dados = solucao['veiculo_dados'][cp['veic_ids'][j]]
+    cap_p = float(cp['cap_peso'][j])
+    cap_v = float(cp['cap_volume'][j])
+    return (cap_p - dados['peso_usado']) / (cap_p + 1e-9) + (cap_v - dados['volume_usado']) / (cap_v + 1e-9)
+
+def _indice_guloso(solucao, cp):
+
+    
+    classes = {}
+    for j in range(len(cp['veic_ids'])):
+        chave = (int(cp['tipo_veic'][j]), float(cp['cap_peso'][j]), float(cp['cap_volume'][j]), int(cp['destino_veic'][j]))
+        classes.setdefault(chave, []).append(j)
+
+    chaves = list(classes)
+    indice = {
+        'classe_de': np.zeros(len(cp['veic_ids']), dtype=np.int64),
+        'classe_tipo': np.array([c[0] for c in chaves], dtype=np.int64),
+        'classe_peso': np.array([c[1] for c in chaves]),
+        'classe_volume': np.array([c[2] for c in chaves]),
+        'classe_membro': np.array([classes[c][0] for c in chaves], dtype=np.int64),
+        'classe_folga': np.array([c[1] / (c[1] + 1e-9) + c[2] / (c[2] + 1e-9) for c in chaves]),
+        'vazios': [[] for _ in chaves],
+        'representante': np.full(len(chaves), -1, dtype=np.int64),
+        'abertos': {},
+        'maior_residuo': {},
+        'tipos_abertos': {}
+    }
+    for k, c in enumerate(chaves):
+        indice['classe_de'][classes[c]] = k
 
-        for v in candidatos:
-            vid = v['id']
+    for j in range(len(cp['veic_ids'])):
+        _atualizar_indice_guloso(solucao, cp, indice, j)
+    return indice
 
-            
-            try:
-                custo_marginal = float(um.get('custos_por_tipo', {}).get(v['tipo'], 0.0))
-            except:
-                custo_marginal = 0.0
+def _atualizar_indice_guloso(solucao, cp, indice, j):
 
-            
-            peso_disp = v.get('capacidade_peso', 0.0) - solucao['veiculo_dados'][vid]['peso_usado']
-            vol_disp  = v.get('capacidade_volume', 0.0) - solucao['veiculo_dados'][vid]['volume_usado']
+    vid = cp['veic_ids'][j]
+    dados = solucao['veiculo_dados'][vid]
+    k = indice['classe_de'][j]
 
-            peso_rel = peso_disp / (v.get('capacidade_peso', 1.0) + 1e-9)
-            vol_rel  = vol_disp / (v.get('capacidade_volume', 1.0) + 1e-9)
+    vazios = indice['vazios'][k]
+    if not dados['ums']:
+        heapq.heappush(vazios, j)
+        indice['representante'][k] = vazios[0]
+        return
 
-            folga_score = peso_rel + vol_rel
+    if j in vazios:
+        vazios.remove(j)
+        heapq.heapify(vazios)
+        indice['representante'][k] = vazios[0] if vazios else -1
 
-            chave = (custo_marginal, -folga_score)
+    
+    r = cp['regiao_idx'].get(str(dados['regiao']), -1) if dados['regiao'] is not None else -1
+    if cp['destino_veic'][j] >= 0:
+        r = int(cp['destino_veic'][j])
+    if r < 0:
+        return
 
-            if melhor_chave is None or chave < melhor_chave:
-                melhor_chave = chave
-                melhores = [v]
-            elif chave == melhor_chave:
-                melhores.append(v)
+    classe = (r, int(cp['tipo_veic'][j]))
+    abertos = indice['abertos'].setdefault(classe, [])
+    for pos, (_, jj) in enumerate(abertos):
+        if jj == j:
+            del abertos[pos]
+            break
+    bisect.insort(abertos, (-_folga_relativa(solucao, cp, j), j))
 
-        escolhido = melhores[0]
+    
+    veic_dados = solucao['veiculo_dados']
+    indice['maior_residuo'][classe] = (
+        max(cp['cap_peso'][jj] - veic_dados[cp['veic_ids'][jj]]['peso_usado'] for _, jj in abertos),
+        max(cp['cap_volume'][jj] - veic_dados[cp['veic_ids'][jj]]['volume_usado'] for _, jj in abertos)
+    )
+    indice['tipos_abertos'].setdefault(r, set()).add(classe[1])
+
+def _candidatos_abertos(solucao, cp, indice, i):
+
+    r = int(cp['destino_um'][i])
+    if r < 0:
+        return []
+
+    peso_um = float(cp['peso'][i])
+    volume_um = float(cp['volume'][i])
+    candidatos = []
+    for t in sorted(indice['tipos_abertos'].get(r, ())):
+        abertos = indice['abertos'][(r, t)]
+        residuo_peso, residuo_volume = indice['maior_residuo'][(r, t)]
+        if (peso_um > residuo_peso + 1e-9 or volume_um > residuo_volume + 1e-9
+                or not cp['compativel'][i, abertos[0][1]]):
+            continue
 
         
-        
-        
-        sucesso = alocar_um(solucao, um['id'], escolhido['id'], instancia)
+        for folga_neg, j in abertos:
+            dados = solucao['veiculo_dados'][cp['veic_ids'][j]]
+            if (peso_um <= cp['cap_peso'][j] - dados['peso_usado'] + 1e-9
+                    and volume_um <= cp['cap_volume'][j] - dados['volume_usado'] + 1e-9):
+                candidatos.append(((float(cp['custo_tipo'][i, t]), folga_neg, j), j))
+                break
+    return candidatos
 
-        if not sucesso:
-            
-            for v in candidatos:
-                if v == escolhido:
-                    continue
-                if alocar_um(solucao, um['id'], v['id'], instancia):
-                    sucesso = True
-                    break
+def _candidatos_vazios(cp, indice, i):
 
-    return solucao
+    representantes = indice['representante']
+    ok = ((representantes >= 0)
+          & cp['compativel'][i, indice['classe_membro']]
+          & (cp['peso'][i] <= indice['classe_peso'] + 1e-9)
+          & (cp['volume'][i] <= indice['classe_volume'] + 1e-9))
+
+    custo = cp['custo_tipo'][i, indice['classe_tipo']]
+    return [((float(custo[k]), -float(indice['classe_folga'][k]), int(representantes[k])), int(representantes[k]))
+            for k in np.flatnonzero(ok)]
 
 
-def atende_carga_minima(solucao, veiculos_map, vid):
+def atende_carga_minima(solucao, instancia, vid):
 
     dados_v = solucao['veiculo_dados'][vid]
     if not dados_v['ativo']:
         return True
-    carga_min = float(veiculos_map[vid].get('carga_minima', 0.0) or 0.0)
+    cp = obter_compacto(instancia)
+    carga_min = float(cp['carga_minima'][cp['veic_idx'][vid]])
     return (dados_v['peso_usado'] + 1e-9) >= carga_min
 
-def realizar_troca_1x1(solucao, instancia):
-    
-    if solucao.get('custo') is None or 'componentes_custo' not in solucao:
-        custo_total(solucao, instancia)
+def _carga_veiculo(solucao, cp, vid, memoria=None):
 
-    
-    custo_base = float(solucao['custo'])
+    dados = solucao['veiculo_dados'][vid]
+    if memoria is not None:
+        anterior = memoria.setdefault('cargas', {}).get(vid, None)
+        if anterior is not None and anterior[0] == dados.get('versao', 0):
+            return anterior[1]
 
-    
-    veiculos_map = instancia.get('veiculos_id', None)
-    if veiculos_map is None:
-        veiculos_map = {v['id']: v for v in instancia['veiculos']}
+    ids = list(dados['ums'])
+    idx = np.fromiter((cp['um_idx'][u] for u in ids), dtype=np.int64, count=len(ids))
+    reg = cp['regiao_idx'].get(str(dados['regiao']), -1) if dados['regiao'] is not None else -1
+    carga = (ids, idx, reg)
 
-    
-    ativos = [vid for vid, dados in solucao['veiculo_dados'].items() if dados['ativo'] and len(dados['ums']) > 0]
-    if len(ativos) < 2:
-        return False
+    if memoria is not None:
+        memoria['cargas'][vid] = (dados.get('versao', 0), carga)
+    return carga
 
-    melhor_mov = None
-    melhor_delta = 0.0
+def _linhas_alocadas(solucao, cp, veiculos_j, memoria=None):
 
-    
-    ativos_ordenados = sorted(ativos)
+    idxs = []
+    origens = []
+    for j in veiculos_j:
+        vid = cp['veic_ids'][j]
+        if not solucao['veiculo_dados'][vid]['ums']:
+            continue
+        idx = _carga_veiculo(solucao, cp, vid, memoria)[1]
+        idxs.append(idx)
+        origens.append(np.full(len(idx), j, dtype=np.int64))
 
-    for i in range(len(ativos_ordenados)):
-        v1 = ativos_ordenados[i]
-        ums_v1 = list(solucao['veiculo_dados'][v1]['ums'])
+    if not idxs:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(idxs), np.concatenate(origens)
 
-        for j in range(i + 1, len(ativos_ordenados)):
-            v2 = ativos_ordenados[j]
-            ums_v2 = list(solucao['veiculo_dados'][v2]['ums'])
+def _delta_veiculos(cp, j, frete_atual, ativ_atual, peso_novo, volume_novo, delta_transp, n_novo, reg_novo):
 
-            for um_a in ums_v1:
-                for um_b in ums_v2:
+    cap_peso = cp['cap_peso'][j]
 
-                    
-                    desalocar_um(solucao, um_a, v1, instancia)
-                    desalocar_um(solucao, um_b, v2, instancia)
+    ocupado = np.asarray(n_novo) > 0
+    viavel = ((peso_novo <= cap_peso + 1e-9)
+              & (volume_novo <= cp['cap_volume'][j] + 1e-9)
+              & (~ocupado | (peso_novo + 1e-9 >= cp['carga_minima'][j])))
 
-                    ok = True
-                    if not alocar_um(solucao, um_a, v2, instancia):
-                        ok = False
-                    else:
-                        if not alocar_um(solucao, um_b, v1, instancia):
-                            ok = False
+    frete_novo = np.where(ocupado, cp['beta'] * np.maximum(cap_peso - peso_novo, 0.0), 0.0)
+    ativ_nova = np.where(ocupado & (np.asarray(reg_novo) >= 0), cp['custo_ativacao'][j, reg_novo], 0.0)
 
-                    
-                    if ok:
-                        if not atende_carga_minima(solucao, veiculos_map, v1):
-                            ok = False
-                        elif not atende_carga_minima(solucao, veiculos_map, v2):
-                            ok = False
-
-                    if ok:
-                        
-                        custo_novo = float(solucao['custo'])
-                        delta = custo_base - custo_novo
-                        if delta > melhor_delta + 1e-9:
-                            melhor_delta = delta
-                            melhor_mov = (um_a, um_b, v1, v2)
+    delta = delta_transp + frete_novo - frete_atual + ativ_nova - ativ_atual
+    return delta, viavel
 
-                    
-                    
-                    if solucao['alocacao_um'].get(um_a) == v2:
-                        desalocar_um(solucao, um_a, v2, instancia)
-                    if solucao['alocacao_um'].get(um_b) == v1:
-                        desalocar_um(solucao, um_b, v1, instancia)
+def _delta_veiculo(solucao, cp, vid, peso_novo, volume_novo, delta_transp, n_novo, reg_novo):
 
-                    
-                    alocar_um(solucao, um_a, v1, instancia)
-                    alocar_um(solucao, um_b, v2, instancia)
+    comp = solucao['componentes_custo']
+    return _delta_veiculos(
+        cp, cp['veic_idx'][vid],
+        comp['frete_morto_por_veiculo'].get(vid, 0.0),
+        comp['custo_ativacao_por_veiculo'].get(vid, 0.0),
+        peso_novo, volume_novo, delta_transp, n_novo, reg_novo
+    )
 
-    
-    if melhor_mov is not None:
-        um_a, um_b, v1, v2 = melhor_mov
-        desalocar_um(solucao, um_a, v1, instancia)
-        desalocar_um(solucao, um_b, v2, instancia)
-        alocar_um(solucao, um_a, v2, instancia)
-        alocar_um(solucao, um_b, v1, instancia)
-        return True
+def _estado_frota(solucao, cp):
 
-    return False
+    num_veiculos = len(cp['veic_ids'])
+    estado = {
+        'peso': np.zeros(num_veiculos),
+        'volume': np.zeros(num_veiculos),
+        'n': np.zeros(num_veiculos, dtype=np.int64),
+        'regiao': np.full(num_veiculos, -1, dtype=np.int64),
+        'frete': np.zeros(num_veiculos),
+        'ativacao': np.zeros(num_veiculos)
+    }
+    for j in range(num_veiculos):
+        _atualizar_estado(estado, solucao, cp, j)
+    return estado
 
-def realizar_troca_2x1(solucao, instancia):
-    
-    if solucao.get('custo') is None or 'componentes_custo' not in solucao:
-        custo_total(solucao, instancia)
+def _atualizar_estado(estado, solucao, cp, j):
 
-    
-    custo_base = float(solucao['custo'])
+    vid = cp['veic_ids'][j]
+    dados = solucao['veiculo_dados'][vid]
+    comp = solucao['componentes_custo']
 
-    
-    veiculos_map = instancia.get('veiculos_id', None)
-    if veiculos_map is None:
-        veiculos_map = {v['id']: v for v in instancia['veiculos']}
+    if not dados['ums']:
+        estado['peso'][j] = estado['volume'][j] = 0.0
+        estado['n'][j] = 0
+        estado['regiao'][j] = -1
+        estado['frete'][j] = estado['ativacao'][j] = 0.0
+        return
 
-    ativos = [vid for vid, dados in solucao['veiculo_dados'].items() if dados['ativo'] and len(dados['ums']) > 0]
-    if len(ativos) < 2:
-        return False
+    estado['peso'][j] = dados['peso_usado']
+    estado['volume'][j] = dados['volume_usado']
+    estado['n'][j] = len(dados['ums'])
+    estado['regiao'][j] = cp['regiao_idx'].get(str(dados['regiao']), -1) if dados['regiao'] is not None else -1
+    estado['frete'][j] = comp['frete_morto_por_veiculo'].get(vid, 0.0)
+    estado['ativacao'][j] = comp['custo_ativacao_por_veiculo'].get(vid, 0.0)
+
+def _deltas_remocao(cp, estado, u, o):
+
+    return _delta_veiculos(
+        cp, o, estado['frete'][o], estado['ativacao'][o],
+        estado['peso'][o] - cp['peso'][u],
+        estado['volume'][o] - cp['volume'][u],
+        -cp['custo_uv'][u, o],
+        estado['n'][o] - 1,
+        estado['regiao'][o]
+    )
 
-    melhor_mov = None
-    melhor_delta = 0.0
+def _versoes_frota(solucao, cp):
 
-    ativos_ordenados = sorted(ativos)
+    return np.fromiter((solucao['veiculo_dados'][vid].get('versao', 0) for vid in cp['veic_ids']),
+                       dtype=np.int64, count=len(cp['veic_ids']))
 
-    for i in range(len(ativos_ordenados)):
-        v1 = ativos_ordenados[i]
-        ums_v1 = list(solucao['veiculo_dados'][v1]['ums'])
-        if len(ums_v1) < 2:
-            continue
+def _reduzir_por_chave(destino_delta, destino_um, chaves, deltas, ums):
 
-        for j in range(i + 1, len(ativos_ordenados)):
-            v2 = ativos_ordenados[j]
-            ums_v2 = list(solucao['veiculo_dados'][v2]['ums'])
-            if len(ums_v2) < 1:
-                continue
+    finitos = np.isfinite(deltas)
+    chaves, deltas, ums = chaves[finitos], deltas[finitos], ums[finitos]
+    if chaves.size == 0:
+        return
+    ordem = np.lexsort((deltas, chaves))
+    unicas, primeiras = np.unique(chaves[ordem], return_index=True)
+    escolhidas = ordem[primeiras]
+    destino_delta[unicas] = deltas[escolhidas]
+    destino_um[unicas] = ums[escolhidas]
 
-            for (um_a, um_b) in itertools.combinations(ums_v1, 2):
-                for um_c in ums_v2:
+def _deltas_troca(solucao, cp, v1, carga1, grupos1, v2, carga2, grupos2):
 
-                    
-                    desalocar_um(solucao, um_a, v1, instancia)
-                    desalocar_um(solucao, um_b, v1, instancia)
-                    desalocar_um(solucao, um_c, v2, instancia)
+    _, idx1, r1 = carga1
+    _, idx2, r2 = carga2
+    n1, k1 = len(idx1), grupos1.shape[1]
+    n2, k2 = len(idx2), grupos2.shape[1]
 
-                    ok = True
+    
+    if r1 != r2 and not (n1 == k1 and n2 == k2):
+        return None
 
-                    
-                    if not alocar_um(solucao, um_c, v1, instancia):
-                        ok = False
-                    else:
-                        
-                        if not alocar_um(solucao, um_a, v2, instancia):
-                            ok = False
-                        else:
-                            if not alocar_um(solucao, um_b, v2, instancia):
-                                ok = False
-
-                    if ok:
-                        if not atende_carga_minima(solucao, veiculos_map, v1):
-                            ok = False
-                        elif not atende_carga_minima(solucao, veiculos_map, v2):
-                            ok = False
-
-                    if ok:
-                        
-                        custo_novo = float(solucao['custo'])
-                        delta = custo_base - custo_novo
-                        if delta > melhor_delta + 1e-9:
-                            melhor_delta = delta
-                            melhor_mov = (um_a, um_b, um_c, v1, v2)
+    j1 = cp['veic_idx'][v1]
+    j2 = cp['veic_idx'][v2]
+    dados1 = solucao['veiculo_dados'][v1]
+    dados2 = solucao['veiculo_dados'][v2]
+
+    u1 = idx1[grupos1]
+    u2 = idx2[grupos2]
+
+    peso1 = cp['peso'][u1].sum(axis=1)
+    peso2 = cp['peso'][u2].sum(axis=1)
+    vol1 = cp['volume'][u1].sum(axis=1)
+    vol2 = cp['volume'][u2].sum(axis=1)
+
+    transp1 = cp['custo_uv'][:, j1]
+    transp2 = cp['custo_uv'][:, j2]
+
+    delta1, ok1 = _delta_veiculo(
+        solucao, cp, v1,
+        dados1['peso_usado'] - peso1[:, None] + peso2[None, :],
+        dados1['volume_usado'] - vol1[:, None] + vol2[None, :],
+        transp1[u2].sum(axis=1)[None, :] - transp1[u1].sum(axis=1)[:, None],
+        n1 - k1 + k2,
+        r2 if n1 == k1 else r1
+    )
+    delta2, ok2 = _delta_veiculo(
+        solucao, cp, v2,
+        dados2['peso_usado'] - peso2[None, :] + peso1[:, None],
+        dados2['volume_usado'] - vol2[None, :] + vol1[:, None],
+        transp2[u1].sum(axis=1)[:, None] - transp2[u2].sum(axis=1)[None, :],
+        n2 - k2 + k1,
+        r1 if n2 == k2 else r2
+    )
 
-                    
-                    
-                    if solucao['alocacao_um'].get(um_c) == v1:
-                        desalocar_um(solucao, um_c, v1, instancia)
-                    if solucao['alocacao_um'].get(um_a) == v2:
-                        desalocar_um(solucao, um_a, v2, instancia)
-                    if solucao['alocacao_um'].get(um_b) == v2:
-                        desalocar_um(solucao, um_b, v2, instancia)
+    viavel = (ok1 & ok2
+              & cp['compativel'][u1, j2].all(axis=1)[:, None]
+              & cp['compativel'][u2, j1].all(axis=1)[None, :])
 
-                    
-                    alocar_um(solucao, um_a, v1, instancia)
-                    alocar_um(solucao, um_b, v1, instancia)
-                    alocar_um(solucao, um_c, v2, instancia)
-
-    if melhor_mov is not None:
-        um_a, um_b, um_c, v1, v2 = melhor_mov
-        desalocar_um(solucao, um_a, v1, instancia)
-        desalocar_um(solucao, um_b, v1, instancia)
-        desalocar_um(solucao, um_c, v2, instancia)
-        alocar_um(solucao, um_c, v1, instancia)
-        alocar_um(solucao, um_a, v2, instancia)
-        alocar_um(solucao, um_b, v2, instancia)
-        return True
+    return np.where(viavel, delta1 + delta2, np.inf)
 
-    return False
+def criar_estrategia(aceitacao=ACEITACAO, k=ACEITACAO_K, ordem_aleatoria=ORDEM_ALEATORIA, semente=None):
 
+    if aceitacao not in ('melhor', 'primeira', 'melhor_de_k', 'tabu'):
+        raise ValueError(f"Estratégia de aceitação desconhecida: {aceitacao}")
 
-def realizar_troca_1x2(solucao, instancia):
-    
-    if solucao.get('custo') is None or 'componentes_custo' not in solucao:
-        custo_total(solucao, instancia)
+    return {
+        'aceitacao': aceitacao,
+        'k': max(1, int(k)),
+        'rng': np.random.default_rng(semente) if ordem_aleatoria else None
+    }
 
-    
-    custo_base = float(solucao['custo'])
+def _novo_seletor(estrategia):
 
-    
-    veiculos_map = instancia.get('veiculos_id', None)
-    if veiculos_map is None:
-        veiculos_map = {v['id']: v for v in instancia['veiculos']}
+    if estrategia is None:
+        estrategia = criar_estrategia()
 
-    ativos = [vid for vid, dados in solucao['veiculo_dados'].items() if dados['ativo'] and len(dados['ums']) > 0]
-    if len(ativos) < 2:
-        return False
+    if estrategia['aceitacao'] == 'tabu':
+        seletor = estrategia['tabu']['seletor']
+        seletor['contador'] = estrategia.get('contador')
+        return seletor
 
-    melhor_mov = None
-    melhor_delta = 0.0
+    return {
+        'aceitacao': estrategia['aceitacao'],
+        'k': estrategia['k'],
+        'rng': estrategia['rng'],
+        'encontrados': 0,
+        'melhor_delta': 0.0,
+        'melhor_mov': None,
+        'contador': estrategia.get('contador')
+    }
 
-    ativos_ordenados = sorted(ativos)
+def _seletor_oferecer(seletor, deltas, montar_movimento):
 
-    for i in range(len(ativos_ordenados)):
-        v1 = ativos_ordenados[i]
-        ums_v1 = list(solucao['veiculo_dados'][v1]['ums'])
-        if len(ums_v1) < 1:
-            continue
+    plano = deltas.ravel()
+    if plano.size == 0:
+        return
 
-        for j in range(i + 1, len(ativos_ordenados)):
-            v2 = ativos_ordenados[j]
-            ums_v2 = list(solucao['veiculo_dados'][v2]['ums'])
-            if len(ums_v2) < 2:
-                continue
+    contador = seletor.get('contador')
+    if contador is not None:
+        contador['avaliados'] += plano.size
+        contador['viaveis'] += int(np.count_nonzero(np.isfinite(plano)))
+        contador['melhoras'] += int(np.count_nonzero(plano < -1e-9))
 
-            for um_c in ums_v1:
-                for (um_a, um_b) in itertools.combinations(ums_v2, 2):
+    if seletor['aceitacao'] == 'tabu':
+        _seletor_oferecer_tabu(seletor, deltas, plano, montar_movimento)
+        return
 
-                    
-                    desalocar_um(solucao, um_c, v1, instancia)
-                    desalocar_um(solucao, um_a, v2, instancia)
-                    desalocar_um(solucao, um_b, v2, instancia)
+    if seletor['aceitacao'] == 'melhor':
+        pos = int(np.argmin(plano))
+    else:
+        melhorias = np.flatnonzero(plano < -1e-9)
+        if melhorias.size == 0:
+            return
+        faltam = 1 if seletor['aceitacao'] == 'primeira' else seletor['k'] - seletor['encontrados']
+        tomadas = melhorias[:max(1, faltam)]
+        seletor['encontrados'] += len(tomadas)
+        pos = int(tomadas[np.argmin(plano[tomadas])])
 
-                    ok = True
+    delta = float(plano[pos])
+    if delta < seletor['melhor_delta'] - 1e-9:
+        seletor['melhor_delta'] = delta
+        seletor['melhor_mov'] = montar_movimento(np.unravel_index(pos, deltas.shape))
 
-                    
-                    if not alocar_um(solucao, um_a, v1, instancia):
-                        ok = False
-                    else:
-                        if not alocar_um(solucao, um_b, v1, instancia):
-                            ok = False
-                        else:
-                            
-                            if not alocar_um(solucao, um_c, v2, instancia):
-                                ok = False
-
-                    if ok:
-                        if not atende_carga_minima(solucao, veiculos_map, v1):
-                            ok = False
-                        elif not atende_carga_minima(solucao, veiculos_map, v2):
-                            ok = False
-
-                    if ok:
-                        
-                        custo_novo = float(solucao['custo'])
-                        delta = custo_base - custo_novo
-                        if delta > melhor_delta + 1e-9:
-                            melhor_delta = delta
-                            melhor_mov = (um_a, um_b, um_c, v1, v2)
+def _seletor_oferecer_tabu(seletor, deltas, plano, montar_movimento):
 
-                    
-                    if solucao['alocacao_um'].get(um_a) == v1:
-                        desalocar_um(solucao, um_a, v1, instancia)
-                    if solucao['alocacao_um'].get(um_b) == v1:
-                        desalocar_um(solucao, um_b, v1, instancia)
-                    if solucao['alocacao_um'].get(um_c) == v2:
-                        desalocar_um(solucao, um_c, v2, instancia)
-
-                    alocar_um(solucao, um_c, v1, instancia)
-                    alocar_um(solucao, um_a, v2, instancia)
-                    alocar_um(solucao, um_b, v2, instancia)
-
-    if melhor_mov is not None:
-        um_a, um_b, um_c, v1, v2 = melhor_mov
-        desalocar_um(solucao, um_c, v1, instancia)
-        desalocar_um(solucao, um_a, v2, instancia)
-        desalocar_um(solucao, um_b, v2, instancia)
-        alocar_um(solucao, um_a, v1, instancia)
-        alocar_um(solucao, um_b, v1, instancia)
-        alocar_um(solucao, um_c, v2, instancia)
-        return True
+    tabu = seletor['tabu']
+    candidatos = np.flatnonzero(plano < seletor['melhor_delta'] - 1e-9)
+    candidatos = candidatos[np.argsort(plano[candidatos], kind='stable')]
 
+    for pos in candidatos:
+        delta = float(plano[pos])
+        movimento = montar_movimento(np.unravel_index(pos, deltas.shape))
+
+        
+        proibido = any(tabu['ate'].get((um_id, v_para), -1) > tabu['iteracao']
+                       for um_id, v_de, v_para in movimento)
+        if proibido and tabu['custo_atual'] + delta >= tabu['melhor_custo'] - 1e-9:
+            continue
+
+        seletor['melhor_delta'] = delta
+        seletor['melhor_mov'] = movimento
+        seletor['origem'] = seletor.get('contador')
+        return
+
+def _seletor_encerrado(seletor):
+
+    if seletor['aceitacao'] == 'primeira':
+        return seletor['encontrados'] >= 1
+    if seletor['aceitacao'] == 'melhor_de_k':
+        return seletor['encontrados'] >= seletor['k']
     return False
 
-def realizar_desalocacao(solucao, instancia):
-    
-    if solucao.get('custo') is None or 'componentes_custo' not in solucao:
-        custo_total(solucao, instancia)
+def _seletor_aplicar(seletor, solucao, instancia):
 
     
-    custo_base = float(solucao['custo'])
+    if seletor['melhor_mov'] is None or seletor['aceitacao'] == 'tabu':
+        return False
+    return aplicar_movimento(solucao, instancia, seletor['melhor_mov'])
+
+def _ordem_varredura(seletor, n):
+
+    ordem = np.arange(n)
+    if seletor['rng'] is not None:
+        seletor['rng'].shuffle(ordem)
+    return ordem
+
+def aplicar_movimento(solucao, instancia, movimento):
+
+    iniciar_transacao(solucao, instancia)
+    for um_id, v_de, v_para in movimento:
+        if v_de is not None and not desalocar_um(solucao, um_id, v_de, instancia):
+            desfazer_transacao(solucao)
+            return False
+    for um_id, v_de, v_para in movimento:
+        if v_para is not None and not alocar_um(solucao, um_id, v_para, instancia):
+            desfazer_transacao(solucao)
+            return False
+
+    confirmar_transacao(solucao)
+    if VERIFICAR_CUSTO:
+        _verificar_periodicamente(solucao, instancia)
+    return True
+
+def _indice_pares(cp, idx, limite_peso, limite_volume):
+
+    n = len(idx)
+    if n < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    pesos = cp['peso'][idx]
+    ordem = np.argsort(pesos, kind='stable')
+    ordenados = pesos[ordem]
 
     
-    veiculos_map = instancia.get('veiculos_id', None)
-    if veiculos_map is None:
-        veiculos_map = {v['id']: v for v in instancia['veiculos']}
+    pos = np.arange(n)
+    fim = np.searchsorted(ordenados, limite_peso + 1e-9 - ordenados, side='right')
+    cont = np.maximum(fim - (pos + 1), 0)
+    total = int(cont.sum())
+    if total == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    a = np.repeat(pos, cont)
+    b = a + 1 + (np.arange(total) - np.repeat(np.cumsum(cont) - cont, cont))
+    pares = np.stack([ordem[a], ordem[b]], axis=1)
+
+    volumes = cp['volume'][idx]
+    pares = pares[volumes[pares].sum(axis=1) <= limite_volume + 1e-9]
+    pares.sort(axis=1)
+    return pares
+
+def _grupos_troca(solucao, cp, v_sai, carga_sai, k, v_entra, carga_entra):
+
+    n = len(carga_sai[1])
+    if k == 1:
+        return np.arange(n).reshape(-1, 1)
 
-    melhor_mov = None
-    melhor_delta = 0.0
+    j_sai = cp['veic_idx'][v_sai]
+    j_entra = cp['veic_idx'][v_entra]
+    dados_sai = solucao['veiculo_dados'][v_sai]
+    dados_entra = solucao['veiculo_dados'][v_entra]
+    idx_entra = carga_entra[1]
 
     
-    for um_id, v_origem_id in list(solucao['alocacao_um'].items()):
+    maior_peso = float(cp['peso'][idx_entra].max())
+    maior_volume = float(cp['volume'][idx_entra].max())
+    limite_peso = min(cp['cap_peso'][j_entra] - dados_entra['peso_usado'] + maior_peso,
+                      dados_sai['peso_usado'] + maior_peso - cp['carga_minima'][j_sai])
+    limite_volume = cp['cap_volume'][j_entra] - dados_entra['volume_usado'] + maior_volume
 
-        
-        desalocar_um(solucao, um_id, v_origem_id, instancia)
+    return _indice_pares(cp, carga_sai[1], limite_peso, limite_volume)
 
-        ok = True
-        if not atende_carga_minima(solucao, veiculos_map, v_origem_id):
-            ok = False
+def _realizar_troca_grupos(solucao, instancia, k1, k2, estrategia=None, memoria=None):
 
-        if ok:
-            
-            custo_novo = float(solucao['custo'])
-            delta = custo_base - custo_novo
-            if delta > melhor_delta + 1e-9:
-                melhor_delta = delta
-                melhor_mov = (um_id, v_origem_id)
+    if solucao.get('custo') is None or 'componentes_custo' not in solucao:
+        custo_total(solucao, instancia)
+
+    cp = obter_compacto(instancia)
+    seletor = _novo_seletor(estrategia)
+    cache = memoria.setdefault(('troca', k1, k2), {}) if memoria is not None else None
+
+    ativos = [vid for vid, dados in solucao['veiculo_dados'].items() if dados['ativo'] and len(dados['ums']) > 0]
+    if len(ativos) < 2:
+        return False
+
+    ativos_ordenados = sorted(ativos)
+    versoes = {vid: solucao['veiculo_dados'][vid].get('versao', 0) for vid in ativos_ordenados}
+    tamanhos = {vid: len(solucao['veiculo_dados'][vid]['ums']) for vid in ativos_ordenados}
+
+    pares = [(v1, v2) for i, v1 in enumerate(ativos_ordenados) for v2 in ativos_ordenados[i + 1:]
+             if tamanhos[v1] >= k1 and tamanhos[v2] >= k2]
+
+    for p in _ordem_varredura(seletor, len(pares)):
+        v1, v2 = pares[p]
+        chave_versao = (versoes[v1], versoes[v2])
 
         
-        alocar_um(solucao, um_id, v_origem_id, instancia)
+        if cache is not None:
+            anterior = cache.get((v1, v2), None)
+            if anterior is not None and anterior[0] == chave_versao:
+                if anterior[2] is not None:
+                    _seletor_oferecer(seletor, np.array([anterior[1]]), lambda pos: anterior[2])
+                    if _seletor_encerrado(seletor):
+                        break
+                continue
 
-    if melhor_mov is not None:
-        um_id, v_origem_id = melhor_mov
-        desalocar_um(solucao, um_id, v_origem_id, instancia)
-        return True
+        carga1 = _carga_veiculo(solucao, cp, v1, memoria)
+        carga2 = _carga_veiculo(solucao, cp, v2, memoria)
+        ums_v1 = carga1[0]
+        ums_v2 = carga2[0]
+
+        deltas = None
+        grupos1 = _grupos_troca(solucao, cp, v1, carga1, k1, v2, carga2)
+        grupos2 = _grupos_troca(solucao, cp, v2, carga2, k2, v1, carga1)
+        if len(grupos1) > 0 and len(grupos2) > 0:
+            grupos1 = grupos1[_ordem_varredura(seletor, len(grupos1))]
+            grupos2 = grupos2[_ordem_varredura(seletor, len(grupos2))]
+            deltas = _deltas_troca(solucao, cp, v1, carga1, grupos1, v2, carga2, grupos2)
+
+        def montar(pos):
+            return (tuple((ums_v1[x], v1, v2) for x in grupos1[pos[0]])
+                    + tuple((ums_v2[x], v2, v1) for x in grupos2[pos[1]]))
+
+        if cache is not None:
+            melhor_par = (chave_versao, 0.0, None)
+            if deltas is not None:
+                pos = np.unravel_index(int(np.argmin(deltas)), deltas.shape)
+                if deltas[pos] < -1e-9:
+                    melhor_par = (chave_versao, float(deltas[pos]), montar(pos))
+            cache[(v1, v2)] = melhor_par
+
+        if deltas is None:
+            continue
 
-    return False
+        _seletor_oferecer(seletor, deltas, montar)
+        if _seletor_encerrado(seletor):
+            break
+
+    return _seletor_aplicar(seletor, solucao, instancia)
+
+def realizar_troca_1x1(solucao, instancia, estrategia=None, memoria=None):
 
-def realoca_entre_veiculos(solucao, instancia):
+    return _realizar_troca_grupos(solucao, instancia, 1, 1, estrategia, memoria)
 
+def realizar_troca_2x1(solucao, instancia, estrategia=None, memoria=None):
+
+    return _realizar_troca_grupos(solucao, instancia, 2, 1, estrategia, memoria)
+
+def realizar_troca_1x2(solucao, instancia, estrategia=None, memoria=None):
+
+    return _realizar_troca_grupos(solucao, instancia, 1, 2, estrategia, memoria)
+
+def realizar_desalocacao(solucao, instancia, estrategia=None, memoria=None):
+    
     if solucao.get('custo') is None or 'componentes_custo' not in solucao:
         custo_total(solucao, instancia)
 
-    
-    ums_id = instancia.get('ums_id', None)
-    veiculos_map = instancia.get('veiculos_id', None)
-    veiculos = instancia.get('veiculos', [])
+    if not solucao['alocacao_um']:
+        return False
 
-    if ums_id is None:
-        ums_id = {u['id']: u for u in instancia['ums']}
-    if veiculos_map is None:
-        veiculos_map = {v['id']: v for v in instancia['veiculos']}
+    cp = obter_compacto(instancia)
+    seletor = _novo_seletor(estrategia)
+    estado = _estado_frota(solucao, cp)
+    veic_ids = cp['veic_ids']
+    um_ids = cp['um_ids']
+    num_veiculos = len(veic_ids)
+
+    if memoria is None:
+        u, o = _linhas_alocadas(solucao, cp, range(num_veiculos))
+        delta, viavel = _deltas_remocao(cp, estado, u, o)
+        delta = np.where(viavel, delta + cp['penalidade'][u], np.inf)
+
+        ordem = _ordem_varredura(seletor, len(u))
+        _seletor_oferecer(seletor, delta[ordem], lambda pos: (
+            (um_ids[u[ordem[pos[0]]]], veic_ids[o[ordem[pos[0]]]], None),
+        ))
+        return _seletor_aplicar(seletor, solucao, instancia)
+
+    
+    rem = memoria.get('desalocacao', None)
+    if rem is None:
+        rem = {'versoes': np.full(num_veiculos, -1, dtype=np.int64),
+               'delta': np.full(num_veiculos, np.inf),
+               'um': np.full(num_veiculos, -1, dtype=np.int64)}
+        memoria['desalocacao'] = rem
+
+    versoes = _versoes_frota(solucao, cp)
+    sujos = np.flatnonzero(versoes != rem['versoes'])
+    if sujos.size:
+        rem['delta'][sujos] = np.inf
+        u, o = _linhas_alocadas(solucao, cp, sujos, memoria)
+        delta, viavel = _deltas_remocao(cp, estado, u, o)
+        delta = np.where(viavel, delta + cp['penalidade'][u], np.inf)
+        _reduzir_por_chave(rem['delta'], rem['um'], o, delta, u)
+        rem['versoes'] = versoes
+
+    ordem = _ordem_varredura(seletor, num_veiculos)
+    _seletor_oferecer(seletor, rem['delta'][ordem], lambda pos: (
+        (um_ids[rem['um'][ordem[pos[0]]]], veic_ids[ordem[pos[0]]], None),
+    ))
+    return _seletor_aplicar(seletor, solucao, instancia)
+
+def _deltas_realocacao(cp, estado, u, o, delta_origem, ok_origem, colunas):
+
+    colunas = np.asarray(colunas)[None, :]
+    n_dest = estado['n'][colunas]
+    reg_dest = estado['regiao'][colunas]
+    destino = cp['destino_um'][u][:, None]
+
+    delta_dest, ok_dest = _delta_veiculos(
+        cp, colunas, estado['frete'][colunas], estado['ativacao'][colunas],
+        estado['peso'][colunas] + cp['peso'][u][:, None],
+        estado['volume'][colunas] + cp['volume'][u][:, None],
+        cp['custo_uv'][u[:, None], colunas],
+        n_dest + 1,
+        np.where(n_dest > 0, reg_dest, destino)
+    )
 
-    
-    custo_base = float(solucao['custo'])
+    viavel = (ok_origem[:, None] & ok_dest & cp['compativel'][u[:, None], colunas]
+              & ((n_dest == 0) | (reg_dest == destino))
+              & (colunas != o[:, None]))
 
-    melhor_movimento = None  
-    melhor_delta = 0.0
+    return np.where(viavel, delta_origem[:, None] + delta_dest, np.inf)
 
-    for um_id, v_origem_id in list(solucao['alocacao_um'].items()):
-        um = ums_id[um_id]
+def realoca_entre_veiculos(solucao, instancia, estrategia=None, memoria=None):
 
-        for v_dest in veiculos:
-            v_dest_id = v_dest['id']
-            if v_dest_id == v_origem_id:
-                continue
+    if solucao.get('custo') is None or 'componentes_custo' not in solucao:
+        custo_total(solucao, instancia)
 
-            
-            if not um_compatível_com_veiculo(um, v_dest):
-                continue
-            if not veiculo_tem_capacidade(solucao['veiculo_dados'], v_dest, um):
-                continue
+    if not solucao['alocacao_um']:
+        return False
 
-            
-            if not desalocar_um(solucao, um_id, v_origem_id, instancia):
+    cp = obter_compacto(instancia)
+    seletor = _novo_seletor(estrategia)
+    estado = _estado_frota(solucao, cp)
+    veic_ids = cp['veic_ids']
+    um_ids = cp['um_ids']
+    num_veiculos = len(veic_ids)
+    todas = np.arange(num_veiculos)
+
+    if memoria is None:
+        u, o = _linhas_alocadas(solucao, cp, todas)
+        delta_origem, ok_origem = _deltas_remocao(cp, estado, u, o)
+
+        linhas = _ordem_varredura(seletor, len(u))
+        passo = len(linhas) if seletor['aceitacao'] == 'melhor' else BLOCO_BUSCA
+
+        for ini in range(0, len(linhas), passo):
+            bloco = linhas[ini:ini + passo]
+            deltas = _deltas_realocacao(cp, estado, u[bloco], o[bloco], delta_origem[bloco], ok_origem[bloco], todas)
+
+            _seletor_oferecer(seletor, deltas, lambda pos: (
+                (um_ids[u[bloco[pos[0]]]], veic_ids[o[bloco[pos[0]]]], veic_ids[pos[1]]),
+            ))
+            if _seletor_encerrado(seletor):
+                break
+
+        return _seletor_aplicar(seletor, solucao, instancia)
+
+    
+    rel = memoria.get('realocacao', None)
+    if rel is None:
+        rel = {'versoes': np.full(num_veiculos, -1, dtype=np.int64),
+               'delta': np.full((num_veiculos, num_veiculos), np.inf),
+               'um': np.full((num_veiculos, num_veiculos), -1, dtype=np.int64)}
+        memoria['realocacao'] = rel
+
+    versoes = _versoes_frota(solucao, cp)
+    sujos = versoes != rel['versoes']
+    if sujos.any():
+        rel['delta'][sujos, :] = np.inf
+        rel['delta'][:, sujos] = np.inf
+
+        sujos_j = np.flatnonzero(sujos)
+        limpos_j = np.flatnonzero(~sujos)
+        for origens, colunas in ((sujos_j, todas), (limpos_j, sujos_j)):
+            if len(origens) == 0 or len(colunas) == 0:
                 continue
-            if not alocar_um(solucao, um_id, v_dest_id, instancia):
-                
-                alocar_um(solucao, um_id, v_origem_id, instancia)
+            u, o = _linhas_alocadas(solucao, cp, origens, memoria)
+            if len(u) == 0:
                 continue
+            delta_origem, ok_origem = _deltas_remocao(cp, estado, u, o)
+            deltas = _deltas_realocacao(cp, estado, u, o, delta_origem, ok_origem, colunas)
+            _reduzir_por_chave(
+                rel['delta'].reshape(-1), rel['um'].reshape(-1),
+                (o[:, None] * num_veiculos + colunas[None, :]).ravel(),
+                deltas.ravel(),
+                np.repeat(u, len(colunas))
+            )
+        rel['versoes'] = versoes
 
-            
-            ok = True
-            for vid in (v_origem_id, v_dest_id):
-                dados_v = solucao['veiculo_dados'][vid]
-                veic = veiculos_map[vid]
-                carga_min = float(veic.get('carga_minima', 0.0) or 0.0)
-                if dados_v['ativo'] and dados_v['peso_usado'] + 1e-9 < carga_min:
-                    ok = False
-                    break
+    ordem = _ordem_varredura(seletor, num_veiculos)
+    _seletor_oferecer(seletor, rel['delta'][ordem], lambda pos: (
+        (um_ids[rel['um'][ordem[pos[0]], pos[1]]], veic_ids[ordem[pos[0]]], veic_ids[pos[1]]),
+    ))
+    return _seletor_aplicar(seletor, solucao, instancia)
 
-            if ok:
-                
-                novo_custo = float(solucao['custo'])
-                delta = novo_custo - custo_base
-                if delta < melhor_delta - 1e-9:
-                    melhor_delta = delta
-                    melhor_movimento = (um_id, v_origem_id, v_dest_id)
+def criar_perfil():
 
-            
-            desalocar_um(solucao, um_id, v_dest_id, instancia)
-            alocar_um(solucao, um_id, v_origem_id, instancia)
+    return {}
+
+def _contador_perfil(perfil, nome):
+
+    contador = perfil.get(nome)
+    if contador is None:
+        contador = {'chamadas': 0, 'tempo': 0.0, 'avaliados': 0, 'viaveis': 0,
+                    'melhoras': 0, 'aplicados': 0, 'ganho': 0.0}
+        perfil[nome] = contador
+    return contador
+
+def somar_perfis(destino, origem):
+
+    for nome, contador in (origem or {}).items():
+        alvo = _contador_perfil(destino, nome)
+        for campo, valor in contador.items():
+            alvo[campo] += valor
+    return destino
+
+def _executar_vizinhanca(vizinhanca, solucao, instancia, estrategia, memoria, perfil):
+
+    if perfil is None:
+        return vizinhanca(solucao, instancia, estrategia, memoria)
+
+    contador = _contador_perfil(perfil, vizinhanca.__name__)
+    custo_antes = solucao['custo']
+    estrategia['contador'] = contador
+    t0 = time.perf_counter()
+    try:
+        aplicado = vizinhanca(solucao, instancia, estrategia, memoria)
+    finally:
+        contador['tempo'] += time.perf_counter() - t0
+        contador['chamadas'] += 1
+        estrategia['contador'] = None
+
+    if aplicado:
+        contador['aplicados'] += 1
+        contador['ganho'] += custo_antes - solucao['custo']
+    return aplicado
+
+def _indice_residual(solucao, cp, estado, memoria=None):
+
+    indice = memoria.get('residual', None) if memoria is not None else None
+    if indice is None:
+        indice = {'versoes': np.full(len(cp['veic_ids']), -1, dtype=np.int64), 'chaves': {}, 'regioes': {}}
+        if memoria is not None:
+            memoria['residual'] = indice
+
+    
+    versoes = _versoes_frota(solucao, cp)
+    for j in np.flatnonzero(versoes != indice['versoes']).tolist():
+        if j in indice['chaves']:
+            regiao, chave = indice['chaves'][j]
+            lista = indice['regioes'][regiao]
+            del lista[bisect.bisect_left(lista, chave)]
+        regiao = int(estado['regiao'][j]) if estado['n'][j] > 0 else -1
+        chave = (float(cp['cap_peso'][j] - estado['peso'][j]), j)
+        bisect.insort(indice['regioes'].setdefault(regiao, []), chave)
+        indice['chaves'][j] = (regiao, chave)
+    indice['versoes'] = versoes
+    return indice
+
+def _colunas_com_folga(indice, regiao, limite_min):
+
+    partes = []
+    for lista in (indice['regioes'].get(regiao, []), indice['regioes'].get(-1, [])):
+        partes.append(lista[bisect.bisect_left(lista, (limite_min - 1e-9, -1)):])
+    return np.fromiter((j for _, j in heapq.merge(*partes)), dtype=np.int64)
+
+def _pendentes_por_regiao(solucao, cp, seletor):
+
+    pendentes = _pendentes(solucao, cp)
+    pendentes = pendentes[_ordem_varredura(seletor, len(pendentes))]
+    destinos = cp['destino_um'][pendentes]
+    regioes = np.unique(destinos)
+    return [(int(k), pendentes[destinos == k]) for k in regioes[_ordem_varredura(seletor, len(regioes))]]
+
+def realizar_insercao(solucao, instancia, estrategia=None, memoria=None):
+
+    if solucao.get('custo') is None or 'componentes_custo' not in solucao:
+        custo_total(solucao, instancia)
+
+    if not solucao['nao_alocadas']:
+        return False
+
+    cp = obter_compacto(instancia)
+    seletor = _novo_seletor(estrategia)
+    estado = _estado_frota(solucao, cp)
+    veic_ids = cp['veic_ids']
+    um_ids = cp['um_ids']
+    indice = _indice_residual(solucao, cp, estado, memoria)
+
+    for k, u in _pendentes_por_regiao(solucao, cp, seletor):
+        colunas = _colunas_com_folga(indice, k, float(cp['peso'][u].min()))
+        if len(colunas) == 0:
+            continue
+
+        passo = len(u) if seletor['aceitacao'] == 'melhor' else BLOCO_BUSCA
+        for ini in range(0, len(u), passo):
+            bloco = u[ini:ini + passo]
+            deltas = _deltas_realocacao(cp, estado, bloco, np.full(len(bloco), -1), -cp['penalidade'][bloco],
+                                        np.ones(len(bloco), dtype=bool), colunas)
+
+            _seletor_oferecer(seletor, deltas, lambda pos: (
+                (um_ids[bloco[pos[0]]], None, veic_ids[colunas[pos[1]]]),
+            ))
+            if _seletor_encerrado(seletor):
+                return _seletor_aplicar(seletor, solucao, instancia)
+
+    return _seletor_aplicar(seletor, solucao, instancia)
+
+def _deltas_entrada_saida(cp, estado, u, sai, o):
+
+    o = o[None, :]
+    sai = sai[None, :]
+    entra = u[:, None]
+
+    delta_v, ok = _delta_veiculos(
+        cp, o, estado['frete'][o], estado['ativacao'][o],
+        estado['peso'][o] - cp['peso'][sai] + cp['peso'][entra],
+        estado['volume'][o] - cp['volume'][sai] + cp['volume'][entra],
+        cp['custo_uv'][entra, o] - cp['custo_uv'][sai, o],
+        estado['n'][o],
+        estado['regiao'][o]
+    )
+    viavel = ok & cp['compativel'][entra, o]
+    return np.where(viavel, delta_v + cp['penalidade'][sai] - cp['penalidade'][entra], np.inf)
+
+def realizar_troca_entrada_saida(solucao, instancia, estrategia=None, memoria=None):
+
+    if solucao.get('custo') is None or 'componentes_custo' not in solucao:
+        custo_total(solucao, instancia)
+
+    if not solucao['nao_alocadas'] or not solucao['alocacao_um']:
+        return False
+
+    cp = obter_compacto(instancia)
+    seletor = _novo_seletor(estrategia)
+    estado = _estado_frota(solucao, cp)
+    veic_ids = cp['veic_ids']
+    um_ids = cp['um_ids']
+    residual = cp['cap_peso'] - estado['peso']
+
+    for k, u in _pendentes_por_regiao(solucao, cp, seletor):
+        veiculos = np.flatnonzero((estado['n'] > 0) & (estado['regiao'] == k))
+        if len(veiculos) == 0:
+            continue
 
-    
-    if melhor_movimento is not None:
-        um_id, v_origem_id, v_dest_id = melhor_movimento
-        desalocar_um(solucao, um_id, v_origem_id, instancia)
-        alocar_um(solucao, um_id, v_dest_id, instancia)
         
-        return True
+        sai, o = _linhas_alocadas(solucao, cp, veiculos, memoria)
+        linhas = np.flatnonzero(residual[o] + cp['peso'][sai] >= float(cp['peso'][u].min()) - 1e-9)
+        if len(linhas) == 0:
+            continue
+        sai, o = sai[linhas], o[linhas]
 
-    return False
-def busca_local(solucao, instancia, max_iter=200, time_limit=TIMEOUT):
+        for ini in range(0, len(u), BLOCO_BUSCA):
+            bloco = u[ini:ini + BLOCO_BUSCA]
+            deltas = _deltas_entrada_saida(cp, estado, bloco, sai, o)
+
+            _seletor_oferecer(seletor, deltas, lambda pos: (
+                (um_ids[sai[pos[1]]], veic_ids[o[pos[1]]], None),
+                (um_ids[bloco[pos[0]]], None, veic_ids[o[pos[1]]])
+            ))
+            if _seletor_encerrado(seletor):
+                return _seletor_aplicar(seletor, solucao, instancia)
+
+    return _seletor_aplicar(seletor, solucao, instancia)
+
+def _agregados_frota(solucao, cp, memoria=None):
+
+    num_veiculos = len(cp['veic_ids'])
+    agregados = memoria.get('agregados', None) if memoria is not None else None
+    if agregados is None:
+        agregados = {'versoes': np.full(num_veiculos, -1, dtype=np.int64),
+                     'transporte_tipo': np.zeros((num_veiculos, len(cp['tipos']))),
+                     'compativeis': np.zeros((num_veiculos, num_veiculos), dtype=np.int64)}
+        if memoria is not None:
+            memoria['agregados'] = agregados
+
+    versoes = _versoes_frota(solucao, cp)
+    sujos = np.flatnonzero(versoes != agregados['versoes'])
+    if sujos.size:
+        agregados['transporte_tipo'][sujos] = 0.0
+        agregados['compativeis'][sujos] = 0
+        u, o = _linhas_alocadas(solucao, cp, sujos, memoria)
+        np.add.at(agregados['transporte_tipo'], o, cp['custo_tipo'][u])
+        np.add.at(agregados['compativeis'], o, cp['compativel'][u])
+        agregados['versoes'] = versoes
+    return agregados
+
+def realizar_transferencia_carga(solucao, instancia, estrategia=None, memoria=None):
+
+    if solucao.get('custo') is None or 'componentes_custo' not in solucao:
+        custo_total(solucao, instancia)
+
+    cp = obter_compacto(instancia)
+    seletor = _novo_seletor(estrategia)
+    estado = _estado_frota(solucao, cp)
+    origens = np.flatnonzero(estado['n'] > 0)
+    destinos = np.flatnonzero(estado['n'] == 0)
+    if len(origens) == 0 or len(destinos) == 0:
+        return False
+
+    agregados = _agregados_frota(solucao, cp, memoria)
+    a = origens[:, None]
+    b = destinos[None, :]
+    tipo_a = cp['tipo_veic'][a]
+    tipo_b = cp['tipo_veic'][b]
+    reg_a = estado['regiao'][a]
+    peso_a = estado['peso'][a]
+
+    custo_atual = estado['ativacao'][a] + estado['frete'][a] + agregados['transporte_tipo'][a, tipo_a]
+    ativacao_b = np.where(reg_a >= 0, cp['custo_ativacao'][b, np.maximum(reg_a, 0)], 0.0)
+    custo_novo = (ativacao_b + cp['beta'] * np.maximum(cp['cap_peso'][b] - peso_a, 0.0)
+                  + agregados['transporte_tipo'][a, tipo_b])
+
+    viavel = ((agregados['compativeis'][a, b] == estado['n'][a])
+              & (peso_a <= cp['cap_peso'][b] + 1e-9)
+              & (estado['volume'][a] <= cp['cap_volume'][b] + 1e-9)
+              & (peso_a + 1e-9 >= cp['carga_minima'][b]))
+    deltas = np.where(viavel, custo_novo - custo_atual, np.inf)
+
+    linhas = _ordem_varredura(seletor, len(origens))
+    colunas = _ordem_varredura(seletor, len(destinos))
+    deltas = deltas[linhas][:, colunas]
+
+    def montar(pos):
+        j_de = origens[linhas[pos[0]]]
+        j_para = destinos[colunas[pos[1]]]
+        ums = _carga_veiculo(solucao, cp, cp['veic_ids'][j_de], memoria)[0]
+        return tuple((um_id, cp['veic_ids'][j_de], cp['veic_ids'][j_para]) for um_id in ums)
+
+    _seletor_oferecer(seletor, deltas, montar)
+    return _seletor_aplicar(seletor, solucao, instancia)
+
+def _plano_eliminacao(cp, estado, j, idx):
+
+    alvos = np.flatnonzero((estado['n'] > 0) & (estado['regiao'] == estado['regiao'][j]))
+    alvos = alvos[alvos != j]
+    residual = cp['cap_peso'][alvos] - estado['peso'][alvos]
+    if len(alvos) == 0 or residual.sum() + 1e-9 < estado['peso'][j]:
+        return np.inf, None
+
+    peso = estado['peso'][alvos].copy()
+    volume = estado['volume'][alvos].copy()
+    frete = estado['frete'][alvos].copy()
+    n = estado['n'][alvos].copy()
+    regiao = estado['regiao'][alvos]
+    total = -(estado['ativacao'][j] + estado['frete'][j])
+    plano = []
+
+    for x in np.argsort(-cp['peso'][idx], kind='stable'):
+        i = idx[x]
+        delta, ok = _delta_veiculos(cp, alvos, frete, estado['ativacao'][alvos],
+                                    peso + cp['peso'][i], volume + cp['volume'][i],
+                                    cp['custo_uv'][i, alvos], n + 1, regiao)
+        delta = np.where(ok & cp['compativel'][i, alvos], delta, np.inf)
+        k = int(np.argmin(delta))
+        if not np.isfinite(delta[k]):
+            return np.inf, None
+
+        total += float(delta[k]) - float(cp['custo_uv'][i, j])
+        peso[k] += cp['peso'][i]
+        volume[k] += cp['volume'][i]
+        frete[k] = cp['beta'] * max(cp['cap_peso'][alvos[k]] - peso[k], 0.0)
+        n[k] += 1
+        plano.append((i, alvos[k]))
+
+    return total, plano
+
+def realizar_eliminacao_veiculo(solucao, instancia, estrategia=None, memoria=None):
+
+    if solucao.get('custo') is None or 'componentes_custo' not in solucao:
+        custo_total(solucao, instancia)
+
+    cp = obter_compacto(instancia)
+    seletor = _novo_seletor(estrategia)
+    estado = _estado_frota(solucao, cp)
+    ativos = np.flatnonzero(estado['n'] > 0)
+    if len(ativos) < 2:
+        return False
+
+    veic_ids = cp['veic_ids']
+    um_ids = cp['um_ids']
+
+    for j in ativos[_ordem_varredura(seletor, len(ativos))]:
+        vid = veic_ids[j]
+        idx = _carga_veiculo(solucao, cp, vid, memoria)[1]
+        delta, plano = _plano_eliminacao(cp, estado, j, idx)
+        if plano is None:
+            continue
+
+        _seletor_oferecer(seletor, np.array([delta]), lambda pos: (
+            tuple((um_ids[i], vid, veic_ids[k]) for i, k in plano)
+        ))
+        if _seletor_encerrado(seletor):
+            break
+
+    return _seletor_aplicar(seletor, solucao, instancia)
+
+def busca_local(solucao, instancia, max_iter=200, time_limit=TIMEOUT, estrategia=None, usar_memoria=True, perfil=None):
         
     if solucao.get('custo') is None or 'componentes_custo' not in solucao:
         custo_total(solucao, instancia)
 
+    if estrategia is None:
+        estrategia = criar_estrategia()
+    estrategia = dict(estrategia, contador=None)
+
+    memoria = {} if usar_memoria else None
+
     start_time = time.time()
     iteracoes = 0
 
@@ -1078,16 +1860,12 @@ def busca_local(solucao, instancia, max_iter=200, time_limit=TIMEOUT):
 
         melhorou = False
 
-        if realoca_entre_veiculos(solucao, instancia):
-            melhorou = True
-        elif realizar_troca_1x1(solucao, instancia):
-            melhorou = True
-        elif realizar_troca_2x1(solucao, instancia):
-            melhorou = True
-        elif realizar_troca_1x2(solucao, instancia):
-            melhorou = True
-        elif realizar_desalocacao(solucao, instancia):
-            melhorou = True
+        for vizinhanca in (realizar_insercao, realoca_entre_veiculos, realizar_transferencia_carga,
+                           realizar_eliminacao_veiculo, realizar_troca_1x1, realizar_troca_2x1,
+                           realizar_troca_1x2, realizar_troca_entrada_saida, realizar_desalocacao):
+            if _executar_vizinhanca(vizinhanca, solucao, instancia, estrategia, memoria, perfil):
+                melhorou = True
+                break
 
         if not melhorou:
             
@@ -1097,72 +1875,605 @@ def busca_local(solucao, instancia, max_iter=200, time_limit=TIMEOUT):
 
     return solucao
 
+def busca_tabu(solucao, instancia, max_iter=TABU_MAX_ITER, time_limit=TIMEOUT, estrategia=None,
+               tenure=TABU_TENURE, max_sem_melhora=TABU_MAX_SEM_MELHORA, perfil=None):
+
+    if solucao.get('custo') is None or 'componentes_custo' not in solucao:
+        custo_total(solucao, instancia)
 
-def aplicar_restricao_carga_minima(solucao, instancia):
+    if estrategia is None:
+        estrategia = criar_estrategia('tabu')
+    if estrategia['aceitacao'] != 'tabu':
+        raise ValueError("busca_tabu requer estratégia com aceitação 'tabu'")
+
+    tabu = {
+        'ate': {},
+        'iteracao': 0,
+        'custo_atual': solucao['custo'],
+        'melhor_custo': solucao['custo'],
+        'seletor': None
+    }
+    estrategia = dict(estrategia, tabu=tabu, contador=None)
+    vizinhancas = (realizar_insercao, realoca_entre_veiculos, realizar_transferencia_carga,
+                   realizar_eliminacao_veiculo, realizar_troca_1x1, realizar_troca_2x1,
+                   realizar_troca_1x2, realizar_troca_entrada_saida, realizar_desalocacao)
+
+    melhor_sol = capturar_solucao(solucao, instancia)
+    start_time = time.time()
+    sem_melhora = 0
+
+    while tabu['iteracao'] < max_iter and sem_melhora < max_sem_melhora:
+        if (time.time() - start_time) > time_limit:
+            break
+
+        tabu['seletor'] = {
+            'aceitacao': 'tabu',
+            'k': estrategia['k'],
+            'rng': estrategia['rng'],
+            'encontrados': 0,
+            'melhor_delta': np.inf,
+            'melhor_mov': None,
+            'origem': None,
+            'tabu': tabu
+        }
+
+        
+        for vizinhanca in vizinhancas:
+            _executar_vizinhanca(vizinhanca, solucao, instancia, estrategia, None, perfil)
+
+        movimento = tabu['seletor']['melhor_mov']
+        custo_antes = solucao['custo']
+        if movimento is None or not aplicar_movimento(solucao, instancia, movimento):
+            break
+
+        origem = tabu['seletor']['origem']
+        if origem is not None:
+            origem['aplicados'] += 1
+            origem['ganho'] += custo_antes - solucao['custo']
+
+        
+        for um_id, v_de, v_para in movimento:
+            tabu['ate'][(um_id, v_de)] = tabu['iteracao'] + tenure
+
+        tabu['iteracao'] += 1
+        tabu['custo_atual'] = solucao['custo']
+
+        if solucao['custo'] < tabu['melhor_custo'] - 1e-9:
+            tabu['melhor_custo'] = solucao['custo']
+            melhor_sol = capturar_solucao(solucao, instancia)
+            sem_melhora = 0
+        else:
+            sem_melhora += 1
+
+    return restaurar_solucao(melhor_sol, instancia)
+
+
+def _chaves_insercao(cp, estado, u):
+
+    
+    u = np.asarray(u)
+    destino = cp['destino_um'][u][:, None]
+    ocupado = (estado['n'] > 0)[None, :]
+    reg_v = np.where(cp['destino_veic'] >= 0, cp['destino_veic'], estado['regiao'])[None, :]
+
+    ok = (cp['compativel'][u]
+          & ((reg_v < 0) | (destino < 0) | (reg_v == destino))
+          & (estado['peso'][None, :] + cp['peso'][u][:, None] <= cp['cap_peso'][None, :] + 1e-9)
+          & (estado['volume'][None, :] + cp['volume'][u][:, None] <= cp['cap_volume'][None, :] + 1e-9))
+
+    fixos = ok & ocupado & (reg_v >= 0) & (reg_v == destino)
+    candidatos = np.where(fixos.any(axis=1)[:, None], fixos, ok & ~ocupado)
+
+    custo = np.where(candidatos, cp['custo_uv'][u], np.inf)
+    folga = ((cp['cap_peso'] - estado['peso']) / (cp['cap_peso'] + 1e-9)
+             + (cp['cap_volume'] - estado['volume']) / (cp['cap_volume'] + 1e-9))
+    return custo, folga
+
+def _melhor_insercao(custo, folga):
+
+    j = int(np.lexsort((-folga, custo))[0])
+    return j if np.isfinite(custo[j]) else None
+
+def _pendentes(solucao, cp):
+
+    return np.array(sorted(cp['um_idx'][u] for u in solucao['nao_alocadas']), dtype=np.int64)
+
+def _ums_alocadas(solucao, cp):
+
+    u, o = _linhas_alocadas(solucao, cp, range(len(cp['veic_ids'])))
+    ordem = np.argsort(u, kind='stable')
+    return u[ordem], o[ordem]
+
+def _remover_ums(solucao, instancia, cp, linhas):
+
+    for i in linhas:
+        um_id = cp['um_ids'][i]
+        vid = solucao['alocacao_um'].get(um_id, None)
+        if vid is not None:
+            desalocar_um(solucao, um_id, vid, instancia)
+
+def _destruir_aleatorio(solucao, instancia, cp, rng, q):
+
+    u, o = _ums_alocadas(solucao, cp)
+    _remover_ums(solucao, instancia, cp, rng.choice(u, size=min(q, len(u)), replace=False))
+
+def _destruir_pior(solucao, instancia, cp, rng, q):
+
+    u, o = _ums_alocadas(solucao, cp)
+    delta, viavel = _deltas_remocao(cp, _estado_frota(solucao, cp), u, o)
 
     
-    veiculos_id = instancia.get('veiculos_id', None)
-    if veiculos_id is None:
-        veiculos_id = {v['id']: v for v in instancia['veiculos']}  
+    ordem = list(u[np.argsort(delta, kind='stable')])
+    escolhidas = []
+    for _ in range(min(q, len(ordem))):
+        pos = int(len(ordem) * rng.random() ** ALNS_ALEATORIEDADE_PIOR)
+        escolhidas.append(ordem.pop(pos))
+    _remover_ums(solucao, instancia, cp, escolhidas)
+
+def _destruir_veiculo(solucao, instancia, cp, rng, q):
+
+    ativos = [vid for vid in cp['veic_ids'] if solucao['veiculo_dados'][vid]['ums']]
+    removidas = 0
+    for pos in rng.permutation(len(ativos)):
+        if removidas >= q:
+            break
+        vid = ativos[pos]
+        for um_id in sorted(solucao['veiculo_dados'][vid]['ums']):
+            desalocar_um(solucao, um_id, vid, instancia)
+            removidas += 1
+
+def _destruir_regiao(solucao, instancia, cp, rng, q):
+
+    u, o = _ums_alocadas(solucao, cp)
+    if len(u) == 0:
+        return
+    regioes = np.unique(cp['destino_um'][u])
+    regiao = regioes[rng.integers(len(regioes))]
+    _remover_ums(solucao, instancia, cp, u[cp['destino_um'][u] == regiao])
+
+def _destruir_tipo(solucao, instancia, cp, rng, q):
+
+    u, o = _ums_alocadas(solucao, cp)
+    if len(u) == 0:
+        return
+    semente = u[rng.integers(len(u))]
 
     
+    custos = cp['custo_tipo']
+    distancia = (np.abs(custos[u] - custos[semente]).sum(axis=1) / (np.abs(custos[semente]).sum() + 1e-9)
+                 + (cp['compativel'][u] != cp['compativel'][semente]).mean(axis=1))
+    _remover_ums(solucao, instancia, cp, u[np.argsort(distancia, kind='stable')[:q]])
+
+def _reparo_guloso(solucao, instancia, cp, rng):
+
+    pendentes = _pendentes(solucao, cp)
+    pendentes = pendentes[rng.permutation(len(pendentes))]
+    pendentes = pendentes[np.argsort(-cp['penalidade'][pendentes], kind='stable')]
+    estado = _estado_frota(solucao, cp)
+
+    for i in pendentes:
+        custo, folga = _chaves_insercao(cp, estado, [i])
+        j = _melhor_insercao(custo[0], folga)
+        if j is None:
+            continue
+        if alocar_um(solucao, cp['um_ids'][i], cp['veic_ids'][j], instancia):
+            _atualizar_estado(estado, solucao, cp, j)
+
+def _reparo_arrependimento(solucao, instancia, cp, rng):
+
+    pendentes = _pendentes(solucao, cp)
+    estado = _estado_frota(solucao, cp)
+
+    while len(pendentes) > 0:
+        custo, folga = _chaves_insercao(cp, estado, pendentes)
+        ordenado = np.sort(custo, axis=1)
+        c1 = ordenado[:, 0]
+        c2 = ordenado[:, 1] if custo.shape[1] > 1 else np.full(len(pendentes), np.inf)
+
+        possiveis = np.isfinite(c1)
+        if not possiveis.any():
+            break
+
+        
+        arrependimento = np.where(np.isfinite(c2), c2 - np.where(possiveis, c1, 0.0), np.inf)
+        arrependimento = np.where(possiveis, arrependimento, -np.inf)
+        r = int(np.lexsort((c1, -arrependimento))[0])
+
+        i = pendentes[r]
+        j = _melhor_insercao(custo[r], folga)
+        if alocar_um(solucao, cp['um_ids'][i], cp['veic_ids'][j], instancia):
+            _atualizar_estado(estado, solucao, cp, j)
+        pendentes = np.delete(pendentes, r)
+
+def busca_alns(solucao, instancia, max_iter=ALNS_MAX_ITER, time_limit=TIMEOUT, semente=RANDOM_SEED, usar_busca_local=True, perfil=None,
+               limite=None):
+
+    if solucao.get('custo') is None or 'componentes_custo' not in solucao:
+        custo_total(solucao, instancia)
+
+    cp = obter_compacto(instancia)
+    rng = np.random.default_rng(semente)
+
+    destruicoes = (_destruir_aleatorio, _destruir_pior, _destruir_veiculo, _destruir_regiao, _destruir_tipo)
+    reparos = (_reparo_guloso, _reparo_arrependimento)
+    pesos = [np.ones(len(destruicoes)), np.ones(len(reparos))]
+    pontos = [np.zeros(len(destruicoes)), np.zeros(len(reparos))]
+    usos = [np.zeros(len(destruicoes)), np.zeros(len(reparos))]
+
+    atual = solucao
+    custo_atual = solucao['custo']
+    melhor_sol = capturar_solucao(solucao, instancia)
+    melhor_custo = solucao['custo']
+
+    
+    temperatura = -ALNS_TEMPERATURA * max(abs(solucao['custo']), 1.0) / np.log(0.5)
+    start_time = time.time()
+
+    for iteracao in range(max_iter):
+        if (time.time() - start_time) > time_limit:
+            break
+        if limite is not None and gap_atingido(melhor_custo, limite):
+            break
+
+        escolha = [int(rng.choice(len(w), p=w / w.sum())) for w in pesos]
+        n_alocadas = len(atual['alocacao_um'])
+        q_min = max(1, int(ALNS_REMOCAO_MIN * n_alocadas))
+        q = int(rng.integers(q_min, max(q_min, int(ALNS_REMOCAO_MAX * n_alocadas)) + 1))
+
+        
+        iniciar_transacao(atual, instancia)
+        destruicoes[escolha[0]](atual, instancia, cp, rng, q)
+        reparos[escolha[1]](atual, instancia, cp, rng)
+        aplicar_restricao_carga_minima(atual, instancia, usar_doadores=False)
+        if usar_busca_local:
+            busca_local(atual, instancia, time_limit=time_limit - (time.time() - start_time), perfil=perfil)
+
+        custo = atual['custo']
+        ganho = 0.0
+        if custo < melhor_custo - 1e-9:
+            melhor_custo = custo
+            melhor_sol = capturar_solucao(atual, instancia)
+            ganho = ALNS_PONTOS[0]
+        elif custo < custo_atual - 1e-9:
+            ganho = ALNS_PONTOS[1]
+        elif rng.random() < np.exp(-(custo - custo_atual) / max(temperatura, 1e-9)):
+            ganho = ALNS_PONTOS[2]
+
+        if ganho > 0:
+            confirmar_transacao(atual)
+            custo_atual = custo
+        else:
+            desfazer_transacao(atual)
+
+        for grupo in range(2):
+            pontos[grupo][escolha[grupo]] += ganho
+            usos[grupo][escolha[grupo]] += 1
+
+        
+        if (iteracao + 1) % ALNS_SEGMENTO == 0:
+            for grupo in range(2):
+                usados = usos[grupo] > 0
+                pesos[grupo][usados] = ((1 - ALNS_REACAO) * pesos[grupo][usados]
+                                        + ALNS_REACAO * pontos[grupo][usados] / usos[grupo][usados])
+                pesos[grupo] = np.maximum(pesos[grupo], 1e-3)
+                pontos[grupo][:] = 0.0
+                usos[grupo][:] = 0.0
+
+        temperatura *= ALNS_RESFRIAMENTO
+
+    return restaurar_solucao(melhor_sol, instancia)
+
+def _mochila_max(pesos, valores, capacidade, resolucao=RESOLUCAO_MOCHILA):
+
+    if len(pesos) == 0 or capacidade <= 1e-9:
+        return np.empty(0, dtype=np.int64)
+
+    passo = capacidade / resolucao
+    w = np.ceil(pesos / passo - 1e-9).astype(np.int64)
+    limite = int(resolucao)
+    dp = np.zeros(limite + 1)
+    escolha = np.zeros((len(pesos), limite + 1), dtype=bool)
+
+    for x in range(len(pesos)):
+        wx = int(w[x])
+        if wx > limite or valores[x] <= 0:
+            continue
+        candidato = dp[:limite + 1 - wx] + valores[x]
+        melhora = candidato > dp[wx:] + 1e-12
+        escolha[x, wx:] = melhora
+        dp[wx:] = np.where(melhora, candidato, dp[wx:])
+
+    b = int(np.argmax(dp))
+    tomados = []
+    for x in range(len(pesos) - 1, -1, -1):
+        if escolha[x, b]:
+            tomados.append(x)
+            b -= int(w[x])
+    return np.array(tomados[::-1], dtype=np.int64)
+
+def _cobertura_min(pesos, custos, demanda, resolucao=RESOLUCAO_MOCHILA):
+
+    if len(pesos) == 0:
+        return None
+
+    limite = int(resolucao)
+    passo = demanda / resolucao
+    w = np.minimum(np.floor(pesos / passo + 1e-9).astype(np.int64), limite)
+    dp = np.full(limite + 1, np.inf)
+    dp[0] = 0.0
+    origem = np.full((len(pesos), limite + 1), -1, dtype=np.int64)
+    faixas = np.arange(limite + 1)
+
+    for x in range(len(pesos)):
+        wx = int(w[x])
+        novo = dp.copy()
+        if wx == 0:
+            melhora = dp + custos[x] < dp - 1e-12
+            origem[x, melhora] = faixas[melhora]
+            novo[melhora] = dp[melhora] + custos[x]
+            dp = novo
+            continue
+
+        candidato = dp[:limite - wx] + custos[x]
+        melhora = candidato < dp[wx:limite] - 1e-12
+        origem[x, wx:limite][melhora] = faixas[:limite - wx][melhora]
+        novo[wx:limite] = np.where(melhora, candidato, dp[wx:limite])
+
+        cauda = dp[limite - wx:] + custos[x]
+        f = int(np.argmin(cauda))
+        if cauda[f] < dp[limite] - 1e-12:
+            novo[limite] = cauda[f]
+            origem[x, limite] = limite - wx + f
+        dp = novo
+
+    if not np.isfinite(dp[limite]):
+        return None
+
+    b = limite
+    tomados = []
+    for x in range(len(pesos) - 1, -1, -1):
+        if origem[x, b] >= 0:
+            tomados.append(x)
+            b = int(origem[x, b])
+    return np.array(tomados[::-1], dtype=np.int64)
+
+def _completar_com_pendentes(solucao, instancia, cp, j, regiao=None):
+
+    vid = cp['veic_ids'][j]
+    dados = solucao['veiculo_dados'][vid]
+    reg = cp['regiao_idx'].get(str(dados['regiao']), -1) if dados['regiao'] is not None else -1
+    if regiao is not None and not dados['ums']:
+        reg = regiao
+
+    pendentes = _pendentes(solucao, cp)
+    residual_peso = cp['cap_peso'][j] - dados['peso_usado']
+    residual_volume = cp['cap_volume'][j] - dados['volume_usado']
+    ok = (cp['compativel'][pendentes, j]
+          & ((cp['destino_um'][pendentes] == reg) | (cp['destino_um'][pendentes] < 0))
+          & (cp['peso'][pendentes] <= residual_peso + 1e-9)
+          & (cp['volume'][pendentes] <= residual_volume + 1e-9))
+    pendentes = pendentes[ok]
+    if len(pendentes) == 0:
+        return 0
+
+    valores = cp['penalidade'][pendentes] + cp['beta'] * cp['peso'][pendentes] - cp['custo_uv'][pendentes, j]
+    escolhidos = _mochila_max(cp['peso'][pendentes], valores, residual_peso)
+    tomados = pendentes[escolhidos]
+
+    if cp['volume'][tomados].sum() > residual_volume + 1e-9:
+        ordem = np.argsort(-valores[escolhidos] / np.maximum(cp['volume'][tomados], 1e-9), kind='stable')
+        cabem = np.cumsum(cp['volume'][tomados][ordem]) <= residual_volume + 1e-9
+        tomados = tomados[ordem][cabem]
+
+    for i in tomados:
+        alocar_um(solucao, cp['um_ids'][i], vid, instancia)
+    return len(tomados)
+
+def _completar_com_doadores(solucao, instancia, cp, j, estado):
+
+    vid = cp['veic_ids'][j]
+    dados = solucao['veiculo_dados'][vid]
+    deficit = cp['carga_minima'][j] - dados['peso_usado']
+    residual_peso = cp['cap_peso'][j] - dados['peso_usado']
+
+    doadores = np.flatnonzero((estado['n'] > 0) & (estado['regiao'] == estado['regiao'][j])
+                              & (estado['peso'] + 1e-9 >= cp['carga_minima']))
+    doadores = doadores[doadores != j]
+    if len(doadores) == 0:
+        return
+
+    u, o = _linhas_alocadas(solucao, cp, doadores)
+    folga = estado['peso'][o] - cp['carga_minima'][o]
+    ok = cp['compativel'][u, j] & (cp['peso'][u] <= folga + 1e-9) & (cp['peso'][u] <= residual_peso + 1e-9)
+    u, o = u[ok], o[ok]
+    if len(u) == 0:
+        return
+
+    tomados = _cobertura_min(cp['peso'][u], cp['custo_uv'][u, j] - cp['custo_uv'][u, o], deficit)
+    if tomados is None:
+        return
+
+    for x in tomados:
+        k = o[x]
+        vid_k = cp['veic_ids'][k]
+        dados_k = solucao['veiculo_dados'][vid_k]
+        if dados_k['peso_usado'] - cp['peso'][u[x]] + 1e-9 < cp['carga_minima'][k]:
+            continue
+        aplicar_movimento(solucao, instancia, ((cp['um_ids'][u[x]], vid_k, vid),))
+
+def _reparar_carga_minima(solucao, instancia, cp, vid, usar_doadores=True):
+
+    j = cp['veic_idx'][vid]
+    dados = solucao['veiculo_dados'][vid]
+    comp = solucao['componentes_custo']
+
+    delta_descarte = (float(cp['penalidade'][[cp['um_idx'][u] for u in dados['ums']]].sum())
+                      - comp['custo_ativacao_por_veiculo'].get(vid, 0.0)
+                      - comp['frete_morto_por_veiculo'].get(vid, 0.0)
+                      - comp['transporte_por_veiculo'].get(vid, 0.0))
+
+    iniciar_transacao(solucao, instancia)
+    _completar_com_pendentes(solucao, instancia, cp, j)
+    if usar_doadores and not atende_carga_minima(solucao, instancia, vid):
+        _completar_com_doadores(solucao, instancia, cp, j, _estado_frota(solucao, cp))
+
+    if atende_carga_minima(solucao, instancia, vid) and delta_transacao(solucao) <= delta_descarte + 1e-9:
+        confirmar_transacao(solucao)
+        return True
+    desfazer_transacao(solucao)
+    return False
+
+def aplicar_restricao_carga_minima(solucao, instancia, reparar=None, usar_doadores=True):
+
     if 'componentes_custo' not in solucao or solucao.get('custo') is None or 'total' not in solucao.get('componentes_custo', {}):
         custo_total(solucao, instancia)
 
-    for v_id, dados_v in solucao['veiculo_dados'].items():
-        if not dados_v['ativo']:
+    if reparar is None:
+        reparar = REPARO_CARGA_MINIMA
+    cp = obter_compacto(instancia)
+
+    abaixo = [v_id for v_id, dados_v in solucao['veiculo_dados'].items()
+              if dados_v['ativo'] and not atende_carga_minima(solucao, instancia, v_id)]
+    abaixo.sort(key=lambda v_id: cp['carga_minima'][cp['veic_idx'][v_id]] - solucao['veiculo_dados'][v_id]['peso_usado'])
+
+    for v_id in abaixo:
+        dados_v = solucao['veiculo_dados'][v_id]
+        if not dados_v['ativo'] or atende_carga_minima(solucao, instancia, v_id):
             continue
 
-        veiculo = veiculos_id[v_id]
+        if reparar and _reparar_carga_minima(solucao, instancia, cp, v_id, usar_doadores):
+            continue
 
-        if dados_v['peso_usado'] + 1e-9 < veiculo['carga_minima']:
+        for um_id in list(dados_v['ums']):
+            desalocar_um(solucao, um_id, v_id, instancia)
 
-            
-            for um_id in list(dados_v['ums']):
-                desalocar_um(solucao, um_id, v_id, instancia)
+
+def _executar_reinicio(instancia, restart_id, ordm, modo, time_limit):
+
+    t0 = time.time()
+    solucao = gerar_solucao_gulosa(instancia, ordem=ordm) 
+    aplicar_restricao_carga_minima(solucao, instancia)
 
     
-    
+    solucao_inicial = capturar_solucao(solucao, instancia) if restart_id == 0 else None
 
+    perfil = criar_perfil() if PERFIL_VIZINHANCAS else None
+    if modo == 'tabu':
+        estrategia = criar_estrategia('tabu', ordem_aleatoria=True, semente=RANDOM_SEED + restart_id)
+        solucao = busca_tabu(solucao, instancia, time_limit=time_limit, estrategia=estrategia, perfil=perfil)
+    else:
+        estrategia = criar_estrategia(semente=RANDOM_SEED + restart_id)
+        solucao = busca_local(solucao, instancia, max_iter=200, time_limit=time_limit, estrategia=estrategia, perfil=perfil)
+    aplicar_restricao_carga_minima(solucao, instancia)
+
+    custo = custo_total(solucao, instancia)['componentes_custo']['total'] 
+    return {
+        'restart_id': restart_id,
+        'ordem': ordm,
+        'solucao': capturar_solucao(solucao, instancia),
+        'custo': custo,
+        'tempo': time.time() - t0,
+        'solucao_inicial': solucao_inicial,
+        'perfil': perfil
+    }
+
+_INSTANCIA_TRABALHADOR = None
+
+def _inicializar_trabalhador(instancia):
+
+    global _INSTANCIA_TRABALHADOR
+    _INSTANCIA_TRABALHADOR = instancia
 
-def executar_instancia_heuristica(caminho, num_reinicios=NUM_REINICIOS, time_limit=TIMEOUT):
+def _executar_reinicio_trabalhador(restart_id, ordm, modo, prazo, orcamento):
+
+    restante = min(orcamento, prazo - time.time())
+    if restante <= 0:
+        return None
+    return _executar_reinicio(_INSTANCIA_TRABALHADOR, restart_id, ordm, modo, restante)
+
+def executar_instancia_heuristica(caminho, num_reinicios=NUM_REINICIOS, time_limit=TIMEOUT, modo=MODO_BUSCA, processos=PROCESSOS):
+    
+    if modo not in ('busca_local', 'tabu'):
+        raise ValueError(f"Modo de busca desconhecido: {modo}")
     
     instancia = carregar_dados(caminho)
+    limite = obter_limite_inferior(instancia)['valor']
     melhor_sol = None
     melhor_custo = float("inf")
     solucao_inicial = None  
+    perfil = criar_perfil() if PERFIL_VIZINHANCAS else None
 
     tempo_total = time.time()
     ordens = [None, 'peso', 'volume'] + list(range(max(0, num_reinicios-3)))
     ordens = ordens[:num_reinicios] 
 
-    for restart_id, ordm in enumerate(ordens): 
+    if processos is None:
+        processos = os.cpu_count() or 1
+    processos = max(1, min(int(processos), len(ordens)))
 
-        t0 = time.time() 
-        if (time.time() - tempo_total) > time_limit: 
-            break
+    resultados = []
+    if processos == 1:
+        for restart_id, ordm in enumerate(ordens): 
 
-        
-        solucao = gerar_solucao_gulosa(instancia, ordem=ordm) 
-        aplicar_restricao_carga_minima(solucao, instancia)
+            if (time.time() - tempo_total) > time_limit: 
+                break
 
-        
-        if restart_id == 0:
-            solucao_inicial = copy.deepcopy(solucao)  
+            
+            restante = time_limit - (time.time() - tempo_total)
+            if modo == 'tabu':
+                restante = restante / (len(ordens) - restart_id)
+            resultados.append(_executar_reinicio(instancia, restart_id, ordm, modo, restante))
 
+            
+            if gap_atingido(min(r['custo'] for r in resultados), limite):
+                break
+    else:
         
-        solucao = busca_local(solucao, instancia, max_iter=200, time_limit=time_limit - (time.time() - tempo_total))
-        aplicar_restricao_carga_minima(solucao, instancia)
+        prazo = tempo_total + time_limit
+        orcamento = time_limit
+        if modo == 'tabu':
+            orcamento = time_limit / -(-len(ordens) // processos)
+
+        with ProcessPoolExecutor(max_workers=processos, initializer=_inicializar_trabalhador,
+                                 initargs=(instancia,)) as executor:
+            futuros = [executor.submit(_executar_reinicio_trabalhador, restart_id, ordm, modo, prazo, orcamento)
+                       for restart_id, ordm in enumerate(ordens)]
+            for restart_id, f in enumerate(futuros):
+                if f.cancelled():
+                    continue
+                try:
+                    r = f.result()
+                except Exception as e:
+                    print(f"❌ Falha no restart {restart_id+1}/{len(ordens)}: {repr(e)}")
+                    continue
+                resultados.append(r)
+                if r is not None and gap_atingido(r['custo'], limite):
+                    for pendente in futuros:
+                        pendente.cancel()
+        resultados = [r for r in resultados if r is not None]
 
-        custo = custo_total(solucao, instancia)['componentes_custo']['total'] 
-        print(f"  Restart {restart_id+1}/{len(ordens)} ordem={ordm} custo={custo:.2f} tempo={(time.time()-t0):.1f}s")
+    for r in resultados:
+        print(f"  Restart {r['restart_id']+1}/{len(ordens)} ordem={r['ordem']} custo={r['custo']:.2f} tempo={r['tempo']:.1f}s")
 
-        if custo < melhor_custo: 
-            melhor_custo = custo
-            melhor_sol = copy.deepcopy(solucao) 
+        if r['solucao_inicial'] is not None:
+            solucao_inicial = r['solucao_inicial']
+        if perfil is not None:
+            somar_perfis(perfil, r['perfil'])
+
+        if r['custo'] < melhor_custo: 
+            melhor_custo = r['custo']
+            melhor_sol = r['solucao']
+
+    if melhor_sol is not None:
+        melhor_sol = restaurar_solucao(melhor_sol, instancia)
+    if solucao_inicial is not None:
+        solucao_inicial = restaurar_solucao(solucao_inicial, instancia)
 
     tempo_total = time.time() - tempo_total
     nome_instancia = os.path.basename(caminho).replace('.csv', '') 
+    gap = gap_percentual(melhor_custo if melhor_sol is not None else None, limite)
+    if gap is not None:
+        print(f"  Limite inferior={limite:.2f} gap={gap:.2f}%")
 
     return {
         "solucao": melhor_sol,
@@ -1170,7 +2481,265 @@ def executar_instancia_heuristica(caminho, num_reinicios=NUM_REINICIOS, time_lim
         "tempo_exec": tempo_total,
         "instancia": instancia,
         "nome_instancia": nome_instancia,  
-        "solucao_inicial": solucao_inicial  
+        "solucao_inicial": solucao_inicial,
+        "perfil": perfil
+    }
+
+def executar_instancia_alns(caminho, time_limit=TIMEOUT, max_iter=ALNS_MAX_ITER, semente=RANDOM_SEED):
+
+    instancia = carregar_dados(caminho)
+    tempo_total = time.time()
+
+    solucao = gerar_solucao_gulosa(instancia)
+    aplicar_restricao_carga_minima(solucao, instancia)
+    solucao_inicial = capturar_solucao(solucao, instancia)
+
+    perfil = criar_perfil() if PERFIL_VIZINHANCAS else None
+    solucao = busca_local(solucao, instancia, time_limit=time_limit, perfil=perfil)
+    solucao = busca_alns(solucao, instancia, max_iter=max_iter,
+                         time_limit=time_limit - (time.time() - tempo_total), semente=semente, perfil=perfil,
+                         limite=obter_limite_inferior(instancia)['valor'])
+
+    custo = custo_total(solucao, instancia)['componentes_custo']['total']
+    tempo_total = time.time() - tempo_total
+    print(f"  ALNS custo={custo:.2f} tempo={tempo_total:.1f}s")
+
+    return {
+        "solucao": solucao,
+        "custo": custo,
+        "tempo_exec": tempo_total,
+        "instancia": instancia,
+        "nome_instancia": os.path.basename(caminho).replace('.csv', ''),
+        "solucao_inicial": restaurar_solucao(solucao_inicial, instancia),
+        "perfil": perfil
+    }
+
+def dividir_frota(instancia):
+
+    cp = obter_compacto(instancia)
+    num_regioes = len(cp['regioes'])
+    num_veiculos = len(cp['veic_ids'])
+    if num_regioes == 0:
+        return {None: (list(cp['um_ids']), list(cp['veic_ids']))}
+
+    
+    destino = cp['destino_um'].copy()
+    if (destino < 0).any():
+        demanda = np.bincount(destino[destino >= 0], weights=cp['peso'][destino >= 0], minlength=num_regioes)
+        destino[destino < 0] = int(np.argmax(demanda))
+
+    
+    num_tipos = len(cp['tipos'])
+    compat_tipo = np.zeros((len(cp['um_ids']), num_tipos), dtype=bool)
+    for t in range(num_tipos):
+        veics = np.flatnonzero(cp['tipo_veic'] == t)
+        compat_tipo[:, t] = cp['compativel'][:, veics].any(axis=1)
+
+    restante = np.zeros((num_regioes, num_tipos))
+    sobreposicao = np.zeros((num_regioes, num_tipos, num_tipos))
+    penal_kg = np.zeros((num_regioes, num_tipos))
+    transp_kg = np.zeros((num_regioes, num_tipos))
+    for r in range(num_regioes):
+        linhas = np.flatnonzero(destino == r)
+        peso = cp['peso'][linhas]
+        c = compat_tipo[linhas]
+        peso_tipo = (c * peso[:, None]).sum(axis=0)
+        restante[r] = peso_tipo
+        sobreposicao[r] = (c.T * peso) @ c / np.maximum(peso_tipo, 1e-9)[:, None]
+        penal_kg[r] = (c * cp['penalidade'][linhas][:, None]).sum(axis=0) / np.maximum(peso_tipo, 1e-9)
+        transp_kg[r] = (c * cp['custo_tipo'][linhas]).sum(axis=0) / np.maximum(peso_tipo, 1e-9)
+
+    regiao_veic = np.full(num_veiculos, -1, dtype=np.int64)
+    regioes_possiveis = np.tile(np.arange(num_regioes), (num_veiculos, 1))
+    livres = np.ones(num_veiculos, dtype=bool)
+
+    
+    while livres.any():
+        t = cp['tipo_veic']
+        carga = np.minimum(cp['cap_peso'][:, None], restante[:, t].T)
+        ganho = (carga * (penal_kg[:, t].T - transp_kg[:, t].T)
+                 - cp['custo_ativacao'] - cp['beta'] * (cp['cap_peso'][:, None] - carga))
+        validos = (livres[:, None]
+                   & (carga + 1e-9 >= np.maximum(cp['carga_minima'][:, None], 1e-9))
+                   & ((cp['destino_veic'][:, None] < 0) | (cp['destino_veic'][:, None] == regioes_possiveis)))
+        ganho = np.where(validos, ganho, -np.inf)
+
+        j, r = np.unravel_index(int(np.argmax(ganho)), ganho.shape)
+        if not ganho[j, r] > 0:
+            break
+
+        regiao_veic[j] = r
+        livres[j] = False
+        restante[r] = np.maximum(restante[r] - carga[j, r] * sobreposicao[r, t[j]], 0.0)
+
+    grupos = {}
+    for r in range(num_regioes):
+        ums_ids = [cp['um_ids'][i] for i in np.flatnonzero(destino == r)]
+        if ums_ids:
+            grupos[cp['regioes'][r]] = (ums_ids, [cp['veic_ids'][j] for j in np.flatnonzero(regiao_veic == r)])
+    return grupos
+
+def _subinstancia(instancia, ums_ids, veic_ids):
+
+    sub = dict(instancia)
+    sub['ums'] = [instancia['ums_id'][u] for u in ums_ids]
+    sub['veiculos'] = [instancia['veiculos_id'][v] for v in veic_ids]
+    sub['ums_id'] = {um['id']: um for um in sub['ums']}
+    sub['veiculos_id'] = {v['id']: v for v in sub['veiculos']}
+    sub['compacto'] = compactar_instancia(sub)
+    return sub
+
+def _resolver_subproblema(subinstancia, num_reinicios, prazo, modo, fatia=None):
+
+    if fatia is not None:
+        prazo = min(prazo, time.time() + fatia)
+    ordens = ([None, 'peso', 'volume'] + list(range(max(0, num_reinicios - 3))))[:num_reinicios]
+
+    melhor = None
+    for restart_id, ordm in enumerate(ordens):
+        restante = prazo - time.time()
+        if restante <= 0:
+            break
+        if modo == 'tabu':
+            restante = restante / (len(ordens) - restart_id)
+        r = _executar_reinicio(subinstancia, restart_id, ordm, modo, restante)
+        if melhor is None or r['custo'] < melhor['custo']:
+            melhor = r
+
+    if melhor is None:
+        return {}
+    return dict(restaurar_solucao(melhor['solucao'], subinstancia)['alocacao_um'])
+
+def _esvaziar_veiculo(solucao, instancia, cp, j):
+
+    vid = cp['veic_ids'][j]
+    ums, idx = _carga_veiculo(solucao, cp, vid)[:2]
+    if not ums:
+        return True
+
+    
+    plano = _plano_eliminacao(cp, _estado_frota(solucao, cp), j, idx)[1]
+    if plano is not None:
+        return aplicar_movimento(solucao, instancia,
+                                 tuple((cp['um_ids'][i], vid, cp['veic_ids'][k]) for i, k in plano))
+    return aplicar_movimento(solucao, instancia, tuple((um_id, vid, None) for um_id in ums))
+
+def _mover_para_regiao(solucao, instancia, cp, j, regiao):
+
+    iniciar_transacao(solucao, instancia)
+    if (_esvaziar_veiculo(solucao, instancia, cp, j)
+            and _completar_com_pendentes(solucao, instancia, cp, j, regiao)
+            and atende_carga_minima(solucao, instancia, cp['veic_ids'][j])):
+        return delta_transacao(solucao)
+    desfazer_transacao(solucao)
+    return None
+
+def _rebalancear_regioes(solucao, instancia, cp, prazo):
+
+    pendentes = _pendentes(solucao, cp)
+    if len(pendentes) == 0:
+        return 0
+
+    
+    estado = _estado_frota(solucao, cp)
+    com_demanda = set(np.unique(cp['destino_um'][pendentes]).tolist())
+    candidatos = [j for j in range(len(cp['veic_ids']))
+                  if estado['n'][j] == 0 or int(estado['regiao'][j]) not in com_demanda]
+    candidatos.sort(key=lambda j: estado['peso'][j] / max(cp['cap_peso'][j], 1e-9))
+
+    movidos = 0
+    for j in candidatos:
+        if time.time() > prazo:
+            break
+        pendentes = _pendentes(solucao, cp)
+        if len(pendentes) == 0:
+            break
+
+        melhor_delta, melhor_regiao = -1e-9, None
+        for k in np.unique(cp['destino_um'][pendentes]).tolist():
+            if k < 0 or not cp['compativel'][pendentes[cp['destino_um'][pendentes] == k], j].any():
+                continue
+            delta = _mover_para_regiao(solucao, instancia, cp, j, k)
+            if delta is None:
+                continue
+            desfazer_transacao(solucao)
+            if delta < melhor_delta:
+                melhor_delta, melhor_regiao = delta, k
+
+        if melhor_regiao is not None and _mover_para_regiao(solucao, instancia, cp, j, melhor_regiao) is not None:
+            confirmar_transacao(solucao)
+            movidos += 1
+    return movidos
+
+def executar_instancia_decomposta(caminho, num_reinicios=NUM_REINICIOS, time_limit=TIMEOUT, modo='busca_local', processos=None):
+
+    if modo not in ('busca_local', 'tabu'):
+        raise ValueError(f"Modo de busca desconhecido: {modo}")
+
+    instancia = carregar_dados(caminho)
+    tempo_total = time.time()
+
+    solucao_inicial = gerar_solucao_gulosa(instancia)
+    aplicar_restricao_carga_minima(solucao_inicial, instancia)
+
+    grupos = dividir_frota(instancia)
+    subinstancias = [_subinstancia(instancia, ums_ids, veic_ids)
+                     for ums_ids, veic_ids in grupos.values() if ums_ids and veic_ids]
+
+    
+    prazo_regioes = tempo_total + time_limit * (1 - FRACAO_REBALANCEAMENTO)
+    if processos is None:
+        processos = os.cpu_count() or 1
+    processos = max(1, min(int(processos), len(subinstancias)))
+
+    if processos == 1:
+        alocacoes = []
+        for sub_id, sub in enumerate(subinstancias):
+            fatia = (prazo_regioes - time.time()) / (len(subinstancias) - sub_id)
+            alocacoes.append(_resolver_subproblema(sub, num_reinicios, prazo_regioes, modo, fatia))
+    else:
+        
+        fatia = (prazo_regioes - time.time()) / -(-len(subinstancias) // processos)
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            futuros = [executor.submit(_resolver_subproblema, sub, num_reinicios, prazo_regioes, modo, fatia)
+                       for sub in subinstancias]
+            alocacoes = []
+            for sub_id, f in enumerate(futuros):
+                try:
+                    alocacoes.append(f.result())
+                except Exception as e:
+                    
+                    print(f"❌ Falha no subproblema {sub_id+1}/{len(futuros)}: {repr(e)}")
+                    alocacoes.append({})
+
+    solucao = criar_estado_inicial(instancia)
+    custo_total(solucao, instancia)
+    for alocacao in alocacoes:
+        for um_id in sorted(alocacao):
+            alocar_um(solucao, um_id, alocacao[um_id], instancia)
+    custo_regioes = solucao['custo']
+
+    
+    cp = obter_compacto(instancia)
+    _reparo_guloso(solucao, instancia, cp, np.random.default_rng(RANDOM_SEED))
+    aplicar_restricao_carga_minima(solucao, instancia)
+    rebalanceados = _rebalancear_regioes(solucao, instancia, cp, tempo_total + time_limit)
+    perfil = criar_perfil() if PERFIL_VIZINHANCAS else None
+    solucao = busca_local(solucao, instancia, time_limit=max(0.0, time_limit - (time.time() - tempo_total)), perfil=perfil)
+
+    custo = custo_total(solucao, instancia)['componentes_custo']['total']
+    tempo_total = time.time() - tempo_total
+    print(f"  Decomposição regioes={len(subinstancias)} custo_regioes={custo_regioes:.2f} "
+          f"rebalanceados={rebalanceados} custo={custo:.2f} tempo={tempo_total:.1f}s")
+
+    return {
+        "solucao": solucao,
+        "custo": custo,
+        "tempo_exec": tempo_total,
+        "instancia": instancia,
+        "nome_instancia": os.path.basename(caminho).replace('.csv', ''),
+        "solucao_inicial": solucao_inicial,
+        "perfil": perfil
     }
 
 def estruturar_resultados_heuristica(resultado, solucao_inicial=None):
@@ -1188,6 +2757,7 @@ def estruturar_resultados_heuristica(resultado, solucao_inicial=None):
     veiculos_id = {v['id']: v for v in instancia['veiculos']}
 
     custo_total_valor = resultado['custo']  
+    limite = obter_limite_inferior(instancia)['valor']
 
     
     sol_inicial_dados = None
@@ -1284,13 +2854,14 @@ def estruturar_resultados_heuristica(resultado, solucao_inicial=None):
         'volume_nao_alocado': volume_nao_alocado,
         'alocacoes': alocacoes,
         'tempo_execucao': resultado.get('tempo_exec', 0.0),  
-        'gap_otimizacao': 0.0,  
+        'gap_otimizacao': gap_percentual(custo_total_valor, limite),
         'status': 'Heurística',  
         'melhor_solucao': custo_total_valor ,  
-        'solucao_relaxada': None,  
+        'solucao_relaxada': limite,
         'relaxacao_linear': None,  
         'gap_relaxacao': None,  
-        'tempo_para_otimo': resultado.get('tempo_exec', 0.0)  
+        'tempo_para_otimo': resultado.get('tempo_exec', 0.0),
+        'perfil_vizinhancas': resultado.get('perfil')
     }
 
 def imprimir_resultados_detalhados_heuristica(resultados):
@@ -1303,6 +2874,8 @@ def imprimir_resultados_detalhados_heuristica(resultados):
     print(f"Resumo da heurística — Instância: {resultados.get('tipo_instancia', 'N/A')}")
     print("="*80)
     print(f"Custo total: {resultados.get('custo_total', 0.0):.2f}")
+    if resultados.get('solucao_relaxada') is not None and resultados.get('gap_otimizacao') is not None:
+        print(f"  - Limite inferior: {resultados['solucao_relaxada']:.2f}  (gap {resultados['gap_otimizacao']:.2f}%)")
     print(f"  - Custo ativação: {resultados.get('custo_alocacao', 0.0):.2f}")
     print(f"  - Custo transporte: {resultados.get('custo_transporte', 0.0):.2f}")
     print(f"  - Frete morto total: {resultados.get('frete_morto_total', 0.0):.2f}")
@@ -1327,7 +2900,92 @@ def imprimir_resultados_detalhados_heuristica(resultados):
         print(f" Frete morto veículo: {a.get('frete_morto', {}).get('valor', 0.0):.2f}")
     print("\n" + "="*80 + "\n")
 
-def exportar_resultados_csv_heuristica(resultados_lista, instancias_originais, solucoes_iniciais, resultado_estruturado):
+def _valor_ou_na(v, casas=None):
+    if v is None:
+        return "N/A"
+    try:
+        if casas is None:
+            return str(v)
+        return f"{float(v):.{casas}f}"
+    except:
+        return str(v)
+
+def _linha_resumo_heuristica(resultados, sol_inicial):
+
+    if sol_inicial:
+        return [
+            resultados.get('tipo_instancia'),
+            _valor_ou_na(resultados.get('tempo_execucao', 0.0), 2),
+
+            _valor_ou_na(sol_inicial.get('custo_total', 0.0), 2), _valor_ou_na(resultados.get('custo_total', 0.0), 2),
+            _valor_ou_na(sol_inicial.get('custo_alocacao', 0.0), 2), _valor_ou_na(resultados.get('custo_alocacao', 0.0), 2),
+            _valor_ou_na(sol_inicial.get('custo_transporte', 0.0), 2), _valor_ou_na(resultados.get('custo_transporte', 0.0), 2),
+            _valor_ou_na(sol_inicial.get('frete_morto_total', 0.0), 2), _valor_ou_na(resultados.get('frete_morto_total', 0.0), 2),
+            _valor_ou_na(sol_inicial.get('custo_nao_alocacao', 0.0), 2), _valor_ou_na(resultados.get('custo_nao_alocacao', 0.0), 2),
+
+            sol_inicial.get('veiculos_ativos', 0), resultados.get('veiculos_ativos', 0),
+            sol_inicial.get('veiculos_inativos', 0), resultados.get('veiculos_inativos', 0),
+
+            sol_inicial.get('ums_alocadas', 0), resultados.get('ums_alocadas', 0),
+            sol_inicial.get('ums_nao_alocadas', 0), resultados.get('ums_nao_alocadas', 0),
+
+            _valor_ou_na(sol_inicial.get('peso_nao_alocado', 0.0)), _valor_ou_na(resultados.get('peso_nao_alocado', 0.0)),
+            _valor_ou_na(sol_inicial.get('volume_nao_alocado', 0.0)), _valor_ou_na(resultados.get('volume_nao_alocado', 0.0))
+        ]
+    else:
+        
+        return [
+            resultados.get('tipo_instancia'),
+            _valor_ou_na(resultados.get('tempo_execucao', 0.0), 2),
+
+            "N/A", _valor_ou_na(resultados.get('custo_total', 0.0), 2),
+            "N/A", _valor_ou_na(resultados.get('custo_alocacao', 0.0), 2),
+            "N/A", _valor_ou_na(resultados.get('custo_transporte', 0.0), 2),
+            "N/A", _valor_ou_na(resultados.get('frete_morto_total', 0.0), 2),
+            "N/A", _valor_ou_na(resultados.get('custo_nao_alocacao', 0.0), 2),
+
+            "N/A", resultados.get('veiculos_ativos', 0),
+            "N/A", resultados.get('veiculos_inativos', 0),
+
+            "N/A", resultados.get('ums_alocadas', 0),
+            "N/A", resultados.get('ums_nao_alocadas', 0),
+
+            "N/A", _valor_ou_na(resultados.get('peso_nao_alocado', 0.0)),
+            "N/A", _valor_ou_na(resultados.get('volume_nao_alocado', 0.0))
+        ]
+
+def escrever_resumo_heuristica(caminho_saida, linhas):
+
+    os.makedirs(caminho_saida, exist_ok=True)
+    caminho_completo_resumo = os.path.join(caminho_saida, "resumo_geral_heuristica.csv")
+    arquivo_existe = os.path.exists(caminho_completo_resumo)
+
+    with open(caminho_completo_resumo, mode='a', newline='', encoding='utf-8-sig') as file:
+        writer = csv.writer(file, delimiter=';')
+
+        if not arquivo_existe:
+            writer.writerow([
+                "Instância",
+                "Tempo (s)",
+                "Custo Total (Inicial)", "Custo Total (Final)",
+                "Custo Ativação (Inicial)", "Custo Ativação (Final)",
+                "Custo Transporte (Inicial)", "Custo Transporte (Final)",
+                "Frete Morto (Inicial)", "Frete Morto (Final)",
+                "Custo Não Alocação (Inicial)", "Custo Não Alocação (Final)",
+                "Veículos Ativos (Inicial)", "Veículos Ativos (Final)",
+                "Veículos Inativos (Inicial)", "Veículos Inativos (Final)",
+                "UMs Alocadas (Inicial)", "UMs Alocadas (Final)",
+                "UMs Não Alocadas (Inicial)", "UMs Não Alocadas (Final)",
+                "Peso Não Alocado (Inicial)", "Peso Não Alocado (Final)",
+                "Volume Não Alocado (Inicial)", "Volume Não Alocado (Final)"
+            ])
+
+        for linha in linhas:
+            writer.writerow(linha)
+
+    print(f"✅ Resumo geral (append) salvo em: {caminho_completo_resumo}")
+
+def exportar_resultados_csv_heuristica(resultados_lista, instancias_originais, solucoes_iniciais, resultado_estruturado, escrever_resumo=True):
     
     import os
     import csv
@@ -1351,16 +3009,6 @@ def exportar_resultados_csv_heuristica(resultados_lista, instancias_originais, s
     
     
     
-    def _valor_ou_na(v, casas=None):
-        if v is None:
-            return "N/A"
-        try:
-            if casas is None:
-                return str(v)
-            return f"{float(v):.{casas}f}"
-        except:
-            return str(v)
-
     def _beta_da_instancia(inst):
         beta_valor = 1.0
         try:
@@ -1389,26 +3037,17 @@ def exportar_resultados_csv_heuristica(resultados_lista, instancias_originais, s
         except:
             return 0.0
 
-    def _motivo_nao_alocada(um, veiculos):
+    def _motivo_nao_alocada(um, cp):
         
-        try:
-            peso = float(um.get("peso", 0.0))
-            volume = float(um.get("volume", 0.0))
-        except:
-            peso, volume = 0.0, 0.0
-
-        existe_viavel = False
-        for v in veiculos:
-            try:
-                
-                if not um_compatível_com_veiculo(um, v):
-                    continue
-                
-                if peso <= float(v.get("capacidade_peso", 0.0)) + 1e-9 and volume <= float(v.get("capacidade_volume", 0.0)) + 1e-9:
-                    existe_viavel = True
-                    break
-            except:
-                continue
+        i = cp['um_idx'].get(um.get("id"), None)
+        if i is None:
+            return "Incompatibilidade"
+
+        existe_viavel = bool(np.any(
+            cp['compativel'][i]
+            & (cp['peso'][i] <= cp['cap_peso'] + 1e-9)
+            & (cp['volume'][i] <= cp['cap_volume'] + 1e-9)
+        ))
 
         if not existe_viavel:
             return "Incompatibilidade"
@@ -1422,6 +3061,7 @@ def exportar_resultados_csv_heuristica(resultados_lista, instancias_originais, s
     ums_id = {u["id"]: u for u in instancia_atual.get("ums", [])}
     veiculos = instancia_atual.get("veiculos", [])
     veiculos_id = {v["id"]: v for v in veiculos}
+    cp_atual = obter_compacto(instancia_atual)
 
     
     ids_alocados_melhor = _ids_alocados_do_resultado(resultados)
@@ -1519,8 +3159,29 @@ def exportar_resultados_csv_heuristica(resultados_lista, instancias_originais, s
                 _valor_ou_na(um.get("volume", "")),
                 um.get("destino", ""),
                 um.get("compatibilidade", ""),
-                _motivo_nao_alocada(um, veiculos)
+                _motivo_nao_alocada(um, cp_atual)
+            ])
+
+        perfil = resultados.get("perfil_vizinhancas") or {}
+        if perfil:
+            writer.writerow([])
+            writer.writerow(["PERFIL DAS VIZINHANÇAS"])
+            writer.writerow([
+                "Vizinhança", "Chamadas", "Tempo (s)",
+                "Candidatos Avaliados", "Candidatos Viáveis", "Movimentos de Melhora",
+                "Movimentos Aplicados", "Ganho Total"
             ])
+            for nome, c in sorted(perfil.items(), key=lambda item: -item[1]['tempo']):
+                writer.writerow([
+                    nome,
+                    c['chamadas'],
+                    _valor_ou_na(c['tempo'], 3),
+                    c['avaliados'],
+                    c['viaveis'],
+                    c['melhoras'],
+                    c['aplicados'],
+                    _valor_ou_na(c['ganho'], 2)
+                ])
             
         if sol_inicial is not None:
             writer.writerow([])
@@ -1599,7 +3260,7 @@ def exportar_resultados_csv_heuristica(resultados_lista, instancias_originais, s
                     _valor_ou_na(um.get("volume", "")),
                     um.get("destino", ""),
                     um.get("compatibilidade", ""),
-                    _motivo_nao_alocada(um, veiculos)
+                    _motivo_nao_alocada(um, cp_atual)
                 ])
 
     print(f"\n✅ Relatório de heurística salvo em: {caminho_completo}")
@@ -1607,147 +3268,113 @@ def exportar_resultados_csv_heuristica(resultados_lista, instancias_originais, s
     
     
     
-    nome_arquivo_resumo = "resumo_geral_heuristica.csv"
-    caminho_completo_resumo = os.path.join(caminho_saida, nome_arquivo_resumo)
-
-    arquivo_existe = os.path.exists(caminho_completo_resumo)
-
-    with open(caminho_completo_resumo, mode='a', newline='', encoding='utf-8-sig') as file:
-        writer = csv.writer(file, delimiter=';')
-
-        
-        if not arquivo_existe:
-            writer.writerow([
-                "Instância",
-                "Tempo (s)",
-                "Custo Total (Inicial)", "Custo Total (Final)",
-                "Custo Ativação (Inicial)", "Custo Ativação (Final)",
-                "Custo Transporte (Inicial)", "Custo Transporte (Final)",
-                "Frete Morto (Inicial)", "Frete Morto (Final)",
-                "Custo Não Alocação (Inicial)", "Custo Não Alocação (Final)",
-                "Veículos Ativos (Inicial)", "Veículos Ativos (Final)",
-                "Veículos Inativos (Inicial)", "Veículos Inativos (Final)",
-                "UMs Alocadas (Inicial)", "UMs Alocadas (Final)",
-                "UMs Não Alocadas (Inicial)", "UMs Não Alocadas (Final)",
-                "Peso Não Alocado (Inicial)", "Peso Não Alocado (Final)",
-                "Volume Não Alocado (Inicial)", "Volume Não Alocado (Final)"
-            ])
-
-        
-        if sol_inicial:
-            writer.writerow([
-                resultados.get('tipo_instancia'),
-                _valor_ou_na(resultados.get('tempo_execucao', 0.0), 2),
+    if escrever_resumo:
+        escrever_resumo_heuristica(caminho_saida, [_linha_resumo_heuristica(resultados, sol_inicial)])
 
-                _valor_ou_na(sol_inicial.get('custo_total', 0.0), 2), _valor_ou_na(resultados.get('custo_total', 0.0), 2),
-                _valor_ou_na(sol_inicial.get('custo_alocacao', 0.0), 2), _valor_ou_na(resultados.get('custo_alocacao', 0.0), 2),
-                _valor_ou_na(sol_inicial.get('custo_transporte', 0.0), 2), _valor_ou_na(resultados.get('custo_transporte', 0.0), 2),
-                _valor_ou_na(sol_inicial.get('frete_morto_total', 0.0), 2), _valor_ou_na(resultados.get('frete_morto_total', 0.0), 2),
-                _valor_ou_na(sol_inicial.get('custo_nao_alocacao', 0.0), 2), _valor_ou_na(resultados.get('custo_nao_alocacao', 0.0), 2),
 
-                sol_inicial.get('veiculos_ativos', 0), resultados.get('veiculos_ativos', 0),
-                sol_inicial.get('veiculos_inativos', 0), resultados.get('veiculos_inativos', 0),
+def _processar_instancia(caminho, modo=MODO_BUSCA, processos=PROCESSOS):
 
-                sol_inicial.get('ums_alocadas', 0), resultados.get('ums_alocadas', 0),
-                sol_inicial.get('ums_nao_alocadas', 0), resultados.get('ums_nao_alocadas', 0),
+    a = os.path.basename(caminho)
+    print("\n" + "="*60)
+    print(f"Executando heurística na instância: {a}")
+    print("="*60)
+    start = time.time()
 
-                _valor_ou_na(sol_inicial.get('peso_nao_alocado', 0.0)), _valor_ou_na(resultados.get('peso_nao_alocado', 0.0)),
-                _valor_ou_na(sol_inicial.get('volume_nao_alocado', 0.0)), _valor_ou_na(resultados.get('volume_nao_alocado', 0.0))
-            ])
-        else:
-            
-            writer.writerow([
-                resultados.get('tipo_instancia'),
-                _valor_ou_na(resultados.get('tempo_execucao', 0.0), 2),
+    if modo == 'alns':
+        resultado = executar_instancia_alns(caminho, time_limit=TIMEOUT)
+    elif modo == 'decomposicao':
+        resultado = executar_instancia_decomposta(caminho, num_reinicios=NUM_REINICIOS, time_limit=TIMEOUT, processos=processos)
+    else:
+        resultado = executar_instancia_heuristica(caminho, num_reinicios=NUM_REINICIOS, time_limit=TIMEOUT, modo=modo, processos=processos)
+    dur = time.time() - start
+    print(f"Resultado: custo={resultado['custo']:.2f} tempo_total_exec={dur:.1f}s")
 
-                "N/A", _valor_ou_na(resultados.get('custo_total', 0.0), 2),
-                "N/A", _valor_ou_na(resultados.get('custo_alocacao', 0.0), 2),
-                "N/A", _valor_ou_na(resultados.get('custo_transporte', 0.0), 2),
-                "N/A", _valor_ou_na(resultados.get('frete_morto_total', 0.0), 2),
-                "N/A", _valor_ou_na(resultados.get('custo_nao_alocacao', 0.0), 2),
+    
+    resultado_estruturado = estruturar_resultados_heuristica(resultado)
+    
+    
+    sol_inicial_estruturada = None
+    
+    
+    sol_inicial = resultado.get('solucao_inicial', None)
+    instancia = resultado['instancia']
 
-                "N/A", resultados.get('veiculos_ativos', 0),
-                "N/A", resultados.get('veiculos_inativos', 0),
+    if sol_inicial is not None:
+        
+        sol_inicial_estruturada = estruturar_resultados_heuristica(
+            {
+                'solucao': sol_inicial,
+                'instancia': instancia,
+                'nome_instancia': resultado['nome_instancia'],
+                'tempo_exec': resultado['tempo_exec'],
+                'custo': custo_total(sol_inicial, instancia)['componentes_custo']['total']
+            }
+        )
 
-                "N/A", resultados.get('ums_alocadas', 0),
-                "N/A", resultados.get('ums_nao_alocadas', 0),
+    if resultado_estruturado:
+        resultado_estruturado['nome_instancia'] = a.replace('.csv', '')
 
-                "N/A", _valor_ou_na(resultados.get('peso_nao_alocado', 0.0)),
-                "N/A", _valor_ou_na(resultados.get('volume_nao_alocado', 0.0))
-            ])
+        
+        pasta_vis = os.path.join(os.path.dirname(__file__), INSTANCIAS, 'Resultados - Heuristica', 'Visualizacoes', resultado_estruturado['nome_instancia'])
+        agendar_visualizacoes('VisualizacaoHeuristica', dict(resultado_estruturado, timeout=TIMEOUT), instancia,
+                              pasta_vis, GRAFICOS_SEGUNDO_PLANO, PROCESSOS_GRAFICOS)
+        print(f"✅ Visualizações agendadas em: {pasta_vis}")
 
-    print(f"✅ Resumo geral (append) salvo em: {caminho_completo_resumo}")
+        
+        imprimir_resultados_detalhados_heuristica(resultado_estruturado)
+    else:
+        print("❌ Não foi possível estruturar os resultados.")
 
+    return {
+        'resultado_estruturado': resultado_estruturado,
+        'sol_inicial_estruturada': sol_inicial_estruturada,
+        'instancia': instancia
+    }
 
-def executar_todas_instancias_na_pasta(pasta=INSTANCIAS, out_folder="Resultados - Heuristica"):
+def executar_todas_instancias_na_pasta(pasta=INSTANCIAS, out_folder="Resultados - Heuristica", modo=MODO_BUSCA, processos_lote=PROCESSOS_LOTE):
     
     pasta_abs = os.path.join(os.path.dirname(os.path.abspath(__file__)), pasta)
     if not os.path.isdir(pasta_abs):
         print(f"❌ Pasta de instâncias não encontrada: {pasta_abs}")
         return
     
-    arquivos = [f for f in os.listdir(pasta_abs) if f.endswith('.csv') and not f.startswith('00_')]
+    arquivos = sorted(f for f in os.listdir(pasta_abs) if f.endswith('.csv') and not f.startswith('00_'))
     if not arquivos:
         print("❌ Nenhuma instância CSV encontrada na pasta.")
         return
     
     os.makedirs(out_folder, exist_ok=True)
+
+    if processos_lote is None:
+        processos_lote = os.cpu_count() or 1
+    processos_lote = max(1, min(int(processos_lote), len(arquivos)))
+
+    if processos_lote > 1:
+        executar_lote(pasta_abs, arquivos, modo, processos_lote)
+        print(f"\n✅ Relatórios e visualizações salvos em: {out_folder}")
+        return
+
+    try:
+        _executar_pasta_serial(pasta_abs, arquivos, out_folder, modo)
+    finally:
+        aguardar_visualizacoes()
+
+def _executar_pasta_serial(pasta_abs, arquivos, out_folder, modo):
+
     resultados_totais = []
     instancias_originais = []
     solucoes_iniciais = []  
 
     for a in arquivos:
-        caminho = os.path.join(pasta_abs, a)
-        print("\n" + "="*60)
-        print(f"Executando heurística na instância: {a}")
-        print("="*60)
-        start = time.time()
-
-        resultado = executar_instancia_heuristica(caminho, num_reinicios=NUM_REINICIOS, time_limit=TIMEOUT)
-        dur = time.time() - start
-        print(f"Resultado: custo={resultado['custo']:.2f} tempo_total_exec={dur:.1f}s")
-
-        
-        resultado_estruturado = estruturar_resultados_heuristica(resultado)
-        
-        
-        sol_inicial_estruturada = None
-        
-        
-        sol_inicial = resultado.get('solucao_inicial', None)
-        instancia = resultado['instancia']
-
-        if sol_inicial is not None:
-            
-            sol_inicial_estruturada = estruturar_resultados_heuristica(
-                {
-                    'solucao': sol_inicial,
-                    'instancia': instancia,
-                    'nome_instancia': resultado['nome_instancia'],
-                    'tempo_exec': resultado['tempo_exec'],
-                    'custo': custo_total(sol_inicial, instancia)['componentes_custo']['total']
-                }
-            )
-        else:
-            sol_inicial_estruturada = None  
+        processado = _processar_instancia(os.path.join(pasta_abs, a), modo)
+        resultado_estruturado = processado['resultado_estruturado']
 
         
-        solucoes_iniciais.append(sol_inicial_estruturada)
+        solucoes_iniciais.append(processado['sol_inicial_estruturada'])
 
         if resultado_estruturado:
-            resultado_estruturado['nome_instancia'] = a.replace('.csv', '')
             resultados_totais.append(resultado_estruturado)
-            instancias_originais.append(resultado['instancia'])
-
-            
-            pasta_vis = os.path.join(os.path.dirname(__file__), INSTANCIAS, 'Resultados - Heuristica', 'Visualizacoes', resultado_estruturado['nome_instancia'])
-            gerar_visualizacoes(resultado_estruturado, resultado['instancia'], pasta_vis)
-            print(f"✅ Visualizações salvas em: {pasta_vis}")
-
-            
-            imprimir_resultados_detalhados_heuristica(resultado_estruturado)
-        else:
-            print("❌ Não foi possível estruturar os resultados.")
+            instancias_originais.append(processado['instancia'])
 
         
         if resultados_totais:
@@ -1759,670 +3386,56 @@ def executar_todas_instancias_na_pasta(pasta=INSTANCIAS, out_folder="Resultados
             exportar_resultados_csv_heuristica(resultados_totais, instancias_originais, solucoes_iniciais, resultado_estruturado)
             print(f"\n✅ Relatórios e visualizações salvos em: {out_folder}")
 
+def executar_lote(pasta_abs, arquivos, modo=MODO_BUSCA, processos_lote=PROCESSOS_LOTE, folga=LOTE_FOLGA):
 
-def plot_distribuicao_alocacao(resultados, instancia, pasta_saida, nome_base):
-    plt.figure(figsize=(16, 10))
-    ax = plt.gca()
-
-    um_width = 0.7
-    um_height = 0.8
-    espacamento_vertical = 1.5
-    margin_left = 3.0
-    ums_por_linha = 10
-
-    
-    tipos_um = sorted(set(um['tipo'] for um in instancia['ums']))
-    cores_ums = [CORES_PASTEL['azul_claro'], CORES_PASTEL['verde_claro'], 
-                 CORES_PASTEL['laranja_claro'], CORES_PASTEL['rosa_claro'],
-                 CORES_PASTEL['roxo_claro'], CORES_PASTEL['amarelo_claro'],
-                 CORES_PASTEL['lavanda'], CORES_PASTEL['menta'],
-                 CORES_PASTEL['pessego'], CORES_PASTEL['lilas'],
-                 CORES_PASTEL['azul_ceu'], CORES_PASTEL['salmao_claro']]
-    cor_um = {tipo: cores_ums[i % len(cores_ums)] 
-              for i, tipo in enumerate(tipos_um)}
-
-    
-    tipos_veiculos = sorted(set(v['tipo'] for v in instancia['veiculos']))
-    cores_veiculos = [CORES_PASTEL['azul_medio'], CORES_PASTEL['verde_medio'],
-                      CORES_PASTEL['lavanda'], CORES_PASTEL['pessego'],
-                      CORES_PASTEL['menta'], CORES_PASTEL['lilas']]
-    cor_veiculo = {tipo: cores_veiculos[i % len(cores_veiculos)] 
-                   for i, tipo in enumerate(tipos_veiculos)}
-
-    
-    cor_regiao = CORES_PASTEL['cinza_claro']
-
-    y_pos = 0
-    ums_alocadas = set()
-
-    
-    alocacoes_por_regiao = {}
-    for aloc in resultados['alocacoes']:
-        regiao = aloc['destino']
-        if regiao not in alocacoes_por_regiao:
-            alocacoes_por_regiao[regiao] = []
-        alocacoes_por_regiao[regiao].append(aloc)
-
-    
-    regioes = sorted(alocacoes_por_regiao.keys())  
-
-    
-    for regiao in regioes:
-        if regiao not in alocacoes_por_regiao:
-            continue
-            
-        
-        ax.text(margin_left - 2, y_pos, f'Região: {regiao}', 
-                ha='left', va='center', fontsize=12, weight='bold',
-                bbox=dict(boxstyle="round,pad=0.3", facecolor=cor_regiao, alpha=0.5))
-        
-        y_pos -= 1.5
-
-        
-        for aloc in alocacoes_por_regiao[regiao]:
-            veic_id = aloc['veiculo_id']
-            veic_tipo = aloc['veiculo_tipo']
-            ums = aloc['cargas']
-            tipos_um_veiculo = aloc['tipos_um']  
-            
-            
-            num_linhas = (len(ums) + ums_por_linha - 1) // ums_por_linha
-            altura_veiculo = 1.0 + num_linhas * 1.0
-
-            
-            ax.add_patch(patches.Rectangle(
-                (margin_left, y_pos - altura_veiculo/2),
-                width=ums_por_linha,
-                height=altura_veiculo,
-                facecolor=cor_veiculo[veic_tipo],
-                alpha=0.3,
-                edgecolor='gray',
-                linewidth=1.0
-            ))
-
-            
-            ax.text(margin_left - 0.5, y_pos,
-                   f'V{veic_id} ({veic_tipo})\n{len(ums)} UMs\n{aloc["taxa_utilizacao_peso"]:.1f}%',
-                   ha='right', va='center', fontsize=9)
-
-            
-            for i, (um_id, um_tipo) in enumerate(zip(ums, tipos_um_veiculo)):
-                linha = i // ums_por_linha
-                coluna = i % ums_por_linha
-                
-                x_pos = margin_left + coluna
-                y_um = y_pos - altura_veiculo/2 + (linha + 0.6)
-                
-                ax.add_patch(patches.Rectangle(
-                    (x_pos, y_um), um_width, um_height,
-                    facecolor=cor_um[um_tipo],  
-                    edgecolor='gray', linewidth=0.6, alpha=0.9
-                ))
-                ax.text(x_pos + um_width/2, y_um + um_height/2,
-                       f'UM{um_id}', ha='center', va='center', fontsize=6)
-
-                ums_alocadas.add(um_id)
-
-            y_pos -= (altura_veiculo + espacamento_vertical)
-
-        y_pos -= 1.0
-
-    
-    ums_nao_alocadas = [um for um in instancia['ums'] if um['id'] not in ums_alocadas]
-    if ums_nao_alocadas:
-        y_pos -= 1.0
-        ax.text(margin_left - 2, y_pos, 'UMs Não Alocadas:', 
-                ha='left', va='center', fontsize=11, weight='bold', color='red')
-        
-        y_pos -= 1.0
-        for i, um in enumerate(ums_nao_alocadas):
-            linha = i // ums_por_linha
-            coluna = i % ums_por_linha
-            
-            x_pos = margin_left + coluna
-            y_um = y_pos - linha * 1.2
-            
-            ax.add_patch(patches.Rectangle(
-                (x_pos, y_um), um_width, um_height,
-                facecolor=cor_um[um['tipo']],  
-                edgecolor='red', linestyle='dashed', linewidth=1.0, alpha=0.8
-            ))
-            ax.text(x_pos + um_width/2, y_um + um_height/2,
-                   f'UM{um["id"]}', ha='center', va='center', fontsize=6)
-
-    
-    ax.set_xlim(0, margin_left + ums_por_linha + 2)
-    ax.set_ylim(y_pos - 2, 2)
-    ax.axis('off')
-
-    
-    legend_elements = []
-    
-    
-    for tipo, cor in cor_um.items():
-        legend_elements.append(patches.Patch(facecolor=cor, label=f'UM {tipo}'))
-    
-    
-    for tipo, cor in cor_veiculo.items():
-        legend_elements.append(patches.Patch(facecolor=cor, alpha=0.3, label=f'Veículo {tipo}'))
-
-    ax.legend(handles=legend_elements, loc='center left', bbox_to_anchor=(1.02, 0.5),
-              fontsize=8, ncol=2)
-
-    plt.title(f'Distribuição de Cargas - Cores por Tipo de UM - {nome_base}', fontsize=14)
-    plt.tight_layout()
     
-    caminho = os.path.join(pasta_saida, f"{nome_base}_alocacao_por_regiao.png")
-    plt.savefig(caminho, dpi=300, bbox_inches='tight')
-    plt.close()
+    inicio = time.time()
+    processados = {}
+    falhas = {}
 
-def plot_tempo_execucao(resultados, pasta_saida, nome_base):
-    rcParams.update({'font.size': 12})
-    plt.figure(figsize=(10, 6))
-    plt.bar(nome_base, resultados['tempo_execucao'], 
-            color='#AEC6CF', alpha=0.8)
-    plt.axhline(y=TIMEOUT, color='#FFB7B2',
-                linestyle='--', label='Timeout', linewidth=2)
-    plt.ylabel('Tempo (segundos)', fontsize=12)
-    plt.title('Tempo de Execução da Heurística', fontsize=14, fontweight='bold')
-    plt.legend(fontsize=10)
-    plt.tight_layout()
-    
-    caminho = os.path.join(pasta_saida, f"{nome_base}_tempo_execucao.png")
-    plt.savefig(caminho, dpi=300, bbox_inches='tight')
-    plt.close()
-
-def plot_gap_otimizacao(resultados, pasta_saida, nome_base):
-    
-    if resultados['gap_otimizacao'] is not None:
-        import matplotlib.pyplot as plt
-        from matplotlib import rcParams
-        rcParams.update({'font.size': 12})
-        
-        plt.figure(figsize=(8, 5))
-        plt.bar(nome_base, resultados['gap_otimizacao'], 
-                color='#FFD8B1', alpha=0.8)
-        plt.ylabel('GAP (%)', fontsize=12)
-        plt.title('GAP de Otimização (Heurística = 0%)', fontsize=14, fontweight='bold')
-        plt.tight_layout()
-        
-        caminho = os.path.join(pasta_saida, f"{nome_base}_gap_otimizacao.png")
-        plt.savefig(caminho, dpi=300, bbox_inches='tight')
-        plt.close()
-
-def plot_utilizacao_veiculos(resultados, pasta_saida, nome_base):
-    if not resultados['alocacoes']:
-        return
-
-    df = pd.DataFrame(resultados['alocacoes'])
-    df = df.sort_values('veiculo_id')
-
-    fig, ax = plt.subplots(figsize=(14, 7))
-    bar_width = 0.25
-    x = np.arange(len(df))
-
-    bars1 = ax.bar(x - bar_width, df['peso_total'], bar_width, 
-                   label='Peso Real', color=CORES_PASTEL['azul_claro'], alpha=0.8)
-    bars2 = ax.bar(x, df['peso_minimo'], bar_width, 
-                   label='Peso Mínimo', color=CORES_PASTEL['laranja_claro'], alpha=0.8)
-    bars3 = ax.bar(x + bar_width, df['capacidade_peso'], bar_width, 
-                   label='Capacidade', color=CORES_PASTEL['verde_claro'], alpha=0.8)
-
-    for i, cap in enumerate(df['capacidade_peso']):
-        ax.axhline(y=cap, xmin=(i - 0.4)/len(x), xmax=(i + 0.4)/len(x),
-                  color=CORES_PASTEL['roxo_claro'], linestyle=':', alpha=0.7)
-
-    ax.set_xlabel('Veículos (ID - Tipo - Região)')
-    ax.set_ylabel('Peso (kg)')
-    ax.set_title('Utilização de Capacidade dos Veículos')
-    
-    labels = [f"V{vID}\n{tipo}\n{reg}" 
-              for vID, tipo, reg in zip(df['veiculo_id'], df['veiculo_tipo'], df['destino'])]
-    ax.set_xticks(x)
-    ax.set_xticklabels(labels, rotation=45, ha='right')
-    ax.legend()
-
-    for bars in [bars1, bars2, bars3]:
-        for bar in bars:
-            height = bar.get_height()
-            if height > 0:
-                ax.text(bar.get_x() + bar.get_width()/2., height + max(df['capacidade_peso'])*0.01,
-                       f'{height:.0f}', ha='center', va='bottom', fontsize=8)
-
-    plt.tight_layout()
-    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_utilizacao_veiculos.png"), dpi=300)
-    plt.close()
-
-def plot_distribuicao_utilizacao(resultados, pasta_saida, nome_base):
-    if not resultados['alocacoes']:
-        return
-
-    df = pd.DataFrame(resultados['alocacoes'])
-
-    plt.figure(figsize=(12, 6))
-    sns.histplot(data=df, x='taxa_utilizacao_peso', bins=10, kde=True, 
-                 color=CORES_PASTEL['azul_claro'], alpha=0.7)
-    plt.xlabel('Taxa de Utilização de Peso (%)')
-    plt.ylabel('Número de Veículos')
-    plt.title('Distribuição das Taxas de Utilização de Peso')
-    plt.tight_layout()
-    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_distribuicao_utilizacao.png"), dpi=300)
-    plt.close()
-
-def plot_ums_por_veiculo(resultados, pasta_saida, nome_base):
-    if not resultados['alocacoes']:
-        return
-
-    df = pd.DataFrame(resultados['alocacoes'])
-    df['num_cargas'] = df['cargas'].apply(len)
-
-    tipos_unicos = df['veiculo_tipo'].unique()
-    
-    
-    cores_tipos = CORES_PASTEL_8 + [CORES_PASTEL['azul_ceu'], CORES_PASTEL['salmao_claro'], 
-                                   CORES_PASTEL['pessego'], CORES_PASTEL['lilas']]
-    
-    
-    if len(tipos_unicos) > len(cores_tipos):
-        
-        import matplotlib.colors as mcolors
-        cores_adicionais = list(mcolors.TABLEAU_COLORS.values())[:len(tipos_unicos) - len(cores_tipos)]
-        cores_tipos.extend(cores_adicionais)
-    
-    
-    cores_tipos = cores_tipos[:len(tipos_unicos)]
-    paleta_pastel = dict(zip(tipos_unicos, cores_tipos))
-
-    plt.figure(figsize=(12, 6))
-    
+    pool = multiprocessing.Pool(processes=processos_lote, maxtasksperchild=1)
     try:
-        sns.barplot(data=df, x='veiculo_id', y='num_cargas',
-                    hue='veiculo_tipo', dodge=False, palette=paleta_pastel, alpha=0.8)
-    except ValueError as e:
-        
-        print(f"⚠️ Erro na paleta: {e}. Usando paleta padrão.")
-        sns.barplot(data=df, x='veiculo_id', y='num_cargas',
-                    hue='veiculo_tipo', dodge=False, alpha=0.8)
-    
-    plt.xlabel('ID do Veículo', fontsize=12)
-    plt.ylabel('Número de UMs Transportadas', fontsize=12)
-    plt.title('Distribuição de UMs por Veículo', fontsize=14, fontweight='bold')
-    
-    
-    plt.legend(title='Tipos de Veículos', title_fontsize=11, fontsize=10,
-               loc='upper right', framealpha=0.9)
-    
-    
-    for i, (idx, row) in enumerate(df.iterrows()):
-        plt.text(i, row['num_cargas'] + 0.1, str(row['num_cargas']),
-                ha='center', va='bottom', fontsize=10, fontweight='bold')
-    
-    plt.tight_layout()
-    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_ums_por_veiculo.png"), dpi=300)
-    plt.close()
-
-def plot_composicao_custos(resultados, pasta_saida, nome_base):
-    componentes = ['Ativação Veículos', 'Transporte', 'Frete Morto', 'Não Alocação']
-    valores = [
-        resultados['custo_alocacao'],
-        resultados['custo_transporte'],
-        resultados['frete_morto_total'],
-        resultados['custo_nao_alocacao']
-    ]
-
-    
-    cores = [CORES_PASTEL['azul_medio'], CORES_PASTEL['azul_claro'], 
-             CORES_PASTEL['laranja_claro'], CORES_PASTEL['verde_claro']]
-
-    plt.figure(figsize=(10, 8))
-    
-    
-    plt.pie(valores, labels=componentes, autopct='%1.1f%%', colors=cores,
-            startangle=90, textprops={'fontsize': 10})
-    plt.title('Composição do Custo Total', fontsize=12, fontweight='bold')
-    
-    
-    total = sum(valores)
-    plt.text(0.9, -1.2, f'Total: R$ {total:,.2f}', 
-             ha='center', va='center', fontsize=11, fontweight='bold',
-             bbox=dict(boxstyle="round,pad=0.3", facecolor=CORES_PASTEL['cinza_claro'], alpha=0.7))
-    
-    plt.tight_layout()
-    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_composicao_custos.png"), dpi=300)
-    plt.close()
-
-def plot_custo_por_componente(resultados, pasta_saida, nome_base):
-    componentes = ['Ativação Veículos', 'Transporte', 'Frete Morto', 'Não Alocação']
-    valores = [
-        resultados['custo_alocacao'],
-        resultados['custo_transporte'],
-        resultados['frete_morto_total'],
-        resultados['custo_nao_alocacao']
-    ]
-
-    cores = [CORES_PASTEL['azul_medio'], CORES_PASTEL['azul_claro'], 
-             CORES_PASTEL['laranja_claro'], CORES_PASTEL['verde_claro']]
-
-    plt.figure(figsize=(12, 7))
-    bars = plt.bar(componentes, valores, color=cores, alpha=0.8, edgecolor='gray', linewidth=0.5)
-    plt.ylabel('Custo (R$)', fontsize=12)
-    plt.title('Custo por Componente', fontsize=14, fontweight='bold')
-    
-    
-    for bar in bars:
-        height = bar.get_height()
-        if height > 0:  
-            plt.text(bar.get_x() + bar.get_width()/2., height + max(valores)*0.01,
-                    f'R$ {height:,.2f}', ha='center', va='bottom', fontsize=10, fontweight='bold')
-
-    
-    total = sum(valores)
-    plt.axhline(y=total, color=CORES_PASTEL['rosa_claro'], linestyle='--', alpha=0.7, linewidth=2)
-    plt.text(len(componentes) - 0.5, total + max(valores)*0.02, f'Total: R$ {total:,.2f}', 
-             ha='right', va='bottom', fontsize=11, fontweight='bold',
-             bbox=dict(boxstyle="round,pad=0.3", facecolor=CORES_PASTEL['cinza_claro'], alpha=0.7))
-
-    plt.tight_layout()
-    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_custo_por_componente.png"), dpi=300)
-    plt.close()
-
-def plot_penalidades_nao_alocacao(resultados, pasta_saida, nome_base):
-    if resultados['ums_nao_alocadas'] == 0:
-        return
-
-    dados = {
-        'Peso Não Alocado': resultados['peso_nao_alocado'],
-        'Volume Não Alocado': resultados['volume_nao_alocado']
-    }
-
-    cores = [CORES_PASTEL['laranja_claro'], CORES_PASTEL['roxo_claro']]
-
-    plt.figure(figsize=(10, 6))
-    bars = plt.bar(dados.keys(), dados.values(), color=cores, alpha=0.8)
-    plt.ylabel('Valor Total')
-    plt.title('Recursos Não Alocados')
-
-    for bar in bars:
-        height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height + max(dados.values())*0.01,
-                f'{height:,.2f}', ha='center', va='bottom')
-
-    plt.tight_layout()
-    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_penalidades_nao_alocacao.png"), dpi=300)
-    plt.close()
-
-def plot_heatmap_compatibilidade(instancia, pasta_saida, nome_base):
-    ums_por_tipo = {}
-    for um in instancia['ums']:
-        tipo = um['tipo']
-        if tipo not in ums_por_tipo:
-            ums_por_tipo[tipo] = []
-        ums_por_tipo[tipo].append(um)
-
-    compat_data = []
-    tipos_um = sorted(ums_por_tipo.keys())
-    tipos_veiculo = sorted(set(v['tipo'] for v in instancia['veiculos']))
-
-    for tipo_um in tipos_um:
-        compat_por_tipo = []
-        for tipo_veic in tipos_veiculo:
-            compats = []
-            for um in ums_por_tipo[tipo_um]:
-                compat = 1 if tipo_veic in um['compatibilidade'].split(',') else 0
-                compats.append(compat)
-            taxa = sum(compats) / len(compats) if compats else 0
-            compat_por_tipo.append(taxa)
-        compat_data.append(compat_por_tipo)
-
-    df = pd.DataFrame(
-        compat_data,
-        index=[f"{tipo}\n({len(ums_por_tipo[tipo])} UMs)" for tipo in tipos_um],
-        columns=[f"{tipo}" for tipo in tipos_veiculo]
-    )
-
-    plt.figure(figsize=(12, 8))
-    sns.heatmap(df, annot=True, fmt='.2f', cmap="YlGnBu_r", 
-                cbar_kws={'label': 'Taxa de Compatibilidade'},
-                vmin=0, vmax=1)
-    plt.title('Matriz de Compatibilidade: Tipos de UM x Tipos de Veículo')
-    plt.xlabel('Tipos de Veículo')
-    plt.ylabel('Tipos de UM (quantidade)')
-    plt.tight_layout()
-    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_heatmap_compatibilidade.png"), dpi=300)
-    plt.close()
-
-def plot_distribuicao_ums_nao_alocadas(instancia, resultados, pasta_saida, nome_base):
-    alocados_ids = set()
-    for aloc in resultados['alocacoes']:
-        alocados_ids.update(aloc['cargas'])
-
-    ums_nao_alocadas = [um for um in instancia['ums'] if um['id'] not in alocados_ids]
-
-    if not ums_nao_alocadas:
-        return
-
-    df = pd.DataFrame(ums_nao_alocadas)
-
-    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+        tarefas = [(a, pool.apply_async(_processar_instancia, (os.path.join(pasta_abs, a), modo, 1)))
+                   for a in arquivos]
 
-    sns.boxplot(data=df, y='peso', ax=axes[0], color=CORES_PASTEL['azul_claro'])
-    axes[0].set_title('Distribuição de Peso das UMs Não Alocadas')
-
-    sns.boxplot(data=df, y='volume', ax=axes[1], color=CORES_PASTEL['verde_claro'])
-    axes[1].set_title('Distribuição de Volume das UMs Não Alocadas')
-
-    plt.tight_layout()
-    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_distribuicao_ums_nao_alocadas.png"), dpi=300)
-    plt.close()
-
-def plot_distribuicao_por_regiao(resultados, instancia, pasta_saida, nome_base):
-    if not resultados['alocacoes']:
-        return
-
-    
-    regioes_ordenadas = sorted(instancia['regioes'], key=lambda x: int(x[1:]) if x[1:].isdigit() else x)
-    
-    ums_por_regiao = {}
-    veiculos_por_regiao = {}
-    
-    for aloc in resultados['alocacoes']:
-        regiao = aloc['destino']
-        if regiao not in ums_por_regiao:
-            ums_por_regiao[regiao] = 0
-            veiculos_por_regiao[regiao] = 0
-        ums_por_regiao[regiao] += len(aloc['cargas'])
-        veiculos_por_regiao[regiao] += 1
-
-    ums_alocadas_ids = set()
-    for aloc in resultados['alocacoes']:
-        ums_alocadas_ids.update(aloc['cargas'])
-    
-    ums_nao_alocadas_por_regiao = {}
-    for um in instancia['ums']:
-        if um['id'] not in ums_alocadas_ids:
-            regiao = um['destino']
-            if regiao not in ums_nao_alocadas_por_regiao:
-                ums_nao_alocadas_por_regiao[regiao] = 0
-            ums_nao_alocadas_por_regiao[regiao] += 1
-
-    
-    ums_alocadas = [ums_por_regiao.get(r, 0) for r in regioes_ordenadas]
-    ums_nao_alocadas = [ums_nao_alocadas_por_regiao.get(r, 0) for r in regioes_ordenadas]
-    veiculos_counts = [veiculos_por_regiao.get(r, 0) for r in regioes_ordenadas]
-
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
-
-    
-    x = np.arange(len(regioes_ordenadas))
-    bar_width = 0.35
-    
-    bars1 = ax1.bar(x - bar_width/2, ums_alocadas, bar_width, 
-                    label='UMs Alocadas', color=CORES_PASTEL['verde_claro'], alpha=0.8)
-    bars2 = ax1.bar(x + bar_width/2, ums_nao_alocadas, bar_width, 
-                    label='UMs Não Alocadas', color=CORES_PASTEL['rosa_claro'], alpha=0.8)
-    
-    ax1.set_xlabel('Regiões', fontsize=12)
-    ax1.set_ylabel('Quantidade de UMs', fontsize=12)
-    ax1.set_title('Distribuição de UMs por Região', fontsize=14, fontweight='bold')
-    ax1.set_xticks(x)
-    ax1.set_xticklabels(regioes_ordenadas, fontsize=11)
-    ax1.legend(fontsize=10)
-    ax1.grid(axis='y', alpha=0.3)
-    
-    
-    max_ums = max(ums_alocadas + ums_nao_alocadas) if (ums_alocadas + ums_nao_alocadas) else 1
-    offset = max_ums * 0.05  
-    
-    for i, (a, n) in enumerate(zip(ums_alocadas, ums_nao_alocadas)):
-        if a > 0:
-            
-            ax1.text(i - bar_width/2, a + offset, str(a), 
-                    ha='center', va='bottom', fontsize=10, fontweight='bold')
-        if n > 0:
-            ax1.text(i + bar_width/2, n + offset, str(n), 
-                    ha='center', va='bottom', fontsize=10, fontweight='bold')
-    
-    
-    ax1.set_ylim(0, max_ums + offset * 3)
-
-    
-    bars3 = ax2.bar(regioes_ordenadas, veiculos_counts, 
-                    color=CORES_PASTEL['azul_claro'], alpha=0.8)
-    ax2.set_xlabel('Regiões', fontsize=12)
-    ax2.set_ylabel('Quantidade de Veículos', fontsize=12)
-    ax2.set_title('Veículos Ativos por Região', fontsize=14, fontweight='bold')
-    ax2.grid(axis='y', alpha=0.3)
-    
-    
-    max_veiculos = max(veiculos_counts) if veiculos_counts else 1
-    offset_veic = max_veiculos * 0.1  
-    
-    for i, v in enumerate(veiculos_counts):
-        if v > 0:
-            ax2.text(i, v + offset_veic, str(v), 
-                    ha='center', va='bottom', fontsize=10, fontweight='bold')
-    
-    
-    ax2.set_ylim(0, max_veiculos + offset_veic * 2)
-
-    
-    total_ums_alocadas = sum(ums_alocadas)
-    total_ums_nao_alocadas = sum(ums_nao_alocadas)
-    total_veiculos = sum(veiculos_counts)
-    
-    
-    info_text = f"Totais:\nUMs Alocadas: {total_ums_alocadas}\nUMs Não Alocadas: {total_ums_nao_alocadas}\nVeículos: {total_veiculos}"
-    fig.text(0.02, 0.02, info_text, fontsize=10, 
-             bbox=dict(boxstyle="round,pad=0.3", facecolor=CORES_PASTEL['cinza_claro'], alpha=0.7))
-
-    plt.tight_layout()
-    plt.subplots_adjust(bottom=0.15)  
-    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_distribuicao_regioes.png"), 
-                dpi=300, bbox_inches='tight')
-    plt.close()
-
-def plot_analise_frete_morto(resultados, pasta_saida, nome_base):
-    if not resultados['alocacoes']:
-        return
-
-    df = pd.DataFrame(resultados['alocacoes'])
-    df['frete_morto_kg'] = df['capacidade_peso'] - df['peso_total']
-    df['frete_morto_percentual'] = (df['frete_morto_kg'] / df['capacidade_peso']) * 100
-    df['frete_morto_percentual'] = df['frete_morto_percentual'].clip(lower=0)
-
-    
-    tipos_veiculos = sorted(df['veiculo_tipo'].unique())
-    cores_tipos = CORES_PASTEL_8[:len(tipos_veiculos)]
-    cor_por_tipo = dict(zip(tipos_veiculos, cores_tipos))
-
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
-
-    
-    bars1 = []
-    labels1 = []
-    for i, (idx, row) in enumerate(df.iterrows()):
-        cor = cor_por_tipo.get(row['veiculo_tipo'], CORES_PASTEL['cinza_claro'])
-        
-        
-        if i == df[df['veiculo_tipo'] == row['veiculo_tipo']].index[0]:
-            label = row['veiculo_tipo']
-        else:
-            label = ""
+        for pos, (a, tarefa) in enumerate(tarefas):
             
-        bar = ax1.bar(i, row['frete_morto_kg'], 
-                      color=cor, alpha=0.8, label=label)
-        bars1.append(bar)
-
-    ax1.set_xlabel('Veículos')
-    ax1.set_ylabel('Frete Morto (kg)')
-    ax1.set_title('Frete Morto por Veículo (kg)')
-    ax1.set_xticks(range(len(df)))
-    ax1.set_xticklabels([f"V{id}" for id in df['veiculo_id']], rotation=45, ha='right')
-    
-    
-    bars2 = []
-    for i, (idx, row) in enumerate(df.iterrows()):
-        cor = cor_por_tipo.get(row['veiculo_tipo'], CORES_PASTEL['cinza_claro'])
-        
-        bar = ax2.bar(i, row['frete_morto_percentual'],
-                      color=cor, alpha=0.8)
-        bars2.append(bar)
-
-    ax2.set_xlabel('Veículos')
-    ax2.set_ylabel('Frete Morto (%)')
-    ax2.set_title('Frete Morto por Veículo (% da Capacidade)')
-    ax2.set_xticks(range(len(df)))
-    ax2.set_xticklabels([f"V{id}" for id in df['veiculo_id']], rotation=45, ha='right')
+            prazo = inicio + (pos // processos_lote + 1) * (TIMEOUT + folga)
+            try:
+                processados[a] = tarefa.get(timeout=max(1.0, prazo - time.time()))
+            except multiprocessing.TimeoutError:
+                falhas[a] = "tempo esgotado"
+            except Exception as e:
+                falhas[a] = f"{type(e).__name__}: {e}"
+    finally:
+        pool.terminate()
+        pool.join()
 
-    
-    for ax, is_kg in [(ax1, True), (ax2, False)]:
-        for i, (idx, row) in enumerate(df.iterrows()):
-            height = row['frete_morto_kg'] if is_kg else row['frete_morto_percentual']
-            if height > 0:
-                max_val = max(df['frete_morto_kg']) if is_kg else max(df['frete_morto_percentual'])
-                offset = max_val * 0.02
-                ax.text(i, height + offset,
-                       f'{height:.1f}{"kg" if is_kg else "%"}', 
-                       ha='center', va='bottom', fontsize=8)
+    for a, motivo in falhas.items():
+        print(f"❌ Instância {a} não concluída: {motivo}")
 
     
-    handles, labels = ax1.get_legend_handles_labels()
-    by_label = dict(zip(labels, handles))  
-    if by_label:
-        fig.legend(by_label.values(), by_label.keys(), 
-                   loc='center right', bbox_to_anchor=(1.15, 0.5),
-                   title='Tipos de Veículo')
-
-    plt.tight_layout()
-    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_analise_frete_morto.png"), 
-                dpi=300, bbox_inches='tight')
-    plt.close()
-
-def gerar_visualizacoes(resultados, instancia, pasta_saida):
-    os.makedirs(pasta_saida, exist_ok=True)
-    nome_base = resultados['tipo_instancia']
+    resultados_totais = []
+    instancias_originais = []
+    solucoes_iniciais = []
+    linhas_resumo = []
+    for a in arquivos:
+        processado = processados.get(a, None)
+        if processado is None or not processado['resultado_estruturado']:
+            continue
 
-    
-    plot_tempo_execucao(resultados, pasta_saida, nome_base)
-    plot_gap_otimizacao(resultados, pasta_saida, nome_base)
+        resultados_totais.append(processado['resultado_estruturado'])
+        instancias_originais.append(processado['instancia'])
+        solucoes_iniciais.append(processado['sol_inicial_estruturada'])
+        exportar_resultados_csv_heuristica(resultados_totais, instancias_originais, solucoes_iniciais,
+                                           processado['resultado_estruturado'], escrever_resumo=False)
+        linhas_resumo.append(_linha_resumo_heuristica(processado['resultado_estruturado'], processado['sol_inicial_estruturada']))
 
-    
-    plot_utilizacao_veiculos(resultados, pasta_saida, nome_base)
-    plot_distribuicao_utilizacao(resultados, pasta_saida, nome_base)
-    plot_ums_por_veiculo(resultados, pasta_saida, nome_base)
-    plot_distribuicao_alocacao(resultados, instancia, pasta_saida, nome_base)
-    plot_distribuicao_por_regiao(resultados, instancia, pasta_saida, nome_base)
+    if linhas_resumo:
+        escrever_resumo_heuristica(os.path.join(os.path.dirname(__file__), INSTANCIAS, 'Resultados - Heuristica'), linhas_resumo)
 
-    
-    plot_composicao_custos(resultados, pasta_saida, nome_base)
-    plot_custo_por_componente(resultados, pasta_saida, nome_base)
-    plot_penalidades_nao_alocacao(resultados, pasta_saida, nome_base)
-    plot_analise_frete_morto(resultados, pasta_saida, nome_base)
+    return {'concluidas': [a for a in arquivos if a in processados], 'falhas': falhas}
 
-    
-    if resultados['ums_nao_alocadas'] > 0:
-        plot_heatmap_compatibilidade(instancia, pasta_saida, nome_base)
-        plot_distribuicao_ums_nao_alocadas(instancia, resultados, pasta_saida, nome_base)
 
 if __name__ == "__main__":
     executar_todas_instancias_na_pasta()
\ No newline at end of file
@@ -0,0 +1,193 @@
+import numpy as np
+
+
+ITERACOES_LAGRANGIANO = 500
+PASSO_LAGRANGIANO = 2.0
+PACIENCIA_LAGRANGIANO = 10
+
+def custo_minimo_alocacao(cp):
+
+    destino = cp['destino_um']
+
+    ativacao = np.where(destino[:, None] >= 0,
+                        cp['custo_ativacao'][:, np.maximum(destino, 0)].T, 0.0)
+    cap_peso = np.maximum(cp['cap_peso'], 1e-9)
+    custo = cp['custo_uv'] + cp['peso'][:, None] * ativacao / cap_peso[None, :]
+
+    viavel = (cp['compativel']
+              & (cp['peso'][:, None] <= cp['cap_peso'][None, :] + 1e-9)
+              & (cp['volume'][:, None] <= cp['cap_volume'][None, :] + 1e-9))
+    custo = np.where(viavel, custo, np.inf)
+    if custo.shape[1] == 0:
+        return np.full(len(destino), np.inf)
+    return custo.min(axis=1)
+
+def _mochila_fracionaria(ganho, tamanho, capacidade):
+
+    ordem = np.argsort(-ganho / np.maximum(tamanho, 1e-12), kind='stable')
+    acumulado = np.cumsum(tamanho[ordem])
+    cabem = acumulado <= capacidade + 1e-9
+
+    total = float(ganho[ordem][cabem].sum())
+    primeira_fora = int(np.count_nonzero(cabem))
+    if primeira_fora < len(ordem):
+        sobra = capacidade - (acumulado[primeira_fora - 1] if primeira_fora > 0 else 0.0)
+        i = ordem[primeira_fora]
+        total += float(ganho[i]) * max(0.0, sobra) / max(float(tamanho[i]), 1e-12)
+    return total
+
+def _grupos_veiculos(cp):
+
+    grupos = {}
+    for j in range(len(cp['cap_peso'])):
+        grupos.setdefault((int(cp['tipo_veic'][j]), int(cp['destino_veic'][j])), []).append(j)
+    return [np.array(js, dtype=np.int64) for js in grupos.values()]
+
+def _mochila_prefixo(ganho, tamanho, capacidades):
+
+    ordem = np.argsort(-ganho / np.maximum(tamanho, 1e-12), kind='stable')
+    acumulado = np.cumsum(tamanho[ordem])
+    valor_acumulado = np.concatenate(([0.0], np.cumsum(ganho[ordem])))
+
+    cheios = np.searchsorted(acumulado, capacidades + 1e-9, side='right')
+    sobra = capacidades - np.where(cheios > 0, acumulado[np.maximum(cheios - 1, 0)], 0.0)
+    proximo = np.minimum(cheios, len(ordem) - 1)
+    fracao = np.where(cheios < len(ordem), np.clip(sobra / np.maximum(tamanho[ordem][proximo], 1e-12), 0.0, 1.0), 0.0)
+    valor = valor_acumulado[cheios] + fracao * ganho[ordem][proximo]
+    return valor, ordem, cheios, fracao
+
+def _subproblemas(cp):
+
+    destino = cp['destino_um']
+    num_regioes = len(cp['regioes'])
+    sem_destino = np.flatnonzero(destino < 0)
+
+    conjuntos = [(k, np.union1d(np.flatnonzero(destino == k), sem_destino)) for k in range(num_regioes)]
+    if len(sem_destino):
+        conjuntos.append((-1, sem_destino))
+
+    subproblemas = []
+    for js in _grupos_veiculos(cp):
+        j0 = js[0]
+        for k, ums in conjuntos:
+            ums = ums[cp['compativel'][ums, j0]]
+            if len(ums) == 0:
+                continue
+            ativacao = cp['custo_ativacao'][js, k] if k >= 0 else np.zeros(len(js))
+            subproblemas.append({
+                'veiculos': js,
+                'regiao': k,
+                'ums': ums,
+                'ganho': cp['penalidade'][ums] + cp['beta'] * cp['peso'][ums] - cp['custo_uv'][ums, j0],
+                'peso_total': float(cp['peso'][ums].sum()),
+                'fixo': ativacao + cp['beta'] * cp['cap_peso'][js]
+            })
+    return subproblemas
+
+def _avaliar_lagrangiano(cp, subproblemas, multiplicadores):
+
+    num_veiculos = len(cp['cap_peso'])
+    melhor = np.zeros(num_veiculos)
+    escolha = [None] * num_veiculos
+
+    for sp in subproblemas:
+        ums = sp['ums']
+        ganho = sp['ganho'] - multiplicadores[ums]
+        positivos = ganho > 0
+        if not positivos.any():
+            continue
+        js = sp['veiculos']
+
+        peso_positivo = float(cp['peso'][ums][positivos].sum())
+        carga = np.clip(peso_positivo, cp['carga_minima'][js], cp['cap_peso'][js])
+        por_peso = _mochila_prefixo(ganho, cp['peso'][ums], carga)
+        por_peso[0][sp['peso_total'] + 1e-9 < cp['carga_minima'][js]] = -np.inf
+
+        por_volume = _mochila_prefixo(ganho[positivos], cp['volume'][ums][positivos], cp['cap_volume'][js])
+        usar_volume = por_volume[0] < por_peso[0]
+        valor = np.where(usar_volume, por_volume[0], por_peso[0]) - sp['fixo']
+
+        for x in np.flatnonzero(valor > melhor[js]):
+            j = js[x]
+            melhor[j] = valor[x]
+            if usar_volume[x]:
+                _, ordem, cheios, fracao = por_volume
+                escolha[j] = (ums[positivos], ordem, int(cheios[x]), float(fracao[x]))
+            else:
+                _, ordem, cheios, fracao = por_peso
+                escolha[j] = (ums, ordem, int(cheios[x]), float(fracao[x]))
+
+    uso = np.zeros(len(multiplicadores))
+    for item in escolha:
+        if item is None:
+            continue
+        ums, ordem, cheios, fracao = item
+        uso[ums[ordem[:cheios]]] += 1.0
+        if cheios < len(ordem):
+            uso[ums[ordem[cheios]]] += fracao
+
+    return float(multiplicadores.sum() + melhor.sum()), 1.0 - uso
+
+def lucro_maximo_lagrangiano(cp, lucro_referencia=0.0, iteracoes=None):
+
+    if iteracoes is None:
+        iteracoes = ITERACOES_LAGRANGIANO
+    subproblemas = _subproblemas(cp)
+    if not subproblemas:
+        return 0.0
+
+    multiplicadores = np.zeros(len(cp['peso']))
+    for sp in subproblemas:
+        np.maximum.at(multiplicadores, sp['ums'], np.maximum(sp['ganho'], 0.0))
+
+    melhor = np.inf
+    passo = PASSO_LAGRANGIANO
+    sem_melhora = 0
+    for _ in range(iteracoes):
+        valor, subgradiente = _avaliar_lagrangiano(cp, subproblemas, multiplicadores)
+        if valor < melhor - 1e-9:
+            melhor, sem_melhora = valor, 0
+        else:
+            sem_melhora += 1
+            if sem_melhora >= PACIENCIA_LAGRANGIANO:
+                passo, sem_melhora = passo / 2, 0
+
+        norma = float(subgradiente @ subgradiente)
+        if norma <= 1e-12 or passo < 1e-4:
+            break
+        multiplicadores = np.maximum(multiplicadores - passo * (valor - lucro_referencia) / norma * subgradiente, 0.0)
+
+    return max(melhor, 0.0)
+
+def limite_inferior(cp, custo_referencia=None):
+
+    penalidade = cp['penalidade']
+    custo_min = custo_minimo_alocacao(cp)
+
+    ganho = np.maximum(penalidade - custo_min, 0.0)
+    candidatas = ganho > 0
+    base = float(penalidade.sum())
+
+    limite_individual = base - float(ganho.sum())
+
+    limite_peso = base - _mochila_fracionaria(ganho[candidatas], cp['peso'][candidatas],
+                                              float(cp['cap_peso'].sum()))
+    limite_volume = base - _mochila_fracionaria(ganho[candidatas], cp['volume'][candidatas],
+                                                float(cp['cap_volume'].sum()))
+    lucro_referencia = max(0.0, base - custo_referencia) if custo_referencia is not None else 0.0
+    limite_lagrangiano = base - lucro_maximo_lagrangiano(cp, lucro_referencia)
+
+    return {
+        'valor': float(max(limite_individual, limite_peso, limite_volume, limite_lagrangiano)),
+        'individual': float(limite_individual),
+        'mochila_peso': float(limite_peso),
+        'mochila_volume': float(limite_volume),
+        'lagrangiano': float(limite_lagrangiano),
+        'ums_sem_veiculo': int(np.count_nonzero(~np.isfinite(custo_min)))
+    }
+
+def gap_percentual(custo, limite):
+
+    if custo is None or limite is None or custo <= 1e-9:
+        return None
+    return max(0.0, (custo - limite) / custo * 100)
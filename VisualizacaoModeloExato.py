@@ -0,0 +1,714 @@
+import os
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import seaborn as sns
+import numpy as np
+import pandas as pd
+import matplotlib.patches as patches
+
+CORES_PASTEL = {
+    'azul_claro': '#AEC6CF',
+    'azul_medio': '#9BB7D4', 
+    'verde_claro': '#B5EAD7',
+    'verde_medio': '#C1E1C1',
+    'amarelo_claro': '#FDFD96',
+    'laranja_claro': '#FFD8B1',
+    'rosa_claro': '#FFB7B2',
+    'roxo_claro': '#C9C9FF',
+    'cinza_claro': '#E8E8E8',
+    'salmao_claro': '#FF9AA2',
+    'lavanda': '#C3B1E1',
+    'menta': '#A2E4D2',
+    'pessego': '#FFCC99',
+    'lilas': '#D4B9DA',
+    'azul_ceu': '#B2D4F0',
+}
+
+CORES_PASTEL_4 = [CORES_PASTEL['azul_claro'], CORES_PASTEL['verde_claro'], 
+                  CORES_PASTEL['laranja_claro'], CORES_PASTEL['rosa_claro']]
+
+CORES_PASTEL_6 = [CORES_PASTEL['azul_claro'], CORES_PASTEL['verde_claro'],
+                  CORES_PASTEL['laranja_claro'], CORES_PASTEL['rosa_claro'],
+                  CORES_PASTEL['roxo_claro'], CORES_PASTEL['amarelo_claro']]
+
+CORES_PASTEL_8 = [CORES_PASTEL['azul_claro'], CORES_PASTEL['verde_claro'],
+                  CORES_PASTEL['laranja_claro'], CORES_PASTEL['rosa_claro'],
+                  CORES_PASTEL['roxo_claro'], CORES_PASTEL['amarelo_claro'],
+                  CORES_PASTEL['lavanda'], CORES_PASTEL['menta']]
+
+def plot_distribuicao_alocacao(resultados, instancia, pasta_saida, nome_base):
+    plt.figure(figsize=(16, 10))
+    ax = plt.gca()
+
+    um_width = 0.7
+    um_height = 0.8
+    espacamento_vertical = 1.5
+    margin_left = 3.0
+    ums_por_linha = 10
+
+    
+    tipos_um = sorted(set(um['tipo'] for um in instancia['ums']))
+    cores_ums = [CORES_PASTEL['azul_claro'], CORES_PASTEL['verde_claro'], 
+                 CORES_PASTEL['laranja_claro'], CORES_PASTEL['rosa_claro'],
+                 CORES_PASTEL['roxo_claro'], CORES_PASTEL['amarelo_claro'],
+                 CORES_PASTEL['lavanda'], CORES_PASTEL['menta'],
+                 CORES_PASTEL['pessego'], CORES_PASTEL['lilas'],
+                 CORES_PASTEL['azul_ceu'], CORES_PASTEL['salmao_claro']]
+    cor_um = {tipo: cores_ums[i % len(cores_ums)] 
+              for i, tipo in enumerate(tipos_um)}
+
+    
+    tipos_veiculos = sorted(set(v['tipo'] for v in instancia['veiculos']))
+    cores_veiculos = [CORES_PASTEL['azul_medio'], CORES_PASTEL['verde_medio'],
+                      CORES_PASTEL['lavanda'], CORES_PASTEL['pessego'],
+                      CORES_PASTEL['menta'], CORES_PASTEL['lilas']]
+    cor_veiculo = {tipo: cores_veiculos[i % len(cores_veiculos)] 
+                   for i, tipo in enumerate(tipos_veiculos)}
+
+    
+    cor_regiao = CORES_PASTEL['cinza_claro']
+
+    y_pos = 0
+    ums_alocadas = set()
+
+    
+    alocacoes_por_regiao = {}
+    for aloc in resultados['alocacoes']:
+        regiao = aloc['destino']
+        if regiao not in alocacoes_por_regiao:
+            alocacoes_por_regiao[regiao] = []
+        alocacoes_por_regiao[regiao].append(aloc)
+
+    
+    regioes = sorted(alocacoes_por_regiao.keys())  
+
+    
+    for regiao in regioes:
+        if regiao not in alocacoes_por_regiao:
+            continue
+            
+        
+        ax.text(margin_left - 2, y_pos, f'Região: {regiao}', 
+                ha='left', va='center', fontsize=12, weight='bold',
+                bbox=dict(boxstyle="round,pad=0.3", facecolor=cor_regiao, alpha=0.5))
+        
+        y_pos -= 1.5
+
+        
+        for aloc in alocacoes_por_regiao[regiao]:
+            veic_id = aloc['veiculo_id']
+            veic_tipo = aloc['veiculo_tipo']
+            ums = aloc['cargas']
+            tipos_um_veiculo = aloc['tipos_um']  
+            
+            
+            num_linhas = (len(ums) + ums_por_linha - 1) // ums_por_linha
+            altura_veiculo = 1.0 + num_linhas * 1.0
+
+            
+            ax.add_patch(patches.Rectangle(
+                (margin_left, y_pos - altura_veiculo/2),
+                width=ums_por_linha,
+                height=altura_veiculo,
+                facecolor=cor_veiculo[veic_tipo],
+                alpha=0.3,
+                edgecolor='gray',
+                linewidth=1.0
+            ))
+
+            
+            ax.text(margin_left - 0.5, y_pos,
+                   f'V{veic_id} ({veic_tipo})\n{len(ums)} UMs\n{aloc["taxa_utilizacao_peso"]:.1f}%',
+                   ha='right', va='center', fontsize=9)
+
+            
+            for i, (um_id, um_tipo) in enumerate(zip(ums, tipos_um_veiculo)):
+                linha = i // ums_por_linha
+                coluna = i % ums_por_linha
+                
+                x_pos = margin_left + coluna
+                y_um = y_pos - altura_veiculo/2 + (linha + 0.6)
+                
+                ax.add_patch(patches.Rectangle(
+                    (x_pos, y_um), um_width, um_height,
+                    facecolor=cor_um[um_tipo],  
+                    edgecolor='gray', linewidth=0.6, alpha=0.9
+                ))
+                ax.text(x_pos + um_width/2, y_um + um_height/2,
+                       f'UM{um_id}', ha='center', va='center', fontsize=6)
+
+                ums_alocadas.add(um_id)
+
+            y_pos -= (altura_veiculo + espacamento_vertical)
+
+        y_pos -= 1.0
+
+    
+    ums_nao_alocadas = [um for um in instancia['ums'] if um['id'] not in ums_alocadas]
+    if ums_nao_alocadas:
+        y_pos -= 1.0
+        ax.text(margin_left - 2, y_pos, 'UMs Não Alocadas:', 
+                ha='left', va='center', fontsize=11, weight='bold', color='red')
+        
+        y_pos -= 1.0
+        for i, um in enumerate(ums_nao_alocadas):
+            linha = i // ums_por_linha
+            coluna = i % ums_por_linha
+            
+            x_pos = margin_left + coluna
+            y_um = y_pos - linha * 1.2
+            
+            ax.add_patch(patches.Rectangle(
+                (x_pos, y_um), um_width, um_height,
+                facecolor=cor_um[um['tipo']],  
+                edgecolor='red', linestyle='dashed', linewidth=1.0, alpha=0.8
+            ))
+            ax.text(x_pos + um_width/2, y_um + um_height/2,
+                   f'UM{um["id"]}', ha='center', va='center', fontsize=6)
+
+    
+    ax.set_xlim(0, margin_left + ums_por_linha + 2)
+    ax.set_ylim(y_pos - 2, 2)
+    ax.axis('off')
+
+    
+    legend_elements = []
+    
+    
+    for tipo, cor in cor_um.items():
+        legend_elements.append(patches.Patch(facecolor=cor, label=f'UM {tipo}'))
+    
+    
+    for tipo, cor in cor_veiculo.items():
+        legend_elements.append(patches.Patch(facecolor=cor, alpha=0.3, label=f'Veículo {tipo}'))
+
+    ax.legend(handles=legend_elements, loc='center left', bbox_to_anchor=(1.02, 0.5),
+              fontsize=8, ncol=2)
+
+    plt.title(f'Distribuição de Cargas - Cores por Tipo de UM - {nome_base}', fontsize=14)
+    plt.tight_layout()
+    
+    caminho = os.path.join(pasta_saida, f"{nome_base}_alocacao_por_regiao.png")
+    plt.savefig(caminho, dpi=300, bbox_inches='tight')
+    plt.close()
+
+def plot_tempo_execucao(resultados, pasta_saida, nome_base):
+    plt.figure(figsize=(10, 6))
+    plt.bar(nome_base, resultados['tempo_execucao'], 
+            color=CORES_PASTEL['azul_claro'], alpha=0.8)
+    if resultados.get('timeout') is not None:
+        plt.axhline(y=resultados['timeout'], color=CORES_PASTEL['rosa_claro'], 
+                    linestyle='--', label='Timeout', linewidth=2)
+        plt.legend()
+    plt.ylabel('Tempo (segundos)')
+    plt.title('Tempo de Execução')
+    plt.tight_layout()
+    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_tempo_execucao.png"), dpi=300)
+    plt.close()
+
+def plot_gap_otimizacao(resultados, pasta_saida, nome_base):
+    if resultados['gap_otimizacao'] is not None:
+        plt.figure(figsize=(8, 5))
+        plt.bar(nome_base, resultados['gap_otimizacao'], 
+                color=CORES_PASTEL['laranja_claro'], alpha=0.8)
+        plt.ylabel('GAP (%)')
+        plt.title('GAP de Otimização')
+        plt.tight_layout()
+        plt.savefig(os.path.join(pasta_saida, f"{nome_base}_gap_otimizacao.png"), dpi=300)
+        plt.close()
+
+def plot_status_solucao(resultados, pasta_saida, nome_base):
+    status = resultados.get('status_descricao', "Desconhecido")
+
+    cor_status = {
+        "Ótimo": CORES_PASTEL['verde_claro'],
+        "Timeout": CORES_PASTEL['laranja_claro'],
+        "Inviável": CORES_PASTEL['rosa_claro'],
+        "Infinito/Ilimitado": CORES_PASTEL['roxo_claro'],
+        "Ilimitado": CORES_PASTEL['amarelo_claro'],
+        "Desconhecido": CORES_PASTEL['cinza_claro']
+    }
+
+    plt.figure(figsize=(6, 6))
+    plt.pie([1], labels=[status], autopct='%1.0f%%', 
+            colors=[cor_status.get(status, CORES_PASTEL['cinza_claro'])])
+    plt.title('Status da Solução')
+    plt.tight_layout()
+    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_status_solucao.png"), dpi=300)
+    plt.close()
+
+def plot_utilizacao_veiculos(resultados, pasta_saida, nome_base):
+    if not resultados['alocacoes']:
+        return
+
+    df = pd.DataFrame(resultados['alocacoes'])
+    df = df.sort_values('veiculo_id')
+
+    fig, ax = plt.subplots(figsize=(14, 7))
+    bar_width = 0.25
+    x = np.arange(len(df))
+
+    bars1 = ax.bar(x - bar_width, df['peso_total'], bar_width, 
+                   label='Peso Real', color=CORES_PASTEL['azul_claro'], alpha=0.8)
+    bars2 = ax.bar(x, df['peso_minimo'], bar_width, 
+                   label='Peso Mínimo', color=CORES_PASTEL['laranja_claro'], alpha=0.8)
+    bars3 = ax.bar(x + bar_width, df['capacidade_peso'], bar_width, 
+                   label='Capacidade', color=CORES_PASTEL['verde_claro'], alpha=0.8)
+
+    for i, cap in enumerate(df['capacidade_peso']):
+        ax.axhline(y=cap, xmin=(i - 0.4)/len(x), xmax=(i + 0.4)/len(x),
+                  color=CORES_PASTEL['roxo_claro'], linestyle=':', alpha=0.7)
+
+    ax.set_xlabel('Veículos (ID - Tipo - Região)')
+    ax.set_ylabel('Peso (kg)')
+    ax.set_title('Utilização de Capacidade dos Veículos')
+    
+    labels = [f"V{vID}\n{tipo}\n{reg}" 
+              for vID, tipo, reg in zip(df['veiculo_id'], df['veiculo_tipo'], df['destino'])]
+    ax.set_xticks(x)
+    ax.set_xticklabels(labels, rotation=45, ha='right')
+    ax.legend()
+
+    for bars in [bars1, bars2, bars3]:
+        for bar in bars:
+            height = bar.get_height()
+            if height > 0:
+                ax.text(bar.get_x() + bar.get_width()/2., height + max(df['capacidade_peso'])*0.01,
+                       f'{height:.0f}', ha='center', va='bottom', fontsize=8)
+
+    plt.tight_layout()
+    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_utilizacao_veiculos.png"), dpi=300)
+    plt.close()
+
+def plot_distribuicao_utilizacao(resultados, pasta_saida, nome_base):
+    if not resultados['alocacoes']:
+        return
+
+    df = pd.DataFrame(resultados['alocacoes'])
+
+    plt.figure(figsize=(12, 6))
+    sns.histplot(data=df, x='taxa_utilizacao_peso', bins=10, kde=True, 
+                 color=CORES_PASTEL['azul_claro'], alpha=0.7)
+    plt.xlabel('Taxa de Utilização de Peso (%)')
+    plt.ylabel('Número de Veículos')
+    plt.title('Distribuição das Taxas de Utilização de Peso')
+    plt.tight_layout()
+    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_distribuicao_utilizacao.png"), dpi=300)
+    plt.close()
+
+def plot_ums_por_veiculo(resultados, pasta_saida, nome_base):
+    if not resultados['alocacoes']:
+        return
+
+    df = pd.DataFrame(resultados['alocacoes'])
+    df['num_cargas'] = df['cargas'].apply(len)
+
+    tipos_unicos = df['veiculo_tipo'].unique()
+    
+    
+    cores_tipos = CORES_PASTEL_8 + [CORES_PASTEL['azul_ceu'], CORES_PASTEL['salmao_claro'], 
+                                   CORES_PASTEL['pessego'], CORES_PASTEL['lilas']]
+    
+    
+    if len(tipos_unicos) > len(cores_tipos):
+        
+        import matplotlib.colors as mcolors
+        cores_adicionais = list(mcolors.TABLEAU_COLORS.values())[:len(tipos_unicos) - len(cores_tipos)]
+        cores_tipos.extend(cores_adicionais)
+    
+    
+    cores_tipos = cores_tipos[:len(tipos_unicos)]
+    paleta_pastel = dict(zip(tipos_unicos, cores_tipos))
+
+    plt.figure(figsize=(12, 6))
+    
+    try:
+        sns.barplot(data=df, x='veiculo_id', y='num_cargas',
+                    hue='veiculo_tipo', dodge=False, palette=paleta_pastel, alpha=0.8)
+    except ValueError as e:
+        
+        print(f"Erro na paleta: {e}. Usando paleta padrão.")
+        sns.barplot(data=df, x='veiculo_id', y='num_cargas',
+                    hue='veiculo_tipo', dodge=False, alpha=0.8)
+    
+    plt.xlabel('ID do Veículo', fontsize=12)
+    plt.ylabel('Número de UMs Transportadas', fontsize=12)
+    plt.title('Distribuição de UMs por Veículo', fontsize=14, fontweight='bold')
+    
+    
+    plt.legend(title='Tipos de Veículos', title_fontsize=11, fontsize=10,
+               loc='upper right', framealpha=0.9)
+    
+    
+    for i, (idx, row) in enumerate(df.iterrows()):
+        plt.text(i, row['num_cargas'] + 0.1, str(row['num_cargas']),
+                ha='center', va='bottom', fontsize=10, fontweight='bold')
+    
+    plt.tight_layout()
+    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_ums_por_veiculo.png"), dpi=300)
+    plt.close()
+
+def plot_composicao_custos(resultados, pasta_saida, nome_base):
+    componentes = ['Ativação Veículos', 'Transporte', 'Frete Morto', 'Não Alocação']
+    valores = [
+        resultados['custo_alocacao'],
+        resultados['custo_transporte'],
+        resultados['frete_morto_total'],
+        resultados['custo_nao_alocacao']
+    ]
+
+    
+    cores = [CORES_PASTEL['azul_medio'], CORES_PASTEL['azul_claro'], 
+             CORES_PASTEL['laranja_claro'], CORES_PASTEL['verde_claro']]
+
+    plt.figure(figsize=(10, 8))
+    
+    
+    plt.pie(valores, labels=componentes, autopct='%1.1f%%', colors=cores,
+            startangle=90, textprops={'fontsize': 10})
+    plt.title('Composição do Custo Total', fontsize=12, fontweight='bold')
+    
+    
+    total = sum(valores)
+    plt.text(0.9, -1.2, f'Total: R$ {total:,.2f}', 
+             ha='center', va='center', fontsize=11, fontweight='bold',
+             bbox=dict(boxstyle="round,pad=0.3", facecolor=CORES_PASTEL['cinza_claro'], alpha=0.7))
+    
+    plt.tight_layout()
+    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_composicao_custos.png"), dpi=300)
+    plt.close()
+
+def plot_custo_por_componente(resultados, pasta_saida, nome_base):
+    componentes = ['Ativação Veículos', 'Transporte', 'Frete Morto', 'Não Alocação']
+    valores = [
+        resultados['custo_alocacao'],
+        resultados['custo_transporte'],
+        resultados['frete_morto_total'],
+        resultados['custo_nao_alocacao']
+    ]
+
+    cores = [CORES_PASTEL['azul_medio'], CORES_PASTEL['azul_claro'], 
+             CORES_PASTEL['laranja_claro'], CORES_PASTEL['verde_claro']]
+
+    plt.figure(figsize=(12, 7))
+    bars = plt.bar(componentes, valores, color=cores, alpha=0.8, edgecolor='gray', linewidth=0.5)
+    plt.ylabel('Custo (R$)', fontsize=12)
+    plt.title('Custo por Componente', fontsize=14, fontweight='bold')
+    
+    
+    for bar in bars:
+        height = bar.get_height()
+        if height > 0:  
+            plt.text(bar.get_x() + bar.get_width()/2., height + max(valores)*0.01,
+                    f'R$ {height:,.2f}', ha='center', va='bottom', fontsize=10, fontweight='bold')
+
+    
+    total = sum(valores)
+    plt.axhline(y=total, color=CORES_PASTEL['rosa_claro'], linestyle='--', alpha=0.7, linewidth=2)
+    plt.text(len(componentes) - 0.5, total + max(valores)*0.02, f'Total: R$ {total:,.2f}', 
+             ha='right', va='bottom', fontsize=11, fontweight='bold',
+             bbox=dict(boxstyle="round,pad=0.3", facecolor=CORES_PASTEL['cinza_claro'], alpha=0.7))
+
+    plt.tight_layout()
+    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_custo_por_componente.png"), dpi=300)
+    plt.close()
+
+def plot_penalidades_nao_alocacao(resultados, pasta_saida, nome_base):
+    if resultados['ums_nao_alocadas'] == 0:
+        return
+
+    dados = {
+        'Peso Não Alocado': resultados['peso_nao_alocado'],
+        'Volume Não Alocado': resultados['volume_nao_alocado']
+    }
+
+    cores = [CORES_PASTEL['laranja_claro'], CORES_PASTEL['roxo_claro']]
+
+    plt.figure(figsize=(10, 6))
+    bars = plt.bar(dados.keys(), dados.values(), color=cores, alpha=0.8)
+    plt.ylabel('Valor Total')
+    plt.title('Recursos Não Alocados')
+
+    for bar in bars:
+        height = bar.get_height()
+        plt.text(bar.get_x() + bar.get_width()/2., height + max(dados.values())*0.01,
+                f'{height:,.2f}', ha='center', va='bottom')
+
+    plt.tight_layout()
+    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_penalidades_nao_alocacao.png"), dpi=300)
+    plt.close()
+
+def plot_heatmap_compatibilidade(instancia, pasta_saida, nome_base):
+    ums_por_tipo = {}
+    for um in instancia['ums']:
+        tipo = um['tipo']
+        if tipo not in ums_por_tipo:
+            ums_por_tipo[tipo] = []
+        ums_por_tipo[tipo].append(um)
+
+    compat_data = []
+    tipos_um = sorted(ums_por_tipo.keys())
+    tipos_veiculo = sorted(set(v['tipo'] for v in instancia['veiculos']))
+
+    for tipo_um in tipos_um:
+        compat_por_tipo = []
+        for tipo_veic in tipos_veiculo:
+            compats = []
+            for um in ums_por_tipo[tipo_um]:
+                compat = 1 if tipo_veic in um['compatibilidade'].split(',') else 0
+                compats.append(compat)
+            taxa = sum(compats) / len(compats) if compats else 0
+            compat_por_tipo.append(taxa)
+        compat_data.append(compat_por_tipo)
+
+    df = pd.DataFrame(
+        compat_data,
+        index=[f"{tipo}\n({len(ums_por_tipo[tipo])} UMs)" for tipo in tipos_um],
+        columns=[f"{tipo}" for tipo in tipos_veiculo]
+    )
+
+    plt.figure(figsize=(12, 8))
+    sns.heatmap(df, annot=True, fmt='.2f', cmap="YlGnBu_r", 
+                cbar_kws={'label': 'Taxa de Compatibilidade'},
+                vmin=0, vmax=1)
+    plt.title('Matriz de Compatibilidade: Tipos de UM x Tipos de Veículo')
+    plt.xlabel('Tipos de Veículo')
+    plt.ylabel('Tipos de UM (quantidade)')
+    plt.tight_layout()
+    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_heatmap_compatibilidade.png"), dpi=300)
+    plt.close()
+
+def plot_distribuicao_ums_nao_alocadas(instancia, resultados, pasta_saida, nome_base):
+    alocados_ids = set()
+    for aloc in resultados['alocacoes']:
+        alocados_ids.update(aloc['cargas'])
+
+    ums_nao_alocadas = [um for um in instancia['ums'] if um['id'] not in alocados_ids]
+
+    if not ums_nao_alocadas:
+        return
+
+    df = pd.DataFrame(ums_nao_alocadas)
+
+    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+
+    sns.boxplot(data=df, y='peso', ax=axes[0], color=CORES_PASTEL['azul_claro'])
+    axes[0].set_title('Distribuição de Peso das UMs Não Alocadas')
+
+    sns.boxplot(data=df, y='volume', ax=axes[1], color=CORES_PASTEL['verde_claro'])
+    axes[1].set_title('Distribuição de Volume das UMs Não Alocadas')
+
+    plt.tight_layout()
+    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_distribuicao_ums_nao_alocadas.png"), dpi=300)
+    plt.close()
+
+def plot_distribuicao_por_regiao(resultados, instancia, pasta_saida, nome_base):
+    if not resultados['alocacoes']:
+        return
+
+    
+    regioes_ordenadas = sorted(instancia['regioes'], key=lambda x: int(x[1:]) if x[1:].isdigit() else x)
+    
+    ums_por_regiao = {}
+    veiculos_por_regiao = {}
+    
+    for aloc in resultados['alocacoes']:
+        regiao = aloc['destino']
+        if regiao not in ums_por_regiao:
+            ums_por_regiao[regiao] = 0
+            veiculos_por_regiao[regiao] = 0
+        ums_por_regiao[regiao] += len(aloc['cargas'])
+        veiculos_por_regiao[regiao] += 1
+
+    ums_alocadas_ids = set()
+    for aloc in resultados['alocacoes']:
+        ums_alocadas_ids.update(aloc['cargas'])
+    
+    ums_nao_alocadas_por_regiao = {}
+    for um in instancia['ums']:
+        if um['id'] not in ums_alocadas_ids:
+            regiao = um['destino']
+            if regiao not in ums_nao_alocadas_por_regiao:
+                ums_nao_alocadas_por_regiao[regiao] = 0
+            ums_nao_alocadas_por_regiao[regiao] += 1
+
+    
+    ums_alocadas = [ums_por_regiao.get(r, 0) for r in regioes_ordenadas]
+    ums_nao_alocadas = [ums_nao_alocadas_por_regiao.get(r, 0) for r in regioes_ordenadas]
+    veiculos_counts = [veiculos_por_regiao.get(r, 0) for r in regioes_ordenadas]
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
+
+    
+    x = np.arange(len(regioes_ordenadas))
+    bar_width = 0.35
+    
+    bars1 = ax1.bar(x - bar_width/2, ums_alocadas, bar_width, 
+                    label='UMs Alocadas', color=CORES_PASTEL['verde_claro'], alpha=0.8)
+    bars2 = ax1.bar(x + bar_width/2, ums_nao_alocadas, bar_width, 
+                    label='UMs Não Alocadas', color=CORES_PASTEL['rosa_claro'], alpha=0.8)
+    
+    ax1.set_xlabel('Regiões', fontsize=12)
+    ax1.set_ylabel('Quantidade de UMs', fontsize=12)
+    ax1.set_title('Distribuição de UMs por Região', fontsize=14, fontweight='bold')
+    ax1.set_xticks(x)
+    ax1.set_xticklabels(regioes_ordenadas, fontsize=11)
+    ax1.legend(fontsize=10)
+    ax1.grid(axis='y', alpha=0.3)
+    
+    
+    max_ums = max(ums_alocadas + ums_nao_alocadas) if (ums_alocadas + ums_nao_alocadas) else 1
+    offset = max_ums * 0.05  
+    
+    for i, (a, n) in enumerate(zip(ums_alocadas, ums_nao_alocadas)):
+        if a > 0:
+            
+            ax1.text(i - bar_width/2, a + offset, str(a), 
+                    ha='center', va='bottom', fontsize=10, fontweight='bold')
+        if n > 0:
+            ax1.text(i + bar_width/2, n + offset, str(n), 
+                    ha='center', va='bottom', fontsize=10, fontweight='bold')
+    
+    
+    ax1.set_ylim(0, max_ums + offset * 3)
+
+    
+    bars3 = ax2.bar(regioes_ordenadas, veiculos_counts, 
+                    color=CORES_PASTEL['azul_claro'], alpha=0.8)
+    ax2.set_xlabel('Regiões', fontsize=12)
+    ax2.set_ylabel('Quantidade de Veículos', fontsize=12)
+    ax2.set_title('Veículos Ativos por Região', fontsize=14, fontweight='bold')
+    ax2.grid(axis='y', alpha=0.3)
+    
+    
+    max_veiculos = max(veiculos_counts) if veiculos_counts else 1
+    offset_veic = max_veiculos * 0.1  
+    
+    for i, v in enumerate(veiculos_counts):
+        if v > 0:
+            ax2.text(i, v + offset_veic, str(v), 
+                    ha='center', va='bottom', fontsize=10, fontweight='bold')
+    
+    
+    ax2.set_ylim(0, max_veiculos + offset_veic * 2)
+
+    
+    total_ums_alocadas = sum(ums_alocadas)
+    total_ums_nao_alocadas = sum(ums_nao_alocadas)
+    total_veiculos = sum(veiculos_counts)
+    
+    
+    info_text = f"Totais:\nUMs Alocadas: {total_ums_alocadas}\nUMs Não Alocadas: {total_ums_nao_alocadas}\nVeículos: {total_veiculos}"
+    fig.text(0.02, 0.02, info_text, fontsize=10, 
+             bbox=dict(boxstyle="round,pad=0.3", facecolor=CORES_PASTEL['cinza_claro'], alpha=0.7))
+
+    plt.tight_layout()
+    plt.subplots_adjust(bottom=0.15)  
+    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_distribuicao_regioes.png"), 
+                dpi=300, bbox_inches='tight')
+    plt.close()
+
+def plot_analise_frete_morto(resultados, pasta_saida, nome_base):
+    if not resultados['alocacoes']:
+        return
+
+    df = pd.DataFrame(resultados['alocacoes'])
+    df['frete_morto_kg'] = df['capacidade_peso'] - df['peso_total']
+    df['frete_morto_percentual'] = (df['frete_morto_kg'] / df['capacidade_peso']) * 100
+    df['frete_morto_percentual'] = df['frete_morto_percentual'].clip(lower=0)
+
+    
+    tipos_veiculos = sorted(df['veiculo_tipo'].unique())
+    cores_tipos = CORES_PASTEL_8[:len(tipos_veiculos)]
+    cor_por_tipo = dict(zip(tipos_veiculos, cores_tipos))
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+
+    
+    bars1 = []
+    labels1 = []
+    for i, (idx, row) in enumerate(df.iterrows()):
+        cor = cor_por_tipo.get(row['veiculo_tipo'], CORES_PASTEL['cinza_claro'])
+        
+        
+        if i == df[df['veiculo_tipo'] == row['veiculo_tipo']].index[0]:
+            label = row['veiculo_tipo']
+        else:
+            label = ""
+            
+        bar = ax1.bar(i, row['frete_morto_kg'], 
+                      color=cor, alpha=0.8, label=label)
+        bars1.append(bar)
+
+    ax1.set_xlabel('Veículos')
+    ax1.set_ylabel('Frete Morto (kg)')
+    ax1.set_title('Frete Morto por Veículo (kg)')
+    ax1.set_xticks(range(len(df)))
+    ax1.set_xticklabels([f"V{id}" for id in df['veiculo_id']], rotation=45, ha='right')
+    
+    
+    bars2 = []
+    for i, (idx, row) in enumerate(df.iterrows()):
+        cor = cor_por_tipo.get(row['veiculo_tipo'], CORES_PASTEL['cinza_claro'])
+        
+        bar = ax2.bar(i, row['frete_morto_percentual'],
+                      color=cor, alpha=0.8)
+        bars2.append(bar)
+
+    ax2.set_xlabel('Veículos')
+    ax2.set_ylabel('Frete Morto (%)')
+    ax2.set_title('Frete Morto por Veículo (% da Capacidade)')
+    ax2.set_xticks(range(len(df)))
+    ax2.set_xticklabels([f"V{id}" for id in df['veiculo_id']], rotation=45, ha='right')
+
+    
+    for ax, is_kg in [(ax1, True), (ax2, False)]:
+        for i, (idx, row) in enumerate(df.iterrows()):
+            height = row['frete_morto_kg'] if is_kg else row['frete_morto_percentual']
+            if height > 0:
+                max_val = max(df['frete_morto_kg']) if is_kg else max(df['frete_morto_percentual'])
+                offset = max_val * 0.02
+                ax.text(i, height + offset,
+                       f'{height:.1f}{"kg" if is_kg else "%"}', 
+                       ha='center', va='bottom', fontsize=8)
+
+    
+    handles, labels = ax1.get_legend_handles_labels()
+    by_label = dict(zip(labels, handles))  
+    if by_label:
+        fig.legend(by_label.values(), by_label.keys(), 
+                   loc='center right', bbox_to_anchor=(1.15, 0.5),
+                   title='Tipos de Veículo')
+
+    plt.tight_layout()
+    plt.savefig(os.path.join(pasta_saida, f"{nome_base}_analise_frete_morto.png"), 
+                dpi=300, bbox_inches='tight')
+    plt.close()
+
+def gerar_visualizacoes(resultados, instancia, pasta_saida):
+    os.makedirs(pasta_saida, exist_ok=True)
+    nome_base = resultados['tipo_instancia']
+
+    
+    plot_tempo_execucao(resultados, pasta_saida, nome_base)
+    plot_gap_otimizacao(resultados, pasta_saida, nome_base)
+    plot_status_solucao(resultados, pasta_saida, nome_base)
+
+    
+    plot_utilizacao_veiculos(resultados, pasta_saida, nome_base)
+    plot_distribuicao_utilizacao(resultados, pasta_saida, nome_base)
+    plot_ums_por_veiculo(resultados, pasta_saida, nome_base)
+    plot_distribuicao_alocacao(resultados, instancia, pasta_saida, nome_base)
+    plot_distribuicao_por_regiao(resultados, instancia, pasta_saida, nome_base)
+
+    
+    plot_composicao_custos(resultados, pasta_saida, nome_base)
+    plot_custo_por_componente(resultados, pasta_saida, nome_base)
+    plot_penalidades_nao_alocacao(resultados, pasta_saida, nome_base)
+    plot_analise_frete_morto(resultados, pasta_saida, nome_base)
+
+    
+    if resultados['ums_nao_alocadas'] > 0:
+        plot_heatmap_compatibilidade(instancia, pasta_saida, nome_base)
+        plot_distribuicao_ums_nao_alocadas(instancia, resultados, pasta_saida, nome_base)
@@ -0,0 +1,163 @@
+import os
+import io
+import sys
+import json
+import time
+import random
+import platform
+import subprocess
+from datetime import datetime
+
+import numpy as np
+
+import Heuristica as H
+import random_gerador_grupo3 as gerador
+
+
+TAMANHOS = [
+    (2, 10),
+    (5, 50),
+    (10, 100),
+    (20, 300),
+    (50, 1000),
+    (100, 3000),
+    (200, 10000)
+]
+NUM_REGIOES = 4
+REPETICOES = 3
+SEMENTE = 42
+LIMITE_BUSCA = 120
+PASTA_SAIDA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Benchmarks')
+
+VIZINHANCAS = (
+    H.realizar_insercao,
+    H.realoca_entre_veiculos,
+    H.realizar_transferencia_carga,
+    H.realizar_eliminacao_veiculo,
+    H.realizar_troca_1x1,
+    H.realizar_troca_2x1,
+    H.realizar_troca_1x2,
+    H.realizar_troca_entrada_saida,
+    H.realizar_desalocacao
+)
+
+
+def _commit_atual():
+
+    try:
+        saida = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return saida.stdout.strip() or None
+
+def _cronometrar(funcao, repeticoes=REPETICOES, preparar=None):
+
+    tempos = []
+    resultado = None
+    for _ in range(repeticoes):
+        argumentos = preparar() if preparar is not None else ()
+        t0 = time.perf_counter()
+        resultado = funcao(*argumentos)
+        tempos.append(time.perf_counter() - t0)
+    return min(tempos), resultado
+
+def medir_tamanho(num_veiculos, num_ums, semente=SEMENTE):
+
+    random.seed(semente)
+    texto = gerador.gerar_texto_instancia(num_veiculos, num_ums, NUM_REGIOES)
+
+    medicoes = {}
+    medicoes['carregar_dados'], instancia = _cronometrar(lambda: H.ler_instancia(io.StringIO(texto), compacto=True))
+    medicoes['gerar_solucao_gulosa'], solucao = _cronometrar(lambda: H.gerar_solucao_gulosa(instancia))
+
+    H.aplicar_restricao_carga_minima(solucao, instancia)
+    H.custo_total(solucao, instancia)
+    inicial = H.capturar_solucao(solucao, instancia)
+
+    for vizinhanca in VIZINHANCAS:
+        medicoes[vizinhanca.__name__], _ = _cronometrar(
+            lambda s: vizinhanca(s, instancia, H.criar_estrategia()),
+            preparar=lambda: (H.restaurar_solucao(inicial, instancia),)
+        )
+
+    inicio = time.perf_counter()
+    final = H.busca_local(H.restaurar_solucao(inicial, instancia), instancia, time_limit=LIMITE_BUSCA)
+    medicoes['busca_local'] = time.perf_counter() - inicio
+
+    return {
+        'num_veiculos': num_veiculos,
+        'num_ums': num_ums,
+        'tempos': medicoes,
+        'custo_inicial': inicial['custo'],
+        'custo_final': final['custo'],
+        'busca_interrompida': medicoes['busca_local'] >= LIMITE_BUSCA
+    }
+
+def expoente_escala(tamanhos, tempos):
+
+    x = np.log(np.asarray(tamanhos, dtype=np.float64))
+    y = np.asarray(tempos, dtype=np.float64)
+    validos = y > 0
+    if np.count_nonzero(validos) < 2:
+        return None
+    inclinacao, _ = np.polyfit(x[validos], np.log(y[validos]), 1)
+    return float(inclinacao)
+
+def calcular_expoentes(resultados):
+
+    etapas = list(resultados[0]['tempos'].keys()) if resultados else []
+    ums = [r['num_ums'] for r in resultados]
+    produto = [r['num_ums'] * r['num_veiculos'] for r in resultados]
+
+    expoentes = {}
+    for etapa in etapas:
+        tempos = [r['tempos'][etapa] for r in resultados]
+        expoentes[etapa] = {
+            'ums': expoente_escala(ums, tempos),
+            'ums_x_veiculos': expoente_escala(produto, tempos)
+        }
+    return expoentes
+
+def executar_benchmark(tamanhos=TAMANHOS, pasta_saida=PASTA_SAIDA):
+
+    resultados = []
+    for num_veiculos, num_ums in tamanhos:
+        print(f"Medindo {num_veiculos}v_{num_ums}c ...")
+        r = medir_tamanho(num_veiculos, num_ums)
+        resultados.append(r)
+        print("  " + "  ".join(f"{etapa}={t:.4f}s" for etapa, t in r['tempos'].items()))
+
+    expoentes = calcular_expoentes(resultados)
+    print("\nExpoentes empíricos (tempo ~ n^k):")
+    for etapa, k in expoentes.items():
+        k_ums = "N/A" if k['ums'] is None else f"{k['ums']:.2f}"
+        k_prod = "N/A" if k['ums_x_veiculos'] is None else f"{k['ums_x_veiculos']:.2f}"
+        print(f"  {etapa:<24} UMs: {k_ums:>6}   UMs x veículos: {k_prod:>6}")
+
+    relatorio = {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit_atual(),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'repeticoes': REPETICOES,
+        'semente': SEMENTE,
+        'limite_busca': LIMITE_BUSCA,
+        'resultados': resultados,
+        'expoentes': expoentes
+    }
+
+    os.makedirs(pasta_saida, exist_ok=True)
+    sufixo = datetime.now().strftime('%Y%m%d_%H%M%S')
+    if relatorio['commit']:
+        sufixo = f"{relatorio['commit']}_{sufixo}"
+    caminho = os.path.join(pasta_saida, f"benchmark_heuristica_{sufixo}.json")
+    with open(caminho, mode='w', encoding='utf-8') as file:
+        json.dump(relatorio, file, indent=2, ensure_ascii=False)
+    print(f"\n✅ Benchmark salvo em: {caminho}")
+    return relatorio
+
+
+if __name__ == "__main__":
+    executar_benchmark()
@@ -270,7 +270,7 @@ def gerar_dimensoes_um(tipo_um):
 
 
 
-def gerar_instancia(num_veiculos, num_ums, num_regioes, nome_saida):
+def gerar_texto_instancia(num_veiculos, num_ums, num_regioes):
     
     regioes = definir_regioes(num_regioes)
     regioes_ord = regioes[:]  
@@ -281,15 +281,15 @@ def gerar_instancia(num_veiculos, num_ums, num_regioes, nome_saida):
         'x', 'y', 'compatibilidade', 'restricao', 'capacidade_peso',
         'capacidade_vol', 'custo', 'carga_minima', 'penalidade', 'Criterio Penalidade'
     ]
-    df = pd.DataFrame(columns=colunas)
+    linhas = []
 
     
-    df = pd.concat([df, pd.DataFrame([{
+    linhas.append({
         'tipo': 'parametro',
         'id': 1,
         'descricao': 'Beta',
         'valor': 0.1
-    }])], ignore_index=True, sort=False)
+    })
 
     
     frota = gerar_frota(num_veiculos, regioes_ord)
@@ -302,7 +302,7 @@ def gerar_instancia(num_veiculos, num_ums, num_regioes, nome_saida):
 
     
     for v in frota:
-        df = pd.concat([df, pd.DataFrame([{
+        linhas.append({
             'tipo': 'veiculo',
             'id': v['id'],
             'descricao': f"Veiculo_{v['descricao']}",
@@ -310,7 +310,7 @@ def gerar_instancia(num_veiculos, num_ums, num_regioes, nome_saida):
             'capacidade_vol': v['capacidade_vol'],
             'custo': f'"{v["custo"]}"',   
             'carga_minima': v['carga_minima']
-        }])], ignore_index=True, sort=False)
+        })
 
     
     um_id = 1
@@ -365,7 +365,7 @@ def gerar_instancia(num_veiculos, num_ums, num_regioes, nome_saida):
             custos_por_tipo.append(round(base_val, 2))
         custo_str_um = formatar_lista_com_virgula(custos_por_tipo)
 
-        df = pd.concat([df, pd.DataFrame([{
+        linhas.append({
             'tipo': 'um',
             'id': um_id,
             'descricao': tipo_um,
@@ -377,15 +377,23 @@ def gerar_instancia(num_veiculos, num_ums, num_regioes, nome_saida):
             'Criterio Penalidade': criterio,
             'destino': destino,
             'custo': f'"{custo_str_um}"'
-        }])], ignore_index=True, sort=False)
+        })
 
         um_id += 1
 
+    df = pd.DataFrame(linhas, columns=colunas, dtype=object)
+    return df.to_csv(sep=';', decimal='.', index=False, quoting=csv.QUOTE_NONE)
+
+def gerar_instancia(num_veiculos, num_ums, num_regioes, nome_saida):
+    
+    texto = gerar_texto_instancia(num_veiculos, num_ums, num_regioes)
+
     
     criar_pasta(PASTA_SAIDA)
     caminho = os.path.join(PASTA_SAIDA, f"{nome_saida}.csv")
     
-    df.to_csv(caminho, sep=';', decimal='.', index=False, encoding='utf-8-sig', quoting=csv.QUOTE_NONE)
+    with open(caminho, mode='w', newline='', encoding='utf-8-sig') as file:
+        file.write(texto)
     print(f"Instância gerada: {caminho}  (veículos={num_veiculos}, ums={num_ums}, regioes={num_regioes})")
 
     
@@ -0,0 +1,165 @@
+import io
+import sys
+import random
+import itertools
+
+import Heuristica as H
+import LimiteInferior
+import random_gerador_grupo3 as gerador
+
+
+CABECALHO = ("tipo;id;descricao;valor;peso;volume;destino;x;y;compatibilidade;restricao;capacidade_peso;"
+             "capacidade_vol;custo;carga_minima;penalidade;Criterio Penalidade")
+
+INSTANCIA_CARGA_MINIMA = "\n".join([
+    CABECALHO,
+    "parametro;1;Beta;0.1;;;;;;;;;;;;;",
+    'veiculo;1;Veiculo_Truck;;;;;;;;;23000;40;"1000.0";6900;;',
+    'um;1;viga;;3000;2.0;R1;;;;L;;;"10.0";;5.0;Prioridade normal',
+    'um;2;chapa;;2000;2.0;R1;;;;L;;;"10.0";;5.0;Prioridade normal',
+    'um;3;perfil;;2500;2.0;R1;;;;L;;;"10.0";;5.0;Prioridade normal',
+    'um;4;barra;;1500;2.0;R1;;;;L;;;"10.0";;5.0;Prioridade normal'
+]) + "\n"
+
+INSTANCIA_REBALANCEAMENTO = "\n".join([
+    CABECALHO,
+    "parametro;1;Beta;0.1;;;;;;;;;;;;;",
+    'veiculo;1;Veiculo_Truck;;;;;;;;;23000;40;"1000.0,1000.0";6900;;',
+    'veiculo;2;Veiculo_Truck;;;;;;;;;23000;40;"1000.0,1000.0";6900;;',
+    'um;1;viga;;7000;2.0;R1;;;;L;;;"10.0";;50.0;Estratégica',
+    'um;2;viga;;7000;2.0;R1;;;;L;;;"10.0";;50.0;Estratégica',
+    'um;3;viga;;8000;2.0;R2;;;;L;;;"10.0";;50.0;Estratégica',
+    'um;4;viga;;8000;2.0;R2;;;;L;;;"10.0";;50.0;Estratégica',
+    'um;5;viga;;8000;2.0;R2;;;;L;;;"10.0";;50.0;Estratégica'
+]) + "\n"
+
+OTIMO_CARGA_MINIMA = 2440.0
+SEMENTES_FORCA_BRUTA = (2, 8, 9)
+GAP_MAXIMO_LIMITE = 10.0
+
+TAMANHOS = [(5, 50), (10, 100), (20, 300)]
+NUM_REGIOES = 4
+SEMENTE = 42
+
+
+def _estado_abaixo_da_carga_minima():
+
+    instancia = H.ler_instancia(io.StringIO(INSTANCIA_CARGA_MINIMA), compacto=True)
+    solucao = H.criar_estado_inicial(instancia)
+    H.alocar_um(solucao, 1, 1, instancia)
+    H.custo_total(solucao, instancia)
+    return solucao, instancia
+
+def verificar_reparo_carga_minima():
+
+    falhas = []
+
+    solucao, instancia = _estado_abaixo_da_carga_minima()
+    H.aplicar_restricao_carga_minima(solucao, instancia, reparar=True)
+    dados = solucao['veiculo_dados'][1]
+    if 1 not in dados['ums']:
+        falhas.append("reparo: veículo esvaziado em vez de completado")
+    if not H.atende_carga_minima(solucao, instancia, 1):
+        falhas.append(f"reparo: carga {dados['peso_usado']:.0f} abaixo do mínimo")
+    antes = H.estatisticas_verificacao()['divergencias']
+    H.verificar_custo(solucao, instancia)
+    if H.estatisticas_verificacao()['divergencias'] > antes:
+        falhas.append("reparo: custo incremental diverge do recálculo")
+
+    solucao, instancia = _estado_abaixo_da_carga_minima()
+    H.aplicar_restricao_carga_minima(solucao, instancia, reparar=False)
+    if solucao['veiculo_dados'][1]['ums']:
+        falhas.append("descarte: veículo abaixo do mínimo não foi esvaziado")
+
+    return falhas
+
+def verificar_rebalanceamento():
+
+    falhas = []
+    instancia = H.ler_instancia(io.StringIO(INSTANCIA_REBALANCEAMENTO), compacto=True)
+    solucao = H.criar_estado_inicial(instancia)
+    H.alocar_um(solucao, 1, 1, instancia)
+    H.alocar_um(solucao, 2, 2, instancia)
+    custo_antes = H.custo_total(solucao, instancia)['custo']
+
+    movidos = H._rebalancear_regioes(solucao, instancia, H.obter_compacto(instancia), float('inf'))
+    regioes = {str(dados['regiao']) for dados in solucao['veiculo_dados'].values() if dados['ums']}
+    if movidos != 1 or regioes != {'R1', 'R2'}:
+        falhas.append(f"rebalanceamento: {movidos} veículos movidos, regiões atendidas {sorted(regioes)}")
+    if solucao['custo'] >= custo_antes - 1e-9:
+        falhas.append(f"rebalanceamento: custo não melhorou ({custo_antes:.2f} -> {solucao['custo']:.2f})")
+    return falhas
+
+def _otimo_forca_bruta(instancia):
+
+    cp = H.obter_compacto(instancia)
+    melhor = None
+    for destinos in itertools.product([None] + list(cp['veic_ids']), repeat=len(cp['um_ids'])):
+        solucao = H.criar_estado_inicial(instancia)
+        H.custo_total(solucao, instancia)
+        if not all(v is None or H.alocar_um(solucao, u, v, instancia) for u, v in zip(cp['um_ids'], destinos)):
+            continue
+        if any(dados['ums'] and not H.atende_carga_minima(solucao, instancia, vid)
+               for vid, dados in solucao['veiculo_dados'].items()):
+            continue
+        custo = H.custo_total(solucao, instancia, recalcular=True)['custo']
+        if melhor is None or custo < melhor:
+            melhor = custo
+    return melhor
+
+def verificar_limite_inferior():
+
+    falhas = []
+    casos = [("carga_minima", H.ler_instancia(io.StringIO(INSTANCIA_CARGA_MINIMA), compacto=True), OTIMO_CARGA_MINIMA)]
+    for semente in SEMENTES_FORCA_BRUTA:
+        random.seed(semente)
+        instancia = H.ler_instancia(io.StringIO(gerador.gerar_texto_instancia(3, 6, 2)), compacto=True)
+        casos.append((f"3v_6c_semente{semente}", instancia, _otimo_forca_bruta(instancia)))
+
+    for nome, instancia, otimo in casos:
+        limite = LimiteInferior.limite_inferior(H.obter_compacto(instancia))['valor']
+        gap = LimiteInferior.gap_percentual(otimo, limite)
+        if limite > otimo + 1e-6 * max(1.0, abs(otimo)):
+            falhas.append(f"{nome}: limite {limite:.2f} acima do ótimo {otimo:.2f}")
+        elif gap is not None and gap > GAP_MAXIMO_LIMITE:
+            falhas.append(f"{nome}: gap {gap:.2f}% para o ótimo {otimo:.2f}")
+    return falhas
+
+def verificar_custo_incremental(tamanhos=TAMANHOS):
+
+    falhas = []
+    verificar, periodo = H.VERIFICAR_CUSTO, H.VERIFICACAO_PERIODO
+    H.VERIFICAR_CUSTO, H.VERIFICACAO_PERIODO = True, 1
+    try:
+        for num_veiculos, num_ums in tamanhos:
+            random.seed(SEMENTE)
+            texto = gerador.gerar_texto_instancia(num_veiculos, num_ums, NUM_REGIOES)
+            instancia = H.ler_instancia(io.StringIO(texto), compacto=True)
+
+            antes = H.estatisticas_verificacao()['divergencias']
+            solucao = H.gerar_solucao_gulosa(instancia)
+            H.aplicar_restricao_carga_minima(solucao, instancia)
+            H.busca_local(solucao, instancia, time_limit=60)
+            novas = H.estatisticas_verificacao()['divergencias'] - antes
+            if novas:
+                falhas.append(f"{num_veiculos}v_{num_ums}c: {novas} divergências no custo incremental")
+    finally:
+        H.VERIFICAR_CUSTO, H.VERIFICACAO_PERIODO = verificar, periodo
+    return falhas
+
+def executar_verificacoes():
+
+    falhas = []
+    for verificacao in (verificar_reparo_carga_minima, verificar_rebalanceamento, verificar_limite_inferior,
+                        verificar_custo_incremental):
+        resultado = verificacao()
+        marcador = "✅" if not resultado else "❌"
+        print(f"{marcador} {verificacao.__name__}")
+        for falha in resultado:
+            print(f"   {falha}")
+        falhas.extend(resultado)
+    return falhas
+
+
+if __name__ == "__main__":
+    sys.exit(1 if executar_verificacoes() else 0)